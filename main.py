@@ -10,15 +10,15 @@ Nilusink
 from traceback import format_exc
 from random import  randint
 import pygame as pg
-import os
+import typing as tp
 
 from sim.core.drawables.interactions import InputsBox, OutputsBox
-from sim.core.drawables.logic import Not, And, Base, CustomBlock
-from sim.core.serialize import serialize_all, load_from_file
+from sim.core.drawables.logic import Not, And
+from sim.core.serialize import serialize_all, load_in_steps, spawn_block
+from sim.core.library import BlockLibrary
 from sim.core.drawables.interactions import Button, Entry
 from sim.core.basegame.groups import Gates, Wires
 from sim.core.basegame.game import BaseGame
-from sim.core.drawables.lines import Line
 from sim.additional.classes import Vec2
 
 
@@ -36,6 +36,8 @@ def main():
         (50, 800),
     )
 
+    library = BlockLibrary("./blocks")
+
     def spawn_and(*_trash):
         ad = And(Vec2())
         ad.start_follow()
@@ -56,46 +58,21 @@ def main():
                 return
 
             # write to file
-            serialize_all(f"./blocks/{block_name}.json")
-
-            # create new block from old gates
-            new_block = CustomBlock(
-                (0, 0),
-                block_name,
-                None,
-                len(inp),
-                len(out),
-            )
-
-            # move old gates
-            gates: list[Base] = Gates.sprites()
-            wires: list[Line] = Wires.sprites()
-
-            # remove all points that are not connected to a gate (first and last)
-            for wire in wires:
-                wire.set_points = [wire.set_points[0], wire.set_points[-1]]
-
-            # move inputs to block input
-            for i in range(len(inputs.inputs)):
-                for wire in inputs.inputs[i].lb.connected_lines:
-                    wire.set_parent(new_block.input_output_points[i])
-                    new_block.input_output_points[i].add_connection(wire)
+            file = f"./blocks/{block_name}.json"
+            serialize_all(file)
 
-            # move outputs to block output
-            for i in range(len(outputs.inputs)):
-                for wire in outputs.inputs[i].lb.connected_lines:
-                    wire.set_target(new_block.output_input_points[i])
-                    new_block.output_input_points[i].add_connection(wire)
+            # replace the board with the new block
+            for gate in Gates.sprites():
+                gate.delete()
 
-            # move all gates out of the screen
-            for gate in gates:
-                gate.position = (1000, -10_000)
+            for wire in Wires.sprites():
+                wire.delete()
 
             # remove all inputs and outputs
             inputs.clear()
             outputs.clear()
 
-            new_block.start_follow()
+            load_previous(file, load_as_block=True)
 
             blocks_buttons.append(
                 Button(
@@ -112,14 +89,22 @@ def main():
             print("error:", format_exc())
             raise e
 
+    # files that are being loaded, a step per frame
+    loading: list[tp.Iterator[None]] = []
+
     def load_previous(file: str, load_as_block: bool = False):
 
-        if not os.path.exists(file):
+        # blocks are only compiled again if their file changed, broken files are reported and skipped
+        library.refresh(file)
+        if not library.compile(file):
+            return
+
+        if load_as_block:
+            spawn_block(library.netlist(file), library[file]["name"])
             return
 
-        load_from_file(file, load_as_block)
-        if not load_as_block:
-            name.text = ".".join(file.split("/")[-1].split("\\")[-1].split(".")[:-1])
+        loading.append(load_in_steps(library.cache_file(file)))
+        name.text = library[file]["name"]
 
     Button(
         (0, 1000),
@@ -152,13 +137,13 @@ def main():
 
     i = 1
     blocks_buttons: list[Button] = []
-    for file in os.listdir("./blocks"):
+    for entry in library.entries:
         i += 1
         blocks_buttons.append(Button(
             (201 * i, 1000),
             (200, 80),
-            text=".".join(file.split(".")[:-1]),
-            on_click=lambda *_e, f=f"./blocks/{file}": load_previous(f),
+            text=entry["name"],
+            on_click=lambda *_e, f=f"./blocks/{entry['file']}": load_previous(f),
             bg=(100, 200, 100, 255),
             active_bg=(150, 200, 150, 255),
         ))
@@ -173,6 +158,9 @@ def main():
     name.text = f"Block {randint(100_000, 999_999)}"
 
     while True:
+        if loading and next(loading[0], ...) is ...:
+            loading.pop(0)
+
         BaseGame.update()
 
 
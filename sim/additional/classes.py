@@ -8,7 +8,7 @@ Author:
 Nilusink
 """
 import typing as tp
-import numpy as np
+import math
 
 
 class BetterDict(dict):
@@ -24,81 +24,94 @@ class BetterDict(dict):
 
 
 class Vec2:
+    """
+    a 2D vector
+
+    the cartesian coordinates are stored, angle and length are only calculated
+    when needed (and then kept until x or y change)
+    """
+    __slots__ = ("_x", "_y", "_angle", "_length")
+
     x: float
     y: float
     angle: float
     length: float
 
-    def __init__(self) -> None:
-        self.__x: float = 0
-        self.__y: float = 0
-        self.__angle: float = 0
-        self.__length: float = 0
+    def __init__(self, x: float = 0, y: float = 0) -> None:
+        self._x = x
+        self._y = y
+        self._angle = None
+        self._length = None
 
     # variable getters / setters
     @property
     def x(self):
-        return self.__x
+        return self._x
 
     @x.setter
     def x(self, value):
-        self.__x = value
-        self.__update("c")
+        self._x = value
+        self._angle = self._length = None
 
     @property
     def y(self):
-        return self.__y
+        return self._y
 
     @y.setter
     def y(self, value):
-        self.__y = value
-        self.__update("c")
+        self._y = value
+        self._angle = self._length = None
 
     @property
     def xy(self):
-        return self.__x, self.__y
+        return self._x, self._y
 
     @xy.setter
     def xy(self, xy):
-        self.__x = xy[0]
-        self.__y = xy[1]
-        self.__update("c")
+        self._x = xy[0]
+        self._y = xy[1]
+        self._angle = self._length = None
 
     @property
     def angle(self):
         """
         value in radian
         """
-        return self.__angle
+        if self._angle is None:
+            self._angle = math.atan2(self._y, self._x)
+
+        return self._angle
 
     @angle.setter
     def angle(self, value):
         """
         value in radian
         """
-        value = self.normalize_angle(value)
-
-        self.__angle = value
-        self.__update("p")
+        self.polar = self.normalize_angle(value), self.length
 
     @property
     def length(self):
-        return self.__length
+        if self._length is None:
+            self._length = math.hypot(self._x, self._y)
+
+        return self._length
 
     @length.setter
     def length(self, value):
-        self.__length = value
-        self.__update("p")
+        self.polar = self.angle, value
 
     @property
     def polar(self):
-        return self.__angle, self.__length
+        return self.angle, self.length
 
     @polar.setter
     def polar(self, polar):
-        self.__angle = polar[0]
-        self.__length = polar[1]
-        self.__update("p")
+        angle, length = polar
+
+        self._x = math.cos(angle) * length
+        self._y = math.sin(angle) * length
+        self._angle = angle
+        self._length = length
 
     # interaction
     def split_vector(self, direction):
@@ -107,13 +120,13 @@ class Vec2:
         :return: tuple[Vector in only that direction, everything else]
         """
         a = (direction.angle - self.angle)
-        facing = Vec2.from_polar(angle=direction.angle, length=self.length * np.cos(a))
-        other = Vec2.from_polar(angle=direction.angle - np.pi / 2, length=self.length * np.sin(a))
+        facing = Vec2.from_polar(angle=direction.angle, length=self.length * math.cos(a))
+        other = Vec2.from_polar(angle=direction.angle - math.pi / 2, length=self.length * math.sin(a))
 
         return facing, other
 
     def copy(self):
-        return Vec2().from_cartesian(x=self.x, y=self.y)
+        return Vec2(self._x, self._y)
 
     def to_dict(self) -> dict:
         return {
@@ -135,44 +148,60 @@ class Vec2:
 
     # maths
     def __add__(self, other):
-        if issubclass(type(other), Vec2):
-            return Vec2.from_cartesian(x=self.x + other.x, y=self.y + other.y)
+        if isinstance(other, Vec2):
+            return Vec2(self._x + other._x, self._y + other._y)
 
-        return Vec2.from_cartesian(x=self.x + other, y=self.y + other)
+        return Vec2(self._x + other, self._y + other)
 
     def __sub__(self, other):
-        if issubclass(type(other), Vec2):
-            return Vec2.from_cartesian(x=self.x - other.x, y=self.y - other.y)
+        if isinstance(other, Vec2):
+            return Vec2(self._x - other._x, self._y - other._y)
 
-        return Vec2.from_cartesian(x=self.x - other, y=self.y - other)
+        return Vec2(self._x - other, self._y - other)
 
     def __mul__(self, other):
-        if issubclass(type(other), Vec2):
+        if isinstance(other, Vec2):
             return Vec2.from_polar(angle=self.angle + other.angle, length=self.length * other.length)
 
-        return Vec2.from_cartesian(x=self.x * other, y=self.y * other)
+        return Vec2(self._x * other, self._y * other)
 
     def __truediv__(self, other):
-        return Vec2.from_cartesian(x=self.x / other, y=self.y / other)
+        return Vec2(self._x / other, self._y / other)
 
-    # internal functions
-    def __update(self, calc_from):
-        """
-        :param calc_from: polar (p) | cartesian (c)
-        """
-        if calc_from in ("p", "polar"):
-            self.__x = np.cos(self.angle) * self.length
-            self.__y = np.sin(self.angle) * self.length
+    # in place, without creating a new vector
+    def __iadd__(self, other):
+        if isinstance(other, Vec2):
+            self.xy = self._x + other._x, self._y + other._y
+
+        else:
+            self.xy = self._x + other, self._y + other
+
+        return self
 
-        elif calc_from in ("c", "cartesian"):
-            self.__length = np.sqrt(self.x**2 + self.y**2)
-            self.__angle = np.arctan2(self.y, self.x)
+    def __isub__(self, other):
+        if isinstance(other, Vec2):
+            self.xy = self._x - other._x, self._y - other._y
 
         else:
-            raise ValueError("Invalid value for \"calc_from\"")
+            self.xy = self._x - other, self._y - other
+
+        return self
+
+    def __imul__(self, other):
+        if isinstance(other, Vec2):
+            self.polar = self.angle + other.angle, self.length * other.length
+
+        else:
+            self.xy = self._x * other, self._y * other
+
+        return self
+
+    def __itruediv__(self, other):
+        self.xy = self._x / other, self._y / other
+        return self
 
     def __abs__(self):
-        return np.sqrt(self.x**2 + self.y**2)
+        return math.hypot(self._x, self._y)
 
     def __repr__(self):
         # return f"<\n" \
@@ -186,10 +215,7 @@ class Vec2:
     # creation of new instances
     @staticmethod
     def from_cartesian(x, y) -> "Vec2":
-        p = Vec2()
-        p.xy = x, y
-
-        return p
+        return Vec2(x, y)
 
     @staticmethod
     def from_polar(angle, length) -> "Vec2":
@@ -211,10 +237,10 @@ class Vec2:
 
     @staticmethod
     def normalize_angle(value: float) -> float:
-        while value > 2 * np.pi:
-            value -= 2 * np.pi
+        while value > 2 * math.pi:
+            value -= 2 * math.pi
 
         while value < 0:
-            value += 2 * np.pi
+            value += 2 * math.pi
 
         return value
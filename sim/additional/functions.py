@@ -8,33 +8,121 @@ Author:
 Nilusink
 """
 from time import sleep
+import typing as tp
+import numpy as np
 
 from .classes import Vec2
 from ..core.basegame.game import BaseGame, pg
 
 
-def create_bezier(start: Vec2, end: Vec2, top: Vec2, resolution: int = 20) -> list[Vec2]:
+def bezier_curves(starts: tp.Any, ends: tp.Any, tops: tp.Any, resolution: int = 20) -> np.ndarray:
     """
-    create a beautiful Bézier curve from start end and top poit
+    create many Bézier curves from start, end and top points at once
+
+    :param starts: the start points, shaped (n, 2)
+    :param ends: the end points, shaped (n, 2)
+    :param tops: the top (control) points, shaped (n, 2)
+    :param resolution: number of pieces per curve
+    :returns: the curves, shaped (n, resolution + 1, 2), from start to end
     """
-    g1 = top - start
-    g2 = end - top
+    starts = np.asarray(starts, dtype=float).reshape(-1, 1, 2)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 1, 2)
+    tops = np.asarray(tops, dtype=float).reshape(-1, 1, 2)
 
-    points: list[Vec2] = []
+    t = np.linspace(0, 1, resolution + 1).reshape(1, -1, 1)
 
-    for i in range(resolution):
-        i /= resolution
+    return (1 - t) ** 2 * starts + 2 * (1 - t) * t * tops + t ** 2 * ends
 
-        p1 = start + g1 * i
-        p2 = top + g2 * i
 
-        g3 = p2 - p1
-        p3 = p1 + g3 * i
+def bezier4_curves(pnt1: tp.Any, pnt2: tp.Any, pnt3: tp.Any, pnt4: tp.Any, resolution: int = 200) -> np.ndarray:
+    """
+    create many cubic Bézier curves at once
+
+    :param pnt1: the start points, shaped (n, 2)
+    :param pnt2: the first control points, shaped (n, 2)
+    :param pnt3: the second control points, shaped (n, 2)
+    :param pnt4: the end points, shaped (n, 2)
+    :param resolution: number of pieces per curve
+    :returns: the curves, shaped (n, resolution + 1, 2)
+    """
+    pnt1, pnt2, pnt3, pnt4 = (np.asarray(pnt, dtype=float).reshape(-1, 1, 2) for pnt in (pnt1, pnt2, pnt3, pnt4))
 
-        points.append(p3)
+    t = np.linspace(0, 1, resolution + 1).reshape(1, -1, 1)
+    u = 1 - t
 
-    points.append(end)
-    return points
+    return u ** 3 * pnt1 + 3 * u ** 2 * t * pnt2 + 3 * u * t ** 2 * pnt3 + t ** 3 * pnt4
+
+
+def curve_resolution(
+        starts: tp.Any,
+        ends: tp.Any,
+        tops: tp.Any,
+        max_resolution: int = 20,
+        step: float = 4,
+) -> np.ndarray:
+    """
+    a resolution for each curve, so that its pieces are about "step" pixels long
+
+    :returns: the resolutions, between 1 and max_resolution
+    """
+    starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+    tops = np.asarray(tops, dtype=float).reshape(-1, 2)
+
+    # a curve is never longer than the lines to and from its top
+    length = np.hypot(*(tops - starts).T) + np.hypot(*(ends - tops).T)
+
+    return np.clip(np.ceil(length / step), 1, max_resolution).astype(int)
+
+
+def rounded_polylines(lines: list[tp.Any], max_resolution: int = 20) -> list[np.ndarray]:
+    """
+    convert many lines (given by their corners) to polylines with rounded corners
+
+    every corner is replaced by a Bézier curve from 80% of the previous to
+    20% of the next straight, all curves of all lines are calculated together.
+
+    :param lines: the corners of each line, shaped (n_i, 2)
+    :param max_resolution: number of pieces of the longest curves
+    :returns: the points of each polyline, shaped (m_i, 2)
+    """
+    lines = [np.asarray(line, dtype=float).reshape(-1, 2) for line in lines]
+
+    corners = [line[1:-1] for line in lines]
+    starts = np.concatenate([line[:-2] + (line[1:-1] - line[:-2]) * .8 for line in lines] + [np.empty((0, 2))])
+    ends = np.concatenate([line[1:-1] + (line[2:] - line[1:-1]) * .2 for line in lines] + [np.empty((0, 2))])
+    tops = np.concatenate(corners + [np.empty((0, 2))])
+
+    # curves with the same resolution are created together
+    curves: list[np.ndarray | None] = [None] * len(tops)
+    resolutions = curve_resolution(starts, ends, tops, max_resolution)
+
+    for resolution in np.unique(resolutions):
+        index = np.nonzero(resolutions == resolution)[0]
+
+        for i, curve in zip(index, bezier_curves(starts[index], ends[index], tops[index], int(resolution))):
+            curves[i] = curve
+
+    out: list[np.ndarray] = []
+    first = 0
+    for line, line_corners in zip(lines, corners):
+        if len(line) < 2:
+            out.append(line)
+            continue
+
+        out.append(np.concatenate([line[:1]] + curves[first:first + len(line_corners)] + [line[-1:]]))
+        first += len(line_corners)
+
+    return out
+
+
+def create_bezier(start: Vec2, end: Vec2, top: Vec2, resolution: int = 20) -> list[Vec2]:
+    """
+    create a beautiful Bézier curve from start end and top poit
+    """
+    curve = bezier_curves(start.xy, end.xy, top.xy, resolution)[0]
+
+    return [Vec2(x, y) for x, y in curve.tolist()]
 
 
 def animated_bezier(start: Vec2, end: Vec2, top: Vec2, resolution: int = 200) -> list[Vec2]:
@@ -94,51 +182,40 @@ def animated_4bezier(
 ) -> list[Vec2]:
     """
     create a beautiful Bézier curve from start end and top poit
-    """
-    g1 = pnt2 - pnt1
-    g2 = pnt3 - pnt2
-    g3 = pnt4 - pnt3
 
-    points: list[Vec2] = []
-
-    for i in range(resolution):
-        t = i / resolution
-
-        p1 = pnt1 + g1 * t
-        p2 = pnt2 + g2 * t
-        p3 = pnt3 + g3 * t
-
-        g4 = p2 - p1
-        g5 = p3 - p2
+    :param draw: show how the point with this index is constructed
+    """
+    curve = bezier4_curves(pnt1.xy, pnt2.xy, pnt3.xy, pnt4.xy, resolution)[0]
 
-        p4 = p1 + g4 * t
-        p5 = p2 + g5 * t
+    if 0 <= draw < resolution:
+        t = draw / resolution
 
-        g6 = p5 - p4
+        p1 = pnt1 + (pnt2 - pnt1) * t
+        p2 = pnt2 + (pnt3 - pnt2) * t
+        p3 = pnt3 + (pnt4 - pnt3) * t
 
-        p6 = p4 + g6 * t
+        p4 = p1 + (p2 - p1) * t
+        p5 = p2 + (p3 - p2) * t
 
-        if draw == i:
-            BaseGame.in_loop(pg.draw.line, BaseGame.middle_layer, (255, 0, 0, 100), pnt1.xy, pnt2.xy)
-            BaseGame.in_loop(pg.draw.line, BaseGame.middle_layer, (255, 0, 0, 100), pnt2.xy, pnt3.xy)
-            BaseGame.in_loop(pg.draw.line, BaseGame.middle_layer, (255, 0, 0, 100), pnt3.xy, pnt4.xy)
-            BaseGame.in_loop(pg.draw.line, BaseGame.middle_layer, (255, 255, 0, 200), p1.xy, p2.xy)
-            BaseGame.in_loop(pg.draw.line, BaseGame.middle_layer, (255, 255, 0, 200), p2.xy, p3.xy)
-            BaseGame.in_loop(pg.draw.line, BaseGame.middle_layer, (255, 0, 255, 200), p4.xy, p5.xy)
+        p6 = Vec2(*curve[draw])
 
-            BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (255, 255, 0, 127), p1.xy, 5)
-            BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (255, 255, 0, 127), p2.xy, 5)
-            BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (255, 255, 0, 127), p3.xy, 5)
-            BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (255, 0, 255, 127), p4.xy, 5)
-            BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (255, 0, 255, 127), p5.xy, 5)
-            BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (255, 255, 255, 127), p6.xy, 5)
+        BaseGame.in_loop(pg.draw.line, BaseGame.middle_layer, (255, 0, 0, 100), pnt1.xy, pnt2.xy)
+        BaseGame.in_loop(pg.draw.line, BaseGame.middle_layer, (255, 0, 0, 100), pnt2.xy, pnt3.xy)
+        BaseGame.in_loop(pg.draw.line, BaseGame.middle_layer, (255, 0, 0, 100), pnt3.xy, pnt4.xy)
+        BaseGame.in_loop(pg.draw.line, BaseGame.middle_layer, (255, 255, 0, 200), p1.xy, p2.xy)
+        BaseGame.in_loop(pg.draw.line, BaseGame.middle_layer, (255, 255, 0, 200), p2.xy, p3.xy)
+        BaseGame.in_loop(pg.draw.line, BaseGame.middle_layer, (255, 0, 255, 200), p4.xy, p5.xy)
 
-            # BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (100, 100, 100, 127), pnt1.xy, 5)
-            # BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (100, 100, 100, 127), pnt2.xy, 5)
-            # BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (100, 100, 100, 127), pnt3.xy, 5)
-            # BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (100, 100, 100, 127), pnt4.xy, 5)
+        BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (255, 255, 0, 127), p1.xy, 5)
+        BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (255, 255, 0, 127), p2.xy, 5)
+        BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (255, 255, 0, 127), p3.xy, 5)
+        BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (255, 0, 255, 127), p4.xy, 5)
+        BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (255, 0, 255, 127), p5.xy, 5)
+        BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (255, 255, 255, 127), p6.xy, 5)
 
-        points.append(p6)
+        # BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (100, 100, 100, 127), pnt1.xy, 5)
+        # BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (100, 100, 100, 127), pnt2.xy, 5)
+        # BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (100, 100, 100, 127), pnt3.xy, 5)
+        # BaseGame.in_loop(pg.draw.circle, BaseGame.middle_layer, (100, 100, 100, 127), pnt4.xy, 5)
 
-    points.append(pnt4)
-    return points
+    return [Vec2(x, y) for x, y in curve.tolist()]
@@ -7,18 +7,26 @@ Pygame backbone
 Author:
 Nilusink
 """
-from random import randint
+from collections import OrderedDict
 import pygame as pg
 import typing as tp
 
 
 # local imports
-from .groups import Drawn, Updated
+from .groups import Clickable, Drawn, Updated
+from ..simulation.kernel import Simulation
 from ...additional.classes import BetterDict
 
 
 # Constants
 DEFAULT_WINDOW_SIZE: tuple[int, int] = (1920, 1080)
+BACKGROUND: tuple[int, int, int, int] = (50, 50, 50, 0)
+
+# with more changed regions, the whole window is redrawn
+MAX_DIRTY_RECTS: int = 64
+
+# number of rendered texts kept
+TEXT_CACHE_SIZE: int = 1024
 
 
 class Hook(tp.TypedDict):
@@ -29,6 +37,11 @@ class Hook(tp.TypedDict):
 class _BaseGame:
     running: bool = True
     _hooks: dict[int, Hook]
+    _hooks_by_type: dict[int, dict[int, tp.Callable]]
+    _next_hook: int
+    _rendered: dict[pg.sprite.Sprite, tuple[tp.Hashable, pg.Rect]]
+    _full_redraw: bool
+    _texts: OrderedDict[tuple[str, tuple, pg.font.Font], pg.Surface]
     _in_loop: list[tuple[tp.Callable, tuple, dict]]
     globals: BetterDict
 
@@ -44,6 +57,11 @@ class _BaseGame:
         })
         self._in_loop = []
         self._hooks = {}
+        self._hooks_by_type = {}
+        self._next_hook = 100_000
+        self._rendered = {}
+        self._full_redraw = True
+        self._texts = OrderedDict()
 
         # initialize pygame
         pg.init()
@@ -57,6 +75,41 @@ class _BaseGame:
         self.font = pg.font.SysFont(None, 24)
         pg.display.set_caption("Digital Logic Sim")
 
+    def render_text(self, text: str, color: tuple, font: pg.font.Font = ...) -> pg.Surface:
+        """
+        render an antialiased text, the least recently used texts are forgotten
+
+        :param text: the text to render
+        :param color: the text color
+        :param font: the font, BaseGame.font by default
+        """
+        if font is ...:
+            font = self.font
+
+        key = (text, tuple(color), font)
+        surface = self._texts.get(key)
+
+        if surface is None:
+            surface = font.render(text, True, color)
+            self._texts[key] = surface
+
+            if len(self._texts) > TEXT_CACHE_SIZE:
+                self._texts.popitem(last=False)
+
+        else:
+            self._texts.move_to_end(key)
+
+        return surface
+
+    def text_bounds(self, text: str, center: tuple[float, float]) -> pg.Rect:
+        """
+        the area a text rendered with the default font covers
+        """
+        rect = pg.Rect((0, 0), self.font.size(text))
+        rect.center = center
+
+        return rect
+
     def stop_listen(self, ignore: list[str] = ...) -> bool:
         """
         tells sprites to stop listening to mouse or keyboard inputs depending on some parameters
@@ -81,13 +134,90 @@ class _BaseGame:
         """
         self._handle_events()
 
+        # propagate all changes made by the events
+        Simulation.settle()
+
+        Updated.update(0)
+
+        # "in loop" functions draw anything anywhere, so they (and removing their drawings) need a full redraw
+        full = self._full_redraw or bool(self._in_loop)
+        self._full_redraw = bool(self._in_loop)
+
+        dirty = self._find_dirty()
+        if dirty is None or len(dirty) > MAX_DIRTY_RECTS:
+            full = True
+
+        if full:
+            self._draw_all()
+
+        elif dirty:
+            self._draw_dirty(dirty)
+
+    def _find_dirty(self) -> list[pg.Rect] | None:
+        """
+        compare every sprites look to the last frame
+
+        :returns: the regions that changed, None if a sprite can't tell
+        """
+        dirty: list[pg.Rect] = []
+        unknown = False
+
+        rendered: dict[pg.sprite.Sprite, tuple[tp.Hashable, pg.Rect]] = {}
+        for sprite in Drawn.sprites():
+            key = getattr(sprite, "render_key", None)
+            old = self._rendered.get(sprite)
+
+            if key is None:
+                unknown = True
+                bounds = self.screen.get_rect()
+
+            elif old is None or old[0] != key:
+                bounds = pg.Rect(sprite.bounds)
+                dirty.append(bounds)
+
+                if old is not None:
+                    dirty.append(old[1])
+
+            else:
+                bounds = old[1]
+
+            rendered[sprite] = (key, bounds)
+
+        # removed sprites leave their old area behind
+        for sprite, (_, bounds) in self._rendered.items():
+            if sprite not in rendered:
+                dirty.append(bounds)
+
+        self._rendered = rendered
+
+        if unknown:
+            return None
+
+        screen = self.screen.get_rect()
+        dirty = [rect.clip(screen) for rect in dirty if rect.colliderect(screen)]
+
+        # overlapping regions are drawn as one
+        merged: list[pg.Rect] = []
+        for rect in dirty:
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect = rect.union(merged.pop(i))
+                i = rect.collidelist(merged)
+
+            merged.append(rect)
+
+        return merged
+
+    def _draw_all(self):
+        """
+        redraw the whole window
+        """
         # clear screens
-        self.screen.fill((50, 50, 50, 0))
+        self.screen.fill(BACKGROUND)
         self.lowest_layer.fill((0, 0, 0, 0))
         self.middle_layer.fill((0, 0, 0, 0))
         self.top_layer.fill((0, 0, 0, 0))
 
-        Updated.update(0)
         Drawn.draw(self.middle_layer)
 
         # execute the "in loop" functions
@@ -105,6 +235,31 @@ class _BaseGame:
 
         pg.display.update()
 
+    def _draw_dirty(self, dirty: list[pg.Rect]):
+        """
+        only redraw the sprites in the changed regions
+        """
+        layers = (self.lowest_layer, self.middle_layer, self.top_layer)
+        sprites = list(self._rendered)
+        bounds = [rect for _, rect in self._rendered.values()]
+
+        for rect in dirty:
+            for layer in layers:
+                layer.set_clip(rect)
+                layer.fill((0, 0, 0, 0), rect)
+
+            for i in rect.collidelistall(bounds):
+                sprites[i].draw(self.middle_layer)
+
+            self.screen.fill(BACKGROUND, rect)
+            for layer in layers:
+                self.screen.blit(layer, rect, rect)
+
+        for layer in layers:
+            layer.set_clip(None)
+
+        pg.display.update(dirty)
+
     def _handle_events(self):
         """
         handle pygame events
@@ -116,15 +271,30 @@ class _BaseGame:
                 case pg.QUIT:
                     self.exit()
 
-        # hooks
-        for hid in self._hooks.copy():
-            try:
-                for event in events:
-                    if event.type == self._hooks[hid]["event"]:
-                        self._hooks[hid]["func"](event)
+        # hooks registered while handling these events only get the next ones
+        hooks: dict[int, list[tuple[int, tp.Callable]]] = {}
+        for event in events:
+            if event.type not in hooks and event.type in self._hooks_by_type:
+                hooks[event.type] = list(self._hooks_by_type[event.type].items())
+
+        # clicks only go to the sprites under the cursor
+        for event in events:
+            if event.type == pg.MOUSEBUTTONDOWN:
+                hits = Clickable.at(pg.mouse.get_pos())
 
-            except KeyError:
-                continue
+                # the focused sprite also needs clicks outside of it, to lose the focus
+                focused = self.globals.focused
+                if focused is not None and focused not in hits:
+                    hits.append(focused)
+
+                for sprite in hits:
+                    Clickable.click(sprite, event)
+
+        # hooks, skipping the ones cleared in the meantime
+        for event in events:
+            for hid, func in hooks.get(event.type, ()):
+                if hid in self._hooks:
+                    func(event)
 
     def on_event(self, event: pg.event.Event, func: tp.Callable) -> int:
         """
@@ -134,14 +304,14 @@ class _BaseGame:
         :param func:
         :returns: the id to cancel the event
         """
-        pid = 100_000
-        while pid in self._hooks:
-            pid = randint(100_001, 999_999)
+        pid = self._next_hook
+        self._next_hook += 1
 
         self._hooks[pid] = {
             "event": event,
             "func": func,
         }
+        self._hooks_by_type.setdefault(event, {})[pid] = func
 
         return pid
 
@@ -156,7 +326,8 @@ class _BaseGame:
         clear a previously scheduled hook
         :param hook_id: the id returned
         """
-        self._hooks.pop(hook_id)
+        hook = self._hooks.pop(hook_id)
+        del self._hooks_by_type[hook["event"]][hook_id]
 
     def exit(self):
         """
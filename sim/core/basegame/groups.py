@@ -8,6 +8,7 @@ Author:
 Nilusink
 """
 import pygame as pg
+import typing as tp
 
 
 class _Updated(pg.sprite.Group):
@@ -30,6 +31,14 @@ class _Drawn(pg.sprite.Group):
     functions:
 
     - draw(surface: pg.Surface)
+
+    properties:
+
+    - render_key: anything that changes how the sprite looks (hashable)
+    - bounds: the area the sprite draws on (pg.Rect)
+
+    sprites are only redrawn if their render_key changed or a changed sprite overlaps them,
+    sprites without a render_key cause a full redraw every frame
     """
 
     def draw(self, surface: pg.Surface):
@@ -44,35 +53,165 @@ class _Gates(pg.sprite.Group):
     properties:
 
     - id: int
+
+    ids are counted up and start at 0 again once the group is empty (e.g. when a board is loaded)
     """
+    _by_id: dict[int, tp.Any]
+    _next_id: int
+
+    def __init__(self, *sprites):
+        self._by_id = {}
+        self._next_id = 0
+
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, *args):
+        super().add_internal(sprite, *args)
+
+        self._by_id[sprite.id] = sprite
+        self._next_id = max(self._next_id, sprite.id + 1)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+
+        if self._by_id.get(sprite.id) is sprite:
+            del self._by_id[sprite.id]
+
+        if not self._by_id:
+            self._next_id = 0
+
     def get_by_id(self, id: int):
-        for sprite in self.sprites():
-            if sprite.id == id:
-                return sprite
+        return self._by_id.get(id)
 
     def id_taken(self, id: int) -> bool:
-        for sprite in self.sprites():
-            if sprite.id == id:
-                return True
-
-        return False
+        return id in self._by_id
 
     def yield_unique_id(self) -> int:
         """
         yields a valid unique id
         """
-        if len(self.sprites()) == 0:
-            return 0
-
-        return max([sprite.id for sprite in self.sprites()]) + 1
+        return self._next_id
 
 
 class _Wires(_Gates):
     ...
 
 
+class _Clickable:
+    """
+    uniform grid over the hit-boxes of everything that reacts to clicks,
+    so a click only reaches the sprites under the cursor
+
+    members need:
+
+    properties:
+
+    - hit_box: tuple[x, y, width, height]
+    """
+    cell_size: int = 64
+
+    _cells: dict[tuple[int, int], dict[tp.Any, None]]
+    _boxes: dict[tp.Any, tuple[float, float, float, float]]
+    _handlers: dict[tp.Any, tuple[int, tp.Callable]]
+    _counter: int
+
+    def __init__(self):
+        self._cells = {}
+        self._boxes = {}
+        self._handlers = {}
+        self._counter = 0
+
+    def __contains__(self, sprite) -> bool:
+        return sprite in self._handlers
+
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    def _cells_of(self, box: tuple[float, float, float, float]) -> tp.Iterator[tuple[int, int]]:
+        x, y, width, height = box
+
+        for cx in range(int(x // self.cell_size), int((x + width) // self.cell_size) + 1):
+            for cy in range(int(y // self.cell_size), int((y + height) // self.cell_size) + 1):
+                yield cx, cy
+
+    def add(self, sprite, on_click: tp.Callable):
+        """
+        register a sprite, on_click(event) is called for clicks inside of its hit-box
+        """
+        self._handlers[sprite] = (self._counter, on_click)
+        self._counter += 1
+
+        self.update(sprite)
+
+    def update(self, sprite):
+        """
+        move a sprite to its current hit-box, call whenever it moved or resized
+        """
+        if sprite not in self._handlers:
+            return
+
+        box = tuple(sprite.hit_box)
+        old = self._boxes.get(sprite)
+
+        if old == box:
+            return
+
+        if old is not None:
+            self._discard(sprite, old)
+
+        self._boxes[sprite] = box
+        for cell in self._cells_of(box):
+            self._cells.setdefault(cell, {})[sprite] = None
+
+    def _discard(self, sprite, box: tuple[float, float, float, float]):
+        for cell in self._cells_of(box):
+            members = self._cells.get(cell)
+
+            if members is not None:
+                members.pop(sprite, None)
+
+                if not members:
+                    del self._cells[cell]
+
+    def remove(self, sprite):
+        """
+        stop routing clicks to a sprite
+        """
+        if sprite not in self._handlers:
+            return
+
+        self._discard(sprite, self._boxes.pop(sprite))
+        del self._handlers[sprite]
+
+    def at(self, point: tuple[float, float]) -> list:
+        """
+        all sprites whose hit-box contains a point, in the order they were added
+        """
+        x, y = point
+        cell = (int(x // self.cell_size), int(y // self.cell_size))
+
+        hits = []
+        for sprite in self._cells.get(cell, ()):
+            bx, by, width, height = self._boxes[sprite]
+
+            if bx <= x <= bx + width and by <= y <= by + height:
+                hits.append(sprite)
+
+        hits.sort(key=lambda hit: self._handlers[hit][0])
+
+        return hits
+
+    def click(self, sprite, event: pg.event.Event):
+        """
+        pass a click on to a sprite
+        """
+        if sprite in self._handlers:
+            self._handlers[sprite][1](event)
+
+
 # Instances
 Drawn = _Drawn()
 Gates = _Gates()
 Wires = _Wires()
 Updated = _Updated()
+Clickable = _Clickable()
@@ -14,8 +14,9 @@ import pygame as pg
 import typing as tp
 
 from ..basegame.game import BaseGame
+from ..simulation.kernel import Simulation
 from ...additional.classes import Vec2
-from ..basegame.groups import Drawn, Updated, Gates
+from ..basegame.groups import Clickable, Drawn, Updated, Gates
 from .lines import Line
 
 
@@ -61,9 +62,9 @@ class Point(pg.sprite.Sprite):
     @property
     def position(self) -> Vec2:
         """
-        the points current position
+        the points current position (shared, set a new position instead of changing it)
         """
-        return self._pos.copy()
+        return self._pos
 
     @position.setter
     def position(self, pos: tuple[float | int, float | int] | Vec2):
@@ -74,6 +75,29 @@ class Point(pg.sprite.Sprite):
             pos = Vec2.from_cartesian(*pos)
 
         self._pos = pos.copy()
+        Clickable.update(self)
+
+    @property
+    def hit_box(self) -> tuple[float, float, float, float]:
+        """
+        the bounding box of the point (x, y, width, height)
+        """
+        return self._pos.x - self.radius, self._pos.y - self.radius, 2 * self.radius, 2 * self.radius
+
+    @property
+    def render_key(self) -> tuple:
+        if self._hidden:
+            return ()
+
+        hover = self.check_collision(Vec2.from_cartesian(*pg.mouse.get_pos()))
+        return self._pos.xy, self.radius, self.color, hover
+
+    @property
+    def bounds(self) -> pg.Rect:
+        if self._hidden:
+            return pg.Rect(0, 0, 0, 0)
+
+        return pg.Rect(self.hit_box).inflate(4, 4)
 
     def check_collision(self, point: Vec2):
         """
@@ -87,6 +111,7 @@ class Point(pg.sprite.Sprite):
 class DraggablePoint(Point):
     _live_follow: bool = False
     _mouse_delta_on_start: Vec2 = ...
+    _release_hook: int | None = None
 
     def __init__(
             self,
@@ -101,9 +126,8 @@ class DraggablePoint(Point):
         super().__init__(origin, color, radius)
         Updated.add(self)
 
-        # create hooks
-        BaseGame.on_event(pg.MOUSEBUTTONDOWN, self.start_follow)
-        BaseGame.on_event(pg.MOUSEBUTTONUP, self.stop_follow)
+        # only clicks on the point start following, releasing is listened to while following
+        Clickable.add(self, self.start_follow)
 
     def update(self, _delta: float):
         """
@@ -117,16 +141,21 @@ class DraggablePoint(Point):
         start the following of the mouse cursor
         """
         if event is ...:
-            self._live_follow = True
-            self._mouse_delta_on_start = Vec2()
+            self._follow(Vec2())
             return
 
         if event.button == 1:
             mouse_pos = Vec2.from_cartesian(*pg.mouse.get_pos())
 
             if self.check_collision(mouse_pos):
-                self._live_follow = True
-                self._mouse_delta_on_start = self.position - mouse_pos
+                self._follow(self.position - mouse_pos)
+
+    def _follow(self, delta: Vec2):
+        self._live_follow = True
+        self._mouse_delta_on_start = delta
+
+        if self._release_hook is None:
+            self._release_hook = BaseGame.on_event(pg.MOUSEBUTTONUP, self.stop_follow)
 
     def stop_follow(self, event):
         """
@@ -135,39 +164,72 @@ class DraggablePoint(Point):
         if event.button == 1:
             self._live_follow = False
 
+            if self._release_hook is not None:
+                BaseGame.clear_on_event(self._release_hook)
+                self._release_hook = None
+
 
 class LinePoint(Point):
     _connected_lines: list[Line]
-    _state: bool = False
+    _net: int | None
+    _port: tuple[int, int] | None
 
     def __init__(self, *args, **kwargs):
         """
         a point that triggers a line on creation
+
+        outputs drive the simulation net passed as "net",
+        inputs of gates listen on the simulation port (gate, port) passed as "port"
         """
         self._connected_lines = []
         self._parent = kwargs.pop("parent")
         self._type = kwargs.pop("type")
         self._pid = kwargs.pop("id")
-
-        if "update_parent" in kwargs.keys():
-            self.update_parent = kwargs.pop("update_parent")
-
-        else:
-            self.update_parent = True
+        self._net = kwargs.pop("net", None)
+        self._port = kwargs.pop("port", None)
 
         self._id = f"{self._parent.id}{self._type}{self._pid}"
 
         super().__init__(*args, **kwargs)
 
-        self._event_id = BaseGame.on_event(pg.MOUSEBUTTONDOWN, self.on_click)
+        if not self._hidden:
+            Clickable.add(self, self.on_click)
 
     @property
     def parent(self):
         return self._parent
 
     @property
-    def state(self):
-        return self._state
+    def state(self) -> bool:
+        """
+        the current value of the point, read from the simulation
+        """
+        if self._net is not None:
+            return Simulation.value(self._net)
+
+        if self._port is not None:
+            return Simulation.input_value(*self._port)
+
+        # inputs without a gate (outputs box) show the value of their line
+        for line in self._connected_lines:
+            if line.target is self:
+                return line.active
+
+        return False
+
+    @property
+    def net(self) -> int | None:
+        """
+        the simulation net driven by this point (outputs only)
+        """
+        return self._net
+
+    @property
+    def port(self) -> tuple[int, int] | None:
+        """
+        the simulation gate and port listening to this point (inputs only)
+        """
+        return self._port
 
     @property
     def id(self) -> str:
@@ -180,9 +242,9 @@ class LinePoint(Point):
     @property
     def position(self) -> Vec2:
         """
-        the points current position
+        the points current position (shared, set a new position instead of changing it)
         """
-        return self._pos.copy()
+        return self._pos
 
     @position.setter
     def position(self, pos: tuple[float | int, float | int] | Vec2):
@@ -193,14 +255,15 @@ class LinePoint(Point):
             pos = Vec2.from_cartesian(*pos)
 
         self._pos = pos.copy()
+        Clickable.update(self)
 
         for line in self._connected_lines:
             with suppress(IndexError):
                 if "o" in self._type:
-                    line.set_points[0] = self.position
+                    line.move_point(0, self.position)
                     continue
 
-                line.set_points[-1] = self.position
+                line.move_point(-1, self.position)
 
     def add_connection(self, line: Line):
         self._connected_lines.append(line)
@@ -232,36 +295,11 @@ class LinePoint(Point):
                     BaseGame.globals.drawing_line = line
                     self._connected_lines.append(line)
 
-    def update_input(self, value: bool):
-        """
-        update a point that is an input
-        """
-        if "i" not in self._type:
-            return
-            # raise RuntimeError("can only update the input values of an input gate")
-
-        self._state = value
-
-        if self.update_parent:
-            self.parent.update_input(self._pid, value)
-
-    def update_connections(self, value: bool):
-        """
-        update all connected points (gates)
-        """
-        if "o" not in self._type:
-            return
-            # raise RuntimeError("can only update from an output")
-
-        # update points
-        for line in self._connected_lines:
-            line.active = value
-
     def delete(self):
         """
         remove and destroy the button
         """
-        BaseGame.clear_on_event(self._event_id)
+        Clickable.remove(self)
         with suppress(KeyError):
             Drawn.remove(self)
 
@@ -320,12 +358,32 @@ class Button(pg.sprite.Sprite):
         super().__init__()
         Drawn.add(self)
 
-        self.__event_id = BaseGame.on_event(pg.MOUSEBUTTONDOWN, self.__on_click)
+        Clickable.add(self, self.__on_click)
 
     @property
     def position(self) -> Vec2:
         return self._position
 
+    @property
+    def hit_box(self) -> tuple[float, float, float, float]:
+        return *self._position.xy, *self._size.xy
+
+    @property
+    def _hover(self) -> bool:
+        return self.check_collision(Vec2.from_cartesian(*pg.mouse.get_pos())) and not BaseGame.stop_listen()
+
+    @property
+    def render_key(self) -> tuple:
+        return (
+            self._position.xy, self._size.xy, self._hover, self.text,
+            self.bg, self.fg, self.active_bg, self.active_fg,
+        )
+
+    @property
+    def bounds(self) -> pg.Rect:
+        text = BaseGame.text_bounds(self.text, (self._position + (self._size / 2)).xy)
+        return pg.Rect(self.hit_box).union(text).inflate(2, 2)
+
     def __on_click(self, event: pg.event.Event):
         """
         called by an event, executes the on_click function
@@ -347,9 +405,7 @@ class Button(pg.sprite.Sprite):
         """
         draw the button on the screen
         """
-        mouse_pos = Vec2.from_cartesian(*pg.mouse.get_pos())
-
-        hover = self.check_collision(mouse_pos) and not BaseGame.stop_listen()
+        hover = self._hover
 
         pg.draw.rect(
             BaseGame.lowest_layer,
@@ -361,7 +417,7 @@ class Button(pg.sprite.Sprite):
         )
 
         # draw text
-        text = BaseGame.font.render(self.text, True, self.active_fg if hover else self.fg)
+        text = BaseGame.render_text(self.text, self.active_fg if hover else self.fg)
         text_rect = text.get_rect()
 
         text_rect.center = (self._position + (self._size / 2)).xy
@@ -372,7 +428,7 @@ class Button(pg.sprite.Sprite):
         """
         properly dismisses the button
         """
-        BaseGame.clear_on_event(self.__event_id)
+        Clickable.remove(self)
         Drawn.remove(self)
 
     def delete(self):
@@ -380,8 +436,7 @@ class Button(pg.sprite.Sprite):
         completely remove the button
         """
         Drawn.remove(self)
-        with suppress(KeyError):
-            BaseGame.clear_on_event(self.__event_id)
+        Clickable.remove(self)
 
 
 class Focusable(pg.sprite.Sprite):
@@ -477,7 +532,9 @@ class Entry(Focusable):
 
         self.__event_ids: list[int] = []
         self.__event_ids.append(BaseGame.on_event(pg.KEYDOWN, self.on_keypress))
-        self.__event_ids.append(BaseGame.on_event(pg.MOUSEBUTTONDOWN, self.on_mouse_button_down))
+
+        # while focused, BaseGame also passes on clicks outside of the entry
+        Clickable.add(self, self.on_mouse_button_down)
 
     @property
     def text(self) -> str:
@@ -510,6 +567,7 @@ class Entry(Focusable):
             value = Vec2.from_cartesian(*value)
 
         self._position = value
+        Clickable.update(self)
 
     @property
     def size(self) -> Vec2:
@@ -527,6 +585,30 @@ class Entry(Focusable):
             value = Vec2.from_cartesian(*value)
 
         self._size = value
+        Clickable.update(self)
+
+    @property
+    def hit_box(self) -> tuple[float, float, float, float]:
+        return *self.position.xy, *self.size.xy
+
+    @property
+    def _cursor_visible(self) -> bool:
+        """
+        the cursor blinks while focused
+        """
+        return self.focused and int(str(time.time()).split(".")[-1][0]) < 5
+
+    @property
+    def render_key(self) -> tuple:
+        return (
+            self.position.xy, self.size.xy, self.focused, self.text, self._cursor_pos, self._cursor_visible,
+            self.bg, self.active_bg, self.fg, self.active_fg, self.cursor_color,
+        )
+
+    @property
+    def bounds(self) -> pg.Rect:
+        text = BaseGame.text_bounds(self.text, (self.position + self.size / 2).xy)
+        return pg.Rect(self.hit_box).union(text).inflate(12, 2)
 
     def draw(self, surface: pg.Surface):
         """
@@ -542,21 +624,18 @@ class Entry(Focusable):
         )
 
         # draw text
-        text = BaseGame.font.render(self.text, True, self.active_fg if self.focused else self.fg)
+        text = BaseGame.render_text(self.text, self.active_fg if self.focused else self.fg)
         text_rect = text.get_rect()
 
         text_rect.center = (self.position + self.size / 2).xy
 
         surface.blit(text, text_rect)
 
-        blink = int(str(time.time()).split(".")[-1][0]) < 5
-
         # if focused, draw cursor
-        if self.focused and blink:
-            sample_text = BaseGame.font.render(self.text[:self._cursor_pos], True, self.fg)
-            sample_rect = sample_text.get_rect()
+        if self._cursor_visible:
+            sample_width, _ = BaseGame.font.size(self.text[:self._cursor_pos])
 
-            cursor_pos = [text_rect.x + sample_rect.size[0], self.position.y]
+            cursor_pos = [text_rect.x + sample_width, self.position.y]
             cursor_pos[1] += int(self.size.y / 10)
 
             size = (5, self.size.y * .8)
@@ -629,6 +708,7 @@ class Entry(Focusable):
         """
         for eid in self.__event_ids:
             BaseGame.clear_on_event(eid)
+        Clickable.remove(self)
         Drawn.remove(self)
 
 
@@ -660,13 +740,23 @@ class CircularButton(Button):
             text,
         )
 
+    @property
+    def _hover(self) -> bool:
+        return self.check_collision(Vec2.from_cartesian(*pg.mouse.get_pos()))
+
+    @property
+    def bounds(self) -> pg.Rect:
+        circle = pg.Rect(0, 0, 2 * self._radius, 2 * self._radius)
+        circle.center = self._position.xy
+
+        text = BaseGame.text_bounds(self.text, (self._position + (self._size / 2)).xy)
+        return circle.union(text).inflate(2, 2)
+
     def draw(self, surface: pg.Surface):
         """
         draw the button on the screen
         """
-        mouse_pos = Vec2.from_cartesian(*pg.mouse.get_pos())
-
-        hover = self.check_collision(mouse_pos)
+        hover = self._hover
 
         pg.draw.circle(
             surface,
@@ -676,7 +766,7 @@ class CircularButton(Button):
         )
 
         # draw text
-        text = BaseGame.font.render(self.text, True, self.active_fg if hover else self.fg)
+        text = BaseGame.render_text(self.text, self.active_fg if hover else self.fg)
         text_rect = text.get_rect()
 
         text_rect.center = (self._position + (self._size / 2)).xy
@@ -696,6 +786,7 @@ class IOToggleButton(pg.sprite.Sprite):
             type: str,
     ):
         self._parent = parent
+        self._type = type
 
         super().__init__()
 
@@ -713,18 +804,20 @@ class IOToggleButton(pg.sprite.Sprite):
             parent=parent,
             id=pid,
             type=type,
+            net=Simulation.add_net() if type == "o" else None,
         )
         Drawn.remove(self.cb)
         Drawn.remove(self.lb)
         Drawn.add(self)
 
-    def set_state(self, value: bool):
-        self._state = value
-        self._update()
-
     def on_toggle(self, *_trash):
+        # outputs only display the simulated state
+        if self._type != "o":
+            return
+
         # actual toggling
         self._state = not self._state
+        Simulation.set(self.lb.net, self._state)
         self._update()
 
     def _update(self):
@@ -736,10 +829,20 @@ class IOToggleButton(pg.sprite.Sprite):
             self.cb.bg = (70, 70, 70, 255)
             self.cb.active_bg = (100, 100, 100, 255)
 
-        # update parent
-        self.lb.update_connections(self._state)
+    @property
+    def render_key(self) -> tuple:
+        return self.cb.render_key, self.lb.render_key, self.lb.state
+
+    @property
+    def bounds(self) -> pg.Rect:
+        line = pg.Rect(self.cb.position.xy, (0, 0)).union(pg.Rect(self.lb.position.xy, (0, 0))).inflate(6, 6)
+        return self.cb.bounds.union(self.lb.bounds).union(line)
 
     def draw(self, surface: pg.Surface):
+        if self._type == "i" and self.lb.state != self._state:
+            self._state = self.lb.state
+            self._update()
+
         pg.draw.line(surface, (0, 0, 0, 255), self.cb.position.xy, self.lb.position.xy, 5)
 
         self.cb.draw(surface)
@@ -754,6 +857,9 @@ class IOToggleButton(pg.sprite.Sprite):
         self.lb.delete()
         self.kill()
 
+        if self.lb.net is not None:
+            Simulation.remove_net(self.lb.net)
+
 
 class IOBox(pg.sprite.Sprite):
     _pos: Vec2
@@ -791,7 +897,7 @@ class IOBox(pg.sprite.Sprite):
         super().__init__()
         Drawn.add(self)
 
-        BaseGame.on_event(pg.MOUSEBUTTONDOWN, self.on_click)
+        Clickable.add(self, self.on_click)
 
     @property
     def id(self) -> int:
@@ -807,6 +913,23 @@ class IOBox(pg.sprite.Sprite):
             value = Vec2.from_cartesian(*value)
 
         self._pos = value
+        Clickable.update(self)
+
+    @property
+    def hit_box(self) -> tuple[float, float, float, float]:
+        return *self.position.xy, *self.size.xy
+
+    @property
+    def render_key(self) -> tuple:
+        mouse_pos = Vec2.from_cartesian(*pg.mouse.get_pos())
+        hover = self.check_collision(mouse_pos) and not BaseGame.stop_listen()
+
+        return self.position.xy, self.size.xy, mouse_pos.y if hover else None
+
+    @property
+    def bounds(self) -> pg.Rect:
+        # the hover circle reaches over the top and bottom
+        return pg.Rect(self.hit_box).inflate(2, 42)
 
     @property
     def inputs(self) -> list[IOToggleButton]:
@@ -919,6 +1042,3 @@ class OutputsBox(IOBox):
                 type="i",
             )
         )
-
-    def update_input(self, id: int, value: bool):
-        self._inputs[id].set_state(value)
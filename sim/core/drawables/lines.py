@@ -12,26 +12,31 @@ from contextlib import suppress
 
 import pygame as pg
 from ..basegame.game import BaseGame
+from ..simulation.kernel import Simulation
 from ...additional.classes import Vec2
 from ..basegame.groups import Drawn, Wires
-from ...additional.functions import create_bezier
+from ...additional.functions import rounded_polylines
 
 
-def aa_line(surface: pg.Surface, color: tuple[float, float, float], start_pos: tp.Any, end_pos: tp.Any, width: int = 1):
+def aa_lines(surface: pg.Surface, color: tuple[float, float, float], points: tp.Sequence, width: int = 1):
     """
-    anti-aliased line
+    anti-aliased polyline
     """
+    if len(points) < 2:
+        return
+
     # big back line
-    pg.draw.line(surface, color + (100,), start_pos, end_pos, width + 2)
+    pg.draw.lines(surface, color + (100,), False, points, width + 2)
 
     # main line
-    pg.draw.line(surface, color + (255,), start_pos, end_pos, width)
+    pg.draw.lines(surface, color + (255,), False, points, width)
 
 
 class Line(pg.sprite.Sprite):
     set_points: list[Vec2] = ...
     _finished: bool = False
-    _active: bool = False
+    _outline: list[list[float]] | None = None
+    _version: int = 0
 
     def __init__(self, start_pos: Vec2, parent):
         """
@@ -63,40 +68,97 @@ class Line(pg.sprite.Sprite):
 
     @property
     def active(self) -> bool:
-        return self._active
-
-    @active.setter
-    def active(self, value: bool):
-        self._active = value
+        """
+        the simulated value of the net this line carries
+        """
+        if self._parent is None:
+            return False
 
-        if self.target is not None:
-            self.target.update_input(value)
+        return Simulation.value(self._parent.net)
 
     def set_target(self, target):
         """
         set the target node
         """
+        self._disconnect()
         self._target = target
+        self._connect()
 
     def set_parent(self, parent):
         self._parent = parent
+        self._connect()
 
-    def draw(self, _surface: pg.Surface):
+    def _connect(self):
         """
-        draw the current line
+        connect the parents net to the targets port in the simulation
         """
-        if self.parent is not None and "c" in self.parent.id:
+        if self._parent is None or self._target is None or self._target.port is None:
             return
 
-        if self.target is not None and "c" in self.target.id:
+        Simulation.connect(self._parent.net, *self._target.port)
+
+    def _disconnect(self):
+        """
+        remove the connection this line made in the simulation
+        """
+        if self._parent is None or self._target is None or self._target.port is None:
+            return
+
+        if Simulation.input_net(*self._target.port) == self._parent.net:
+            Simulation.disconnect(*self._target.port)
+
+    @property
+    def _hidden(self) -> bool:
+        """
+        lines inside of blocks are not drawn
+        """
+        if self.parent is not None and "c" in self.parent.id:
+            return True
+
+        return self.target is not None and "c" in self.target.id
+
+    @property
+    def render_key(self) -> tp.Hashable:
+        if self._hidden:
+            return ()
+
+        # lines that are still drawn follow the mouse and listen to the keyboard
+        if not self._finished:
+            return object()
+
+        return self._version, self.active
+
+    @property
+    def bounds(self) -> pg.Rect:
+        points = [point.xy for point in self.set_points]
+        if not self._finished:
+            points.append(pg.mouse.get_pos())
+
+        if self._hidden or not points:
+            return pg.Rect(0, 0, 0, 0)
+
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+
+        # the curves stay within the corners, the lines are up to 5 pixels wide
+        return pg.Rect(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)).inflate(8, 8)
+
+    def draw(self, _surface: pg.Surface):
+        """
+        draw the current line
+        """
+        if self._hidden:
             return
 
         if pg.key.get_pressed()[pg.K_ESCAPE] and not self._finished:
             self.cancel()
 
-        calc_points = self.set_points.copy()
+        if self._finished:
+            outline = self.outline
+
+        else:
+            calc_points = self.set_points.copy()
 
-        if not self._finished:
             # if shift is held, draw a straight line
             mouse_pos = pg.mouse.get_pos()
             mouse_pos = Vec2.from_cartesian(*mouse_pos)
@@ -114,45 +176,38 @@ class Line(pg.sprite.Sprite):
             else:
                 calc_points.append(mouse_pos)
 
-        # draw lines
-        for i in range(len(calc_points) - 2):
-            de1 = calc_points[i+1] - calc_points[i]
-            de2 = calc_points[i+2] - calc_points[i+1]
-
-            p1 = calc_points[i] + de1 * .8
-            p2 = calc_points[i+1] + de2 * .2
-
-            # create curves for the edges
-            curve = create_bezier(p1, p2, calc_points[i+1])
-            for j in range(len(curve) - 1):
-                aa_line(
-                    BaseGame.lowest_layer,
-                    (255, 0, 0) if self.active else (50, 0, 0),
-                    curve[j].xy, curve[j+1].xy,
-                    width=3,
-                )
-
-            # draw straights
-            aa_line(
-                BaseGame.lowest_layer,
-                color=(255, 0, 0) if self.active else (50, 0, 0),
-                start_pos=(calc_points[i+1]-de1 * .8).xy if i != 0 else calc_points[0].xy,
-                end_pos=p1.xy,
-                width=3,
-            )
-
-        if len(calc_points) > 1:
-            de2 = calc_points[-1] - calc_points[-2]
-
-            p2 = calc_points[-2] + de2 * .2
-
-            aa_line(
-                BaseGame.lowest_layer,
-                color=(255, 0, 0) if self.active else (50, 0, 0),
-                start_pos=p2.xy if len(calc_points) != 2 else calc_points[0].xy,
-                end_pos=calc_points[-1].xy,
-                width=3,
-            )
+            outline = rounded_polylines([[point.xy for point in calc_points]])[0].tolist()
+
+        color = (255, 0, 0) if self.active else (50, 0, 0)
+        aa_lines(BaseGame.lowest_layer, color, outline, width=3)
+
+    @property
+    def outline(self) -> list[list[float]]:
+        """
+        the points the line is drawn through, only recalculated when its points change
+        """
+        if self._outline is None:
+            self.prepare([self])
+
+        return self._outline
+
+    @staticmethod
+    def prepare(lines: tp.Iterable["Line"]):
+        """
+        calculate the outlines of many lines at once (e.g. after loading a file)
+        """
+        lines = [line for line in lines if line._outline is None]
+        outlines = rounded_polylines([[point.xy for point in line.set_points] for line in lines])
+
+        for line, outline in zip(lines, outlines):
+            line._outline = outline.tolist()
+
+    def _changed(self):
+        """
+        forget the cached shape of the line
+        """
+        self._outline = None
+        self._version += 1
 
     def add_current_mouse(self, event: pg.event.Event):
         """
@@ -178,6 +233,14 @@ class Line(pg.sprite.Sprite):
         add a point to the line
         """
         self.set_points.append(point)
+        self._changed()
+
+    def move_point(self, index: int, point: Vec2):
+        """
+        move a point of the line (e.g. the end connected to a moved gate)
+        """
+        self.set_points[index] = point
+        self._changed()
 
     def cancel(self):
         """
@@ -186,9 +249,12 @@ class Line(pg.sprite.Sprite):
         if BaseGame.globals.drawing_line is self:
             BaseGame.globals.drawing_line = None
 
+        self._disconnect()
         Drawn.remove(self)
+        Wires.remove(self)
 
         self.set_points.clear()
+        self._changed()
 
         self.finish()
         del self
@@ -7,14 +7,18 @@ adds basic and modular logic stuff
 Author:
 Nilusink
 """
-from contextlib import suppress
-
 import pygame as pg
 import typing as tp
 
 from ..basegame.game import BaseGame
+from ..simulation.tables import TruthTable, table_for
+from ..simulation.optimize import optimized_for
+from ..simulation.instances import Instance, program_for
+from ..simulation.kernel import Simulation
+from ..simulation.netlist import Netlist, AND, NOT, BLOCK
+from ..simulation.registry import GateType, GateTypes
 from ...additional.classes import Vec2
-from ..basegame.groups import Gates, Updated, Drawn
+from ..basegame.groups import Clickable, Gates, Updated, Drawn
 from .interactions import LinePoint, DraggablePoint
 
 
@@ -23,8 +27,8 @@ class Base(DraggablePoint):
     basic logic element
     """
     _size: Vec2
+    _node: int
     port_size: float = 10
-    port_states: list[bool]
 
     _input_points: list[LinePoint]
     _output_points: list[LinePoint]
@@ -46,8 +50,6 @@ class Base(DraggablePoint):
 
         self.__initial_args = (position.copy(), name, logic_func, inputs, outputs)
 
-        self.port_states = [False] * inputs
-
         self._input_points = []
         self._output_points = []
 
@@ -57,6 +59,7 @@ class Base(DraggablePoint):
         self._inputs = inputs
         self._outputs = outputs
         self._logic_func = logic_func
+        self._node = self._create_node()
 
         super().__init__(position)
         # Updated.add(self)
@@ -69,6 +72,29 @@ class Base(DraggablePoint):
     def name(self) -> str:
         return self._name
 
+    @property
+    def node(self) -> int:
+        """
+        the gates id in the simulation
+        """
+        return self._node
+
+    @property
+    def port_states(self) -> list[bool]:
+        return [Simulation.input_value(self._node, i) for i in range(self._inputs)]
+
+    def _create_node(self) -> int:
+        """
+        register the gate in the simulation
+        """
+        return Simulation.add_gate(self._logic_func, self._inputs, self._outputs)
+
+    def _output_net(self, output_id: int) -> int:
+        """
+        the net driven by an output port
+        """
+        return Simulation.output(self._node, output_id)
+
     def _port_setup(self):
         # setup ports
         for i in range(self._inputs):
@@ -84,6 +110,7 @@ class Base(DraggablePoint):
                     parent=self,
                     type="i",
                     id=i,
+                    port=(self._node, i),
                 )
             )
 
@@ -100,6 +127,7 @@ class Base(DraggablePoint):
                     parent=self,
                     type="o",
                     id=i,
+                    net=self._output_net(i),
                 )
             )
 
@@ -114,6 +142,18 @@ class Base(DraggablePoint):
         """
         return self.__id
 
+    @property
+    def type_id(self) -> int:
+        """
+        the id of the gates type, used in saves
+        """
+        gate_type = GateTypes.of(self._logic_func)
+
+        if gate_type is None:
+            raise RuntimeError(f"the logic function of {self} is not a registered gate type")
+
+        return gate_type.id
+
     @property
     def input_points(self) -> list[LinePoint]:
         return self._input_points
@@ -126,8 +166,6 @@ class Base(DraggablePoint):
         """
         draws the gate
         """
-        self.update_logic()
-
         p0x = self.position.x - self._size.x / 2
         p0y = self.position.y - self._size.y / 2
 
@@ -141,24 +179,27 @@ class Base(DraggablePoint):
         )
 
         # draw text
-        text = BaseGame.font.render(self._name, True, (0, 0, 0, 255))
+        text = BaseGame.render_text(self._name, (0, 0, 0, 255))
         text_rect = text.get_rect()
 
         text_rect.center = self.position.xy
 
         surface.blit(text, text_rect)
 
-    def update_logic(self, *_trash):
-        result: tuple[bool] | bool = self._logic_func(*self.port_states)
-
-        if issubclass(type(result), tuple):
-            with suppress(IndexError):
-                for i in range(len(result)):
-                    self._output_points[i].update_connections(result[i])
+    @property
+    def hit_box(self) -> tuple[float, float, float, float]:
+        """
+        the gates rectangle (x, y, width, height)
+        """
+        return self._pos.x - self._size.x / 2, self._pos.y - self._size.y / 2, *self._size.xy
 
-            return
+    @property
+    def render_key(self) -> tuple:
+        return self._pos.xy, self._size.xy, self.color, self._name
 
-        self._output_points[0].update_connections(result)
+    @property
+    def bounds(self) -> pg.Rect:
+        return pg.Rect(self.hit_box).union(BaseGame.text_bounds(self._name, self._pos.xy)).inflate(2, 2)
 
     def check_collision(self, point: Vec2):
         """
@@ -172,9 +213,9 @@ class Base(DraggablePoint):
     @property
     def position(self) -> Vec2:
         """
-        the points current position
+        the points current position (shared, set a new position instead of changing it)
         """
-        return self._pos.copy()
+        return self._pos
 
     @position.setter
     def position(self, pos: tuple[float | int, float | int] | Vec2):
@@ -185,6 +226,7 @@ class Base(DraggablePoint):
             pos = Vec2.from_cartesian(*pos)
 
         self._pos = pos.copy()
+        Clickable.update(self)
 
         # update input points
         for i in range(len(self._input_points)):
@@ -202,12 +244,6 @@ class Base(DraggablePoint):
 
             self._output_points[i].position = Vec2.from_cartesian(self.position.x + self._size.x / 2, y)
 
-    def update_input(self, input_id: int, value: bool):
-        """
-        update the logic gate
-        """
-        self.port_states[input_id] = value
-
     def delete(self):
         """
         removes the gate
@@ -224,8 +260,11 @@ class Base(DraggablePoint):
             point.delete()
 
         # remove self
+        Simulation.remove_gate(self._node)
+        Clickable.remove(self)
         Updated.remove(self)
         Drawn.remove(self)
+        Gates.remove(self)
 
         del self
 
@@ -236,37 +275,57 @@ class Base(DraggablePoint):
         return f"<Block {self.__class__.__name__}, id={self.id}>"
 
 
-class And(Base):
-    def __init__(self, position: Vec2):
+class Gate(Base):
+    """
+    a gate of a registered type (see GateTypes)
+    """
+    _type: GateType
+
+    def __init__(self, position: Vec2, gate_type: GateType | int | str):
+        if not isinstance(gate_type, GateType):
+            gate_type = GateTypes[gate_type]
+
+        self._type = gate_type
         self.__initial_args: tuple[Vec2] = (position.copy(),)
-        super().__init__(position, "And", self.logic_func, 2, 1)
+        super().__init__(position, gate_type.name, gate_type.func, gate_type.n_inputs, gate_type.n_outputs)
 
-    @staticmethod
-    def logic_func(x: bool, y: bool) -> bool:
-        return x and y
+    @property
+    def type(self) -> GateType:
+        return self._type
+
+    @property
+    def type_id(self) -> int:
+        return self._type.id
 
     @property
     def initial_args(self) -> tuple[Vec2]:
         return self.__initial_args
 
 
-class Not(Base):
+class And(Gate):
     def __init__(self, position: Vec2):
-        self.__initial_args: tuple[Vec2] = (position.copy(),)
-        super().__init__(position, "Not", self.logic_func, 1, 1)
+        super().__init__(position, AND)
 
-    @staticmethod
-    def logic_func(x: bool) -> bool:
-        return not x
 
-    @property
-    def initial_args(self) -> tuple[Vec2]:
-        return self.__initial_args
+class Not(Gate):
+    def __init__(self, position: Vec2):
+        super().__init__(position, NOT)
 
 
 class CustomBlock(Base):
+    # simulate blocks that are no table as flattened and optimized gates
+    flatten: bool = True
+
+    # run blocks that are no table as one gate with its own state and the shared compiled definition,
+    # instead of adding all inner gates to the simulation
+    instanced: bool = True
+
     _input_output_points: list[LinePoint]
     _output_input_points: list[LinePoint]
+    _definition: Netlist | None
+    _table: TruthTable | None
+    _instance: Instance | None
+    _inner: list[int]
 
     def __init__(
             self,
@@ -274,13 +333,25 @@ class CustomBlock(Base):
             name: str,
             logic_func: tp.Callable,
             inputs: int,
-            outputs: int
+            outputs: int,
+            definition: Netlist = None,
     ):
+        """
+        :param definition: the blocks inner gates, if they should not be created as gates on the board.
+            Combinational blocks become a table lookup, others an instance of the compiled definition
+        """
         self._input_output_points = []
         self._output_input_points = []
+        self._definition = definition
+        self._table = None if definition is None else table_for(definition)
+        self._instance = None
+        self._inner = []
 
         super().__init__(position, name, logic_func, inputs, outputs)
 
+        if definition is not None and self._table is None and self._instance is None:
+            self._build_definition()
+
         # setup ports
         for i in range(self._inputs):
             off = self._size.y / (self._inputs * 2)
@@ -296,7 +367,7 @@ class CustomBlock(Base):
                     type="co",
                     id=i,
                     hidden=True,
-                    update_parent=False,
+                    net=Simulation.output(self._node, i),
                 )
             )
 
@@ -314,21 +385,97 @@ class CustomBlock(Base):
                     type="ci",
                     id=i,
                     hidden=True,
-                    update_parent=False,
+                    port=(self._node, self._inputs + i),
                 )
             )
 
-    def update_input(self, input_id: int, value: bool):
+    @staticmethod
+    def logic_func(*values: bool) -> tuple[bool, ...]:
+        """
+        a block only passes its values on, the inputs to the inner gates
+        and the inner gates results to the outputs
+        """
+        return values
+
+    def _table_func(self, *values: bool) -> tuple[bool, ...]:
         """
-        update the logic gate
+        look the outputs up instead of passing the values through inner gates
         """
-        self.port_states[input_id] = value
-        self._input_output_points[input_id].update_connections(value)
+        inputs = values[:self._inputs]
+        return inputs + self._table(*inputs)
 
-    def update_logic(self, *_trash):
-        with suppress(IndexError):
-            for i in range(self._outputs):
-                self._output_points[i].update_connections(self._output_input_points[i].state)
+    def _instance_func(self, *values: bool) -> tuple[bool, ...]:
+        """
+        run the compiled definition on the blocks own state
+        """
+        inputs = values[:self._inputs]
+        return inputs + self._instance(*inputs)
+
+    def _create_node(self) -> int:
+        """
+        register the block in the simulation
+
+        ports 0 to inputs-1 connect the outer inputs to the inner gates,
+        the remaining ports connect the inner gates to the outer outputs
+        """
+        ports = self._inputs + self._outputs
+
+        if self._table is not None:
+            return Simulation.add_gate(self._table_func, ports, ports)
+
+        if self._definition is not None and self.instanced:
+            definition = optimized_for(self._definition) if self.flatten else self._definition
+            self._instance = Instance(program_for(definition))
+
+            return Simulation.add_gate(self._instance_func, ports, ports)
+
+        return Simulation.add_gate(self.logic_func, ports, ports)
+
+    def _build_definition(self):
+        """
+        create the inner gates in the simulation only, wired to the blocks ports
+        """
+        definition = optimized_for(self._definition) if self.flatten else self._definition
+
+        _, outputs, self._inner = Simulation.add_netlist(
+            definition,
+            inputs=[Simulation.output(self._node, i) for i in range(self._inputs)],
+        )
+
+        for i, net in enumerate(outputs):
+            if net is not None:
+                Simulation.connect(net, self._node, self._inputs + i)
+
+    @property
+    def type_id(self) -> int:
+        return BLOCK
+
+    @property
+    def definition(self) -> Netlist | None:
+        """
+        the blocks inner gates, if they are not part of the board
+        """
+        return self._definition
+
+    def delete(self):
+        """
+        removes the block
+        """
+        for point in self._input_output_points + self._output_input_points:
+            for line in point.connected_lines:
+                line.delete()
+            point.delete()
+
+        for gate in self._inner:
+            Simulation.remove_gate(gate)
+
+        super().delete()
+
+    def _output_net(self, output_id: int) -> int:
+        """
+        the net driven by an output port
+        """
+        return Simulation.output(self._node, self._inputs + output_id)
 
     @property
     def input_output_points(self) -> list[LinePoint]:
@@ -341,9 +488,9 @@ class CustomBlock(Base):
     @property
     def position(self) -> Vec2:
         """
-        the points current position
+        the points current position (shared, set a new position instead of changing it)
         """
-        return self._pos.copy()
+        return self._pos
 
     @position.setter
     def position(self, pos: tuple[float | int, float | int] | Vec2):
@@ -354,6 +501,7 @@ class CustomBlock(Base):
             pos = Vec2.from_cartesian(*pos)
 
         self._pos = pos.copy()
+        Clickable.update(self)
 
         # update input points
         for i in range(len(self._input_points)):
@@ -0,0 +1,268 @@
+"""
+library.py
+18. October 2026
+
+index of the saved blocks, every block is compiled once and cached
+
+Author:
+Nilusink
+"""
+import typing as tp
+import struct
+import json
+import sys
+import os
+
+from .simulation.binary import save_netlist, read_netlist
+from .simulation.netlist import Netlist, BLOCK, compile_file
+
+
+# kept in the blocks directory
+INDEX_FILE: str = ".index.json"
+CACHE_DIR: str = ".cache"
+INDEX_VERSION: int = 2
+
+# files that can be blocks
+EXTENSIONS: tuple[str, ...] = (".json", ".lsim")
+
+
+# what a broken block file can raise while compiling
+COMPILE_ERRORS: tuple[type[Exception], ...] = (OSError, ValueError, KeyError, IndexError, struct.error, RuntimeError)
+
+
+class BlockEntry(tp.TypedDict):
+    file: str
+    name: str
+    mtime: float
+    size: int
+    # filled in when the block is first used
+    compiled: bool
+    error: str | None
+    inputs: int
+    outputs: int
+    digest: str
+    dependencies: list[str]
+
+
+class BlockLibrary:
+    """
+    all blocks saved in a directory
+
+    the index (name, ports, digest and the blocks used inside of every block) is saved
+    in the directory. Listing the directory only looks at the size and modification time of
+    the files, blocks are compiled when they are first used and cached in a binary file,
+    so a netlist is parsed at most once per session and never from JSON again until the block changes.
+    A file that can't be compiled is reported and left out of the entries.
+    """
+    directory: str
+    _entries: dict[str, BlockEntry]
+    _netlists: dict[str, Netlist]
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._entries = {}
+        self._netlists = {}
+
+        self._load_index()
+        self.refresh()
+
+    @property
+    def entries(self) -> list[BlockEntry]:
+        """
+        all blocks that are not known to be broken, sorted by name
+        """
+        return sorted(
+            (entry for entry in self._entries.values() if entry["error"] is None), key=lambda entry: entry["name"]
+        )
+
+    def __contains__(self, file: str) -> bool:
+        return os.path.basename(file) in self._entries
+
+    def __getitem__(self, file: str) -> BlockEntry:
+        return self._entries[os.path.basename(file)]
+
+    def path(self, file: str) -> str:
+        """
+        the full path of a block file
+        """
+        return os.path.join(self.directory, os.path.basename(file))
+
+    def cache_file(self, file: str) -> str:
+        """
+        the compiled (binary) version of a block file
+        """
+        path = self.path(file)
+
+        if path.endswith(".lsim"):
+            return path
+
+        return os.path.join(self.directory, CACHE_DIR, os.path.basename(file) + ".lsim")
+
+    def compile(self, file: str) -> bool:
+        """
+        make sure a block is compiled and its cache file exists
+
+        :returns: False if the block is unknown or can't be compiled (the error is reported)
+        """
+        file = os.path.basename(file)
+        entry = self._entries.get(file)
+
+        if entry is None or entry["error"] is not None:
+            return False
+
+        if entry["compiled"] and os.path.exists(self.cache_file(file)):
+            return True
+
+        try:
+            netlist = compile_file(self.path(file))
+
+            cache = self.cache_file(file)
+            if cache != self.path(file):
+                os.makedirs(os.path.dirname(cache), exist_ok=True)
+                save_netlist(netlist, cache)
+
+        except COMPILE_ERRORS as error:
+            entry["error"] = f"{type(error).__name__}: {error}"
+            print(f"can't load block \"{file}\": {entry['error']}", file=sys.stderr)
+
+            self._save_index()
+            return False
+
+        self._netlists[file] = netlist
+        entry.update({
+            "compiled": True,
+            "inputs": netlist.n_inputs,
+            "outputs": netlist.n_outputs,
+            "digest": netlist.digest(),
+            "dependencies": sorted({
+                netlist.names[gate] for gate in range(netlist.n_gates)
+                if netlist.types[gate] == BLOCK and netlist.parents[gate] == -1
+            }),
+        })
+
+        self._save_index()
+        return True
+
+    def netlist(self, file: str) -> Netlist | None:
+        """
+        the compiled block, read once per session (shared, don't change it)
+
+        :returns: None if the block can't be compiled
+        """
+        file = os.path.basename(file)
+
+        if file not in self._netlists:
+            if not self.compile(file):
+                return None
+
+        if file not in self._netlists:
+            try:
+                with open(self.cache_file(file), "rb") as infile:
+                    self._netlists[file] = read_netlist(infile)
+
+            except COMPILE_ERRORS:
+                # a broken cache is compiled again
+                self._entries[file]["compiled"] = False
+                if not self.compile(file):
+                    return None
+
+        return self._netlists[file]
+
+    def refresh(self, file: str = ...) -> bool:
+        """
+        update the index for files that were added, changed or removed
+
+        :param file: only check this file, all files by default
+        :returns: True if the index changed
+        """
+        if file is ...:
+            files = [name for name in self._list_files()]
+            gone = [name for name in self._entries if name not in files]
+
+        else:
+            file = os.path.basename(file)
+            files = [file] if os.path.isfile(self.path(file)) else []
+            gone = [file] if not files and file in self._entries else []
+
+        changed = False
+        for name in gone:
+            self._forget(name)
+            changed = True
+
+        for name in files:
+            stat = os.stat(self.path(name))
+            entry = self._entries.get(name)
+
+            if entry is not None and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                continue
+
+            self._add(name, stat)
+            changed = True
+
+        if changed:
+            self._save_index()
+
+        return changed
+
+    def _list_files(self) -> list[str]:
+        if not os.path.isdir(self.directory):
+            return []
+
+        return [
+            entry.name for entry in os.scandir(self.directory)
+            if entry.is_file() and not entry.name.startswith(".") and entry.name.endswith(EXTENSIONS)
+        ]
+
+    def _add(self, file: str, stat: os.stat_result):
+        """
+        index a new or changed block, it is compiled on its first use
+        """
+        self._netlists.pop(file, None)
+        self._entries[file] = {
+            "file": file,
+            "name": ".".join(file.split(".")[:-1]),
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "compiled": False,
+            "error": None,
+            "inputs": -1,
+            "outputs": -1,
+            "digest": "",
+            "dependencies": [],
+        }
+
+    def _forget(self, file: str):
+        """
+        remove a deleted block and its cache
+        """
+        cache = self.cache_file(file)
+        if cache != self.path(file) and os.path.exists(cache):
+            os.remove(cache)
+
+        self._entries.pop(file, None)
+        self._netlists.pop(file, None)
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE), "r") as infile:
+                data = json.load(infile)
+
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") != INDEX_VERSION:
+            return
+
+        self._entries = data["blocks"]
+
+        # entries without their cache are compiled again
+        for file, entry in self._entries.items():
+            if entry["compiled"] and not os.path.exists(self.cache_file(file)):
+                entry["compiled"] = False
+
+    def _save_index(self):
+        if not os.path.isdir(self.directory):
+            return
+
+        with open(os.path.join(self.directory, INDEX_FILE), "w") as outfile:
+            json.dump({"version": INDEX_VERSION, "blocks": self._entries}, outfile, indent=4)
@@ -8,22 +8,28 @@ Author:
 Nilusink
 """
 import typing as tp
-import pickle
 import json
 
 # local imports
-from .drawables.interactions import InputsBox, IOBox, LinePoint, OutputsBox
-from .drawables.logic import And, Not, Base, CustomBlock
+from .drawables.interactions import InputsBox, LinePoint, OutputsBox
+from .drawables.logic import Base, CustomBlock, Gate
+from .simulation.netlist import Netlist, compile_data, compile_file, export_data
+from .simulation.binary import GATES, WIRES, NetlistReader, is_binary, save_netlist
+from .simulation.registry import GateTypes
+from .simulation import netlist as netlist_types
 from .basegame.groups import Gates, Wires
 from ..additional.classes import Vec2
 from .drawables.lines import Line
-from .drawables.logic import Base
+
+
+# files with this ending are saved in the binary format
+BINARY_EXTENSION: str = ".lsim"
 
 
 class GateType(tp.TypedDict):
     position: tuple[int | float, int | float]
     args: tuple
-    type: str
+    type: int | str  # the type id, older saves have the type name
     id: int
 
 
@@ -54,8 +60,12 @@ def serialize_args(arguments: tuple) -> tuple:
 
         elif issubclass(type(arg), tp.Callable):
             arg: tp.Callable
-            encoded_func = str(pickle.dumps(arg))
-            out.append(encoded_func)
+            gate_type = GateTypes.of(arg)
+
+            if gate_type is None:
+                raise RuntimeError(f"can't save {arg}, only logic functions of registered gate types")
+
+            out.append(gate_type.id)
 
         else:
             out.append(arg)
@@ -63,9 +73,9 @@ def serialize_args(arguments: tuple) -> tuple:
     return tuple(out)
 
 
-def serialize_all(file: str):
+def serialize_board() -> SerializedOutput:
     """
-    save a thing
+    the current board in the save format
     """
     inputs: list[int | float] = [input_p.cb.position.y for input_p in InputsBox.instance.inputs]
     outputs: list[int | float] = [input_p.cb.position.y for input_p in OutputsBox.instance.inputs]
@@ -80,16 +90,31 @@ def serialize_all(file: str):
     gates: list[Base] = Gates.sprites()
     wires: list[Line] = Wires.sprites()
 
-    for gate in gates:
-        g_type = gate.__class__
+    # ids for the inner gates of blocks that are not on the board
+    next_id = max((gate.id for gate in gates), default=-1) + 1
 
+    for gate in gates:
         out["gates"].append({
                 "position": gate.position.xy,
                 "args": serialize_args(gate.initial_args),
-                "type": g_type.__name__,
+                "type": gate.type_id,
                 "id": gate.id,
             })
 
+        if isinstance(gate, CustomBlock) and gate.definition is not None:
+            definition = gate.definition
+            inner_gates, inner_wires = export_data(
+                definition,
+                first_id=next_id,
+                inputs=[f"{gate.id}co{i}" for i in range(definition.n_inputs)],
+                outputs=[f"{gate.id}ci{i}" for i in range(definition.n_outputs)],
+                position=(1000, -10_000),
+            )
+            next_id += definition.n_gates
+
+            out["gates"].extend(inner_gates)
+            out["wires"].extend(inner_wires)
+
     # save all wires and points
     for wire in wires:
         pid: str = wire.parent.id
@@ -101,168 +126,206 @@ def serialize_all(file: str):
             "points": [point.xy for point in wire.set_points],
         })
 
+    return out
+
+
+def serialize_all(file: str):
+    """
+    save a thing, files ending with BINARY_EXTENSION are saved in the compact binary format
+    """
+    if file.endswith(BINARY_EXTENSION):
+        save_netlist(compile_board(), file)
+        return
+
     with open(file, "w") as outfile:
-        json.dump(out, outfile, indent=4)
+        json.dump(serialize_board(), outfile, indent=4)
+
+
+def compile_board() -> Netlist:
+    """
+    the current board (all sprites in "Gates" and "Wires") as a netlist,
+    e.g. for `levelize`
+    """
+    return compile_data(serialize_board())
 
 
 def load_from_file(file: str, load_as_block: bool = False):
     """
     load a saved thing
     """
+    for _ in load_in_steps(file, load_as_block):
+        pass
 
-    data: SerializedOutput = json.load(open(file, "r"))
 
-    new_block: CustomBlock = ...
-    if load_as_block:
-        new_block = CustomBlock(
-            (0, 0),
-            ".".join(file.split("/")[-1].split("\\")[-1].split(".")[:-1]),
-            None,
-            len(data["input"]),
-            len(data["output"]),
-        )
-        new_block.start_follow()
+def spawn_block(netlist: Netlist, name: str) -> CustomBlock:
+    """
+    create a block of a compiled board, following the mouse
+    """
+    # the inner gates are only simulated, never drawn
+    new_block = CustomBlock(
+        (0, 0),
+        name,
+        None,
+        netlist.n_inputs,
+        netlist.n_outputs,
+        definition=netlist,
+    )
+    new_block.start_follow()
 
-    else:
-        # clear current screen
-        for gate in Gates.sprites():
-            gate.delete()
+    return new_block
 
-        for wire in Wires.sprites():
-            wire.delete()
 
-        # create input and output ports
-        for i_y in data["input"]:
-            InputsBox.instance.add_input(i_y)
+def _open_chunks(file: str) -> tuple[Netlist, tp.Iterator[tuple[bytes, range]]]:
+    """
+    open a saved file to be read chunk by chunk, JSON files are a single chunk of gates and wires
 
-        for o_y in data["output"]:
-            OutputsBox.instance.add_input(o_y)
+    :returns: the (growing) netlist and an iterator over the kind and indices of the new gates or wires
+    """
+    if not is_binary(file):
+        netlist = compile_file(file)
+        return netlist, iter(((GATES, range(netlist.n_gates)), (WIRES, range(netlist.n_wires))))
 
-    # for correctly wiring the wires
-    gate_alias: dict[int, Base | CustomBlock] = {}
+    infile = open(file, "rb")
+    try:
+        reader = NetlistReader(infile)
 
-    # create gates
-    for gate in data["gates"]:
-        match gate["type"]:
-            case "And":
-                new_gate = And(*gate["args"])
+    except Exception:
+        infile.close()
+        raise
 
-            case "Not":
-                new_gate = Not(*gate["args"])
+    def chunks() -> tp.Iterator[tuple[bytes, range]]:
+        with infile:
+            yield from reader.chunks()
 
-            case "CustomBlock":
-                new_gate = CustomBlock(*gate["args"])
+    return reader.netlist, chunks()
 
-            case _:
-                continue
 
-        new_gate.position = (1000, -10_000) if load_as_block else gate["position"]
-        gate_alias[gate["id"]] = new_gate
+def load_in_steps(file: str, load_as_block: bool = False) -> tp.Iterator[None]:
+    """
+    load a saved thing, pausing after every chunk of a binary file
 
-    # connect wires
-    for wire in data["wires"]:
-        pid = wire["parent"]
-        tid = wire["target"]
+    the board can be drawn and simulated between the steps, while the rest is still loading
+    """
+    if load_as_block:
+        spawn_block(compile_file(file), ".".join(file.split("/")[-1].split("\\")[-1].split(".")[:-1]))
+        return
 
-        parent_is_custom = False
-        target_is_custom = False
+    netlist, chunks = _open_chunks(file)
 
-        if "c" in pid:
-            mi = pid.index("c")
-            pid = pid[:mi] + pid[mi + 1:]
-            parent_is_custom = True
+    # clear current screen
+    for gate in Gates.sprites():
+        gate.delete()
 
-        if "c" in tid:
-            mi = tid.index("c")
-            tid = tid[:mi] + tid[mi + 1:]
-            target_is_custom = True
+    for wire in Wires.sprites():
+        wire.delete()
 
-        # check if the point is valid
-        if "i" in pid:
-            raise RuntimeError("parent node can only be of type output")
+    # create input and output ports
+    for i_y in netlist.layout.inputs:
+        InputsBox.instance.add_input(i_y)
 
-        if "o" in tid:
-            raise RuntimeError("target node can only be of type input")
+    for o_y in netlist.layout.outputs:
+        OutputsBox.instance.add_input(o_y)
 
-        # split the ids into useful data
-        parent, pid = pid.split("o")
-        target, tid = tid.split("i")
+    # gates, indexed like the netlist
+    gates: list[Base | CustomBlock | None] = []
 
-        # convert to integer values
-        parent, pid = int(parent), int(pid)
-        target, tid = int(target), int(tid)
+    # the gates directly inside of each block, a chunk always holds a block together with its inner gates
+    children: dict[int, list[int]] = {}
 
-        parent_node: LinePoint
-        target_node: LinePoint
+    for kind, new in chunks:
+        if kind == GATES:
+            for gate in new:
+                children.setdefault(netlist.parents[gate], []).append(gate)
 
-        parent: int
-        target: int
+            gates.extend(_create_gate(netlist, gate, children) for gate in new)
 
-        if not parent_is_custom:
-            # get the parent node
-            if parent >= 0:
-                parent: Base = gate_alias[parent]
-                parent_node = parent.output_points[pid]
+        else:
+            lines = [_create_wire(netlist, gates, wire) for wire in new]
 
-            elif parent == -1:
-                if load_as_block:
-                    parent_node = new_block.input_output_points[pid]
+            # all curves of the new wires are calculated together
+            Line.prepare(line for line in lines if line is not None)
 
-                else:
-                    parent: IOBox = InputsBox.instance
-                    parent_node = parent.inputs[pid].lb
+        yield
 
-            elif parent == -2:
-                raise RuntimeError("parent cannot be output node")
 
-            else:
-                raise RuntimeError("invalid parent node id")
+def _create_gate(netlist: Netlist, gate: int, children: dict[int, list[int]]) -> Base | CustomBlock | None:
+    """
+    create a gate of the netlist. Only the board itself is drawn, blocks get their inner gates as definition
+    """
+    if netlist.parents[gate] != -1:
+        return None
 
-        # if custom gate, choose correct ports
-        else:
-            parent: CustomBlock = gate_alias[parent]
-            parent_node = parent.input_output_points[pid]
+    position = Vec2.from_cartesian(*netlist.layout.positions[gate])
 
-        if not target_is_custom:
-            # get the target node
-            if target >= 0:
-                target: Base = gate_alias[target]
-                target_node = target.input_points[tid]
+    if netlist.types[gate] == netlist_types.BLOCK:
+        split = netlist.splits[gate]
+        n_outputs = netlist.out_offsets[gate + 1] - netlist.out_offsets[gate] - split
 
-            elif target == -1:
-                raise RuntimeError("target cannot be input node")
+        return CustomBlock(
+            position,
+            netlist.names[gate],
+            None,
+            split,
+            n_outputs,
+            definition=netlist.extract(gate, children),
+        )
 
-            elif target == -2:
-                if load_as_block:
-                    target_node = new_block.output_input_points[tid]
+    gate_type = GateTypes.get(netlist.types[gate])
 
-                else:
-                    target: IOBox = OutputsBox.instance
-                    target_node = target.inputs[tid].lb
+    if gate_type is None:
+        raise RuntimeError(f"unknown gate type {netlist.types[gate]}")
 
-            else:
-                raise RuntimeError("invalid target node id")
+    return Gate(position, gate_type)
 
-        else:
-            target: CustomBlock = gate_alias[target]
-            target_node = target.output_input_points[tid]
 
-        # create new line
-        new_line = Line(
-            start_pos=parent_node.position,
-            parent=parent_node,
-        )
+def _create_wire(netlist: Netlist, gates: list[Base | CustomBlock | None], wire: int) -> Line | None:
+    """
+    create and connect a wire of the netlist, wires inside of blocks are skipped
+    """
+    parent, pid = netlist.wire_from_gate[wire], netlist.wire_from_port[wire]
+    target, tid = netlist.wire_to_gate[wire], netlist.wire_to_port[wire]
+
+    parent_node: LinePoint
+    target_node: LinePoint
+
+    # skip wires inside of blocks
+    if parent >= 0 and (netlist.parents[parent] != -1 or pid < netlist.splits[parent]):
+        return None
+
+    if target >= 0 and (netlist.parents[target] != -1 or tid >= netlist.splits[target] > 0):
+        return None
+
+    # get the parent node
+    if parent == -1:
+        parent_node = InputsBox.instance.inputs[pid].lb
+
+    else:
+        parent_node = gates[parent].output_points[pid - netlist.splits[parent]]
+
+    # get the target node
+    if target == -1:
+        target_node = OutputsBox.instance.inputs[tid].lb
+
+    else:
+        target_node = gates[target].input_points[tid]
+
+    # create new line
+    new_line = Line(
+        start_pos=parent_node.position,
+        parent=parent_node,
+    )
+
+    # add all points to line
+    for point in netlist.layout.wire_points[wire][1:-1]:
+        new_line.add(Vec2.from_cartesian(*point))
 
-        # add all points to line
-        if not load_as_block:
-            for point in wire["points"][1:-1]:
-                new_line.add(Vec2.from_cartesian(*point))
+    # add target node
+    new_line.add(target_node.position)
+    new_line.finish()
+    new_line.set_target(target_node)
 
-        # add target node
-        new_line.add(target_node.position)
-        new_line.finish()
-        new_line.set_target(target_node)
+    # notify parents about the newly created child that belongs to them
+    parent_node.add_connection(new_line)
+    target_node.add_connection(new_line)
 
-        # notify parents about the newly created child that belongs to them
-        parent_node.add_connection(new_line)
-        target_node.add_connection(new_line)
+    return new_line
@@ -0,0 +1,10 @@
+"""
+__init__.py
+18. October 2026
+
+Logic simulation, independent of pygame
+
+Author:
+Nilusink
+"""
+from .kernel import Simulator, Simulation
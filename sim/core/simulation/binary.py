@@ -0,0 +1,325 @@
+"""
+binary.py
+18. October 2026
+
+compact binary save format, readable chunk by chunk
+
+Author:
+Nilusink
+"""
+from array import array
+import typing as tp
+import struct
+import sys
+
+from .netlist import Netlist, Layout, LOW
+
+
+# file layout (little endian):
+#
+#   header      MAGIC, version, flags, n_inputs, n_outputs, n_gates, n_nets, n_wires
+#   io          input positions (d), output positions (d), output nets (i)
+#   names       count (I), then length (H) and utf-8 bytes of every gate name
+#   chunks      b"G" or b"W", count (I), typed arrays, until b"E"
+#
+# gates are stored so that every block is directly followed by its inner gates and
+# a gate chunk never splits a block from them, each chunk can be drawn on its own.
+# The nets of a gate come right after the nets of the gate before it, only inputs are stored.
+MAGIC: bytes = b"LSIM"
+VERSION: int = 1
+
+# the netlist has a layout (positions and wire points)
+HAS_LAYOUT: int = 1
+
+# gates / wires per chunk
+CHUNK_SIZE: int = 4096
+
+_HEADER = struct.Struct("<4sHHIIIII")
+_COUNT = struct.Struct("<I")
+_LENGTH = struct.Struct("<H")
+
+GATES: bytes = b"G"
+WIRES: bytes = b"W"
+END: bytes = b"E"
+
+
+def _write_array(outfile: tp.BinaryIO, data: array):
+    if sys.byteorder == "big":
+        data = array(data.typecode, data)
+        data.byteswap()
+
+    outfile.write(data.tobytes())
+
+
+def _read_array(infile: tp.BinaryIO, typecode: str, count: int) -> array:
+    data = array(typecode)
+    raw = infile.read(count * data.itemsize)
+
+    if len(raw) != count * data.itemsize:
+        raise RuntimeError("binary file is truncated")
+
+    data.frombytes(raw)
+    if sys.byteorder == "big":
+        data.byteswap()
+
+    return data
+
+
+def _preorder(netlist: Netlist) -> list[int]:
+    """
+    the gates of the board, each directly followed by its inner gates
+    """
+    children: list[list[int]] = [[] for _ in range(netlist.n_gates)]
+    top: list[int] = []
+
+    for gate in range(netlist.n_gates):
+        parent = netlist.parents[gate]
+        (top if parent == -1 else children[parent]).append(gate)
+
+    order: list[int] = []
+    work = top[::-1]
+    while work:
+        gate = work.pop()
+        order.append(gate)
+        work.extend(reversed(children[gate]))
+
+    return order
+
+
+def write_netlist(netlist: Netlist, outfile: tp.BinaryIO):
+    """
+    write a netlist (and its layout) in the binary format
+    """
+    order = _preorder(netlist)
+    index = {gate: i for i, gate in enumerate(order)}
+
+    # old net -> new net, the inputs come first, then the outputs of every gate in order
+    nets: dict[int, int] = {LOW: LOW}
+    for i, net in enumerate(netlist.inputs):
+        nets[net] = i
+
+    n_nets = netlist.n_inputs
+    for gate in order:
+        for net in netlist.gate_outputs(gate):
+            nets[net] = n_nets
+            n_nets += 1
+
+    layout = netlist.layout
+    names = list(dict.fromkeys(netlist.names))
+    name_index = {name: i for i, name in enumerate(names)}
+
+    outfile.write(_HEADER.pack(
+        MAGIC,
+        VERSION,
+        HAS_LAYOUT if layout is not None else 0,
+        netlist.n_inputs,
+        netlist.n_outputs,
+        netlist.n_gates,
+        n_nets,
+        netlist.n_wires,
+    ))
+
+    _write_array(outfile, array("d", layout.inputs if layout is not None else [0] * netlist.n_inputs))
+    _write_array(outfile, array("d", layout.outputs if layout is not None else [0] * netlist.n_outputs))
+    _write_array(outfile, array("i", (nets.get(net, LOW) for net in netlist.outputs)))
+
+    outfile.write(_COUNT.pack(len(names)))
+    for name in names:
+        encoded = name.encode("utf-8")
+        outfile.write(_LENGTH.pack(len(encoded)))
+        outfile.write(encoded)
+
+    # gate chunks, a block and its inner gates always stay together
+    start = 0
+    while start < len(order):
+        end = min(start + CHUNK_SIZE, len(order))
+        while end < len(order) and netlist.parents[order[end]] != -1:
+            end += 1
+
+        chunk = order[start:end]
+        start = end
+
+        outfile.write(GATES + _COUNT.pack(len(chunk)))
+        _write_array(outfile, array("b", (netlist.types[gate] for gate in chunk)))
+        _write_array(outfile, array("i", (netlist.ids[gate] for gate in chunk)))
+        _write_array(outfile, array("i", (netlist.splits[gate] for gate in chunk)))
+        _write_array(outfile, array("i", (
+            index[netlist.parents[gate]] if netlist.parents[gate] != -1 else -1 for gate in chunk
+        )))
+        _write_array(outfile, array("i", (len(netlist.gate_inputs(gate)) for gate in chunk)))
+        _write_array(outfile, array("i", (len(netlist.gate_outputs(gate)) for gate in chunk)))
+        _write_array(outfile, array("i", (name_index[netlist.names[gate]] for gate in chunk)))
+        _write_array(outfile, array("d", (
+            value for gate in chunk for value in (layout.positions[gate] if layout is not None else (0, 0))
+        )))
+        _write_array(outfile, array("i", (
+            nets.get(net, LOW) for gate in chunk for net in netlist.gate_inputs(gate)
+        )))
+
+    # wire chunks
+    for start in range(0, netlist.n_wires, CHUNK_SIZE):
+        chunk = range(start, min(start + CHUNK_SIZE, netlist.n_wires))
+        points = [layout.wire_points[wire] if layout is not None else [] for wire in chunk]
+
+        outfile.write(WIRES + _COUNT.pack(len(chunk)))
+        _write_array(outfile, array("i", (
+            index[netlist.wire_from_gate[wire]] if netlist.wire_from_gate[wire] != -1 else -1 for wire in chunk
+        )))
+        _write_array(outfile, array("i", (netlist.wire_from_port[wire] for wire in chunk)))
+        _write_array(outfile, array("i", (
+            index[netlist.wire_to_gate[wire]] if netlist.wire_to_gate[wire] != -1 else -1 for wire in chunk
+        )))
+        _write_array(outfile, array("i", (netlist.wire_to_port[wire] for wire in chunk)))
+        _write_array(outfile, array("i", (len(wire_points) for wire_points in points)))
+        _write_array(outfile, array("d", (
+            value for wire_points in points for point in wire_points for value in point
+        )))
+
+    outfile.write(END)
+
+
+def save_netlist(netlist: Netlist, file: str):
+    """
+    save a netlist to a binary file
+    """
+    with open(file, "wb") as outfile:
+        write_netlist(netlist, outfile)
+
+
+class NetlistReader:
+    """
+    reads a binary file chunk by chunk, `netlist` grows with every chunk
+
+    the inputs, outputs and names are known right away, gates and wires are
+    added by `chunks`. Nets of gates that are not read yet may already be used.
+    """
+    netlist: Netlist
+    n_gates: int
+    n_nets: int
+    n_wires: int
+    _infile: tp.BinaryIO
+    _names: list[str]
+
+    def __init__(self, infile: tp.BinaryIO):
+        self._infile = infile
+
+        magic, version, flags, n_inputs, n_outputs, self.n_gates, self.n_nets, self.n_wires = _HEADER.unpack(
+            self._read(_HEADER.size)
+        )
+
+        if magic != MAGIC:
+            raise RuntimeError("not a binary LogicSim file")
+
+        if version > VERSION:
+            raise RuntimeError(f"unsupported file version {version}, expected up to {VERSION}")
+
+        self.netlist = Netlist()
+        self.netlist.inputs = array("i", range(n_inputs))
+        self.netlist.n_nets = n_inputs
+
+        layout = Layout()
+        layout.inputs = _read_array(infile, "d", n_inputs).tolist()
+        layout.outputs = _read_array(infile, "d", n_outputs).tolist()
+        self.netlist.outputs = _read_array(infile, "i", n_outputs)
+
+        if flags & HAS_LAYOUT:
+            self.netlist.layout = layout
+
+        n_names, = _COUNT.unpack(self._read(_COUNT.size))
+        self._names = []
+        for _ in range(n_names):
+            length, = _LENGTH.unpack(self._read(_LENGTH.size))
+            self._names.append(self._read(length).decode("utf-8"))
+
+    def _read(self, size: int) -> bytes:
+        data = self._infile.read(size)
+
+        if len(data) != size:
+            raise RuntimeError("binary file is truncated")
+
+        return data
+
+    def chunks(self) -> tp.Iterator[tuple[bytes, range]]:
+        """
+        read the file chunk by chunk
+
+        :returns: the kind of chunk (GATES or WIRES) and the indices of the new gates or wires
+        """
+        net = self.netlist
+
+        while (kind := self._read(1)) != END:
+            count, = _COUNT.unpack(self._read(_COUNT.size))
+
+            if kind == GATES:
+                first = net.n_gates
+
+                types = _read_array(self._infile, "b", count)
+                ids = _read_array(self._infile, "i", count)
+                splits = _read_array(self._infile, "i", count)
+                parents = _read_array(self._infile, "i", count)
+                n_ins = _read_array(self._infile, "i", count)
+                n_outs = _read_array(self._infile, "i", count)
+                names = _read_array(self._infile, "i", count)
+                positions = _read_array(self._infile, "d", 2 * count)
+                in_nets = _read_array(self._infile, "i", sum(n_ins))
+
+                net.types.extend(types)
+                net.ids.extend(ids)
+                net.splits.extend(splits)
+                net.parents.extend(parents)
+                net.names.extend(self._names[name] for name in names)
+                net.in_nets.extend(in_nets)
+
+                for n_in, n_out in zip(n_ins, n_outs):
+                    net.in_offsets.append(net.in_offsets[-1] + n_in)
+                    net.out_nets.extend(range(net.n_nets, net.n_nets + n_out))
+                    net.out_offsets.append(len(net.out_nets))
+                    net.n_nets += n_out
+
+                if net.layout is not None:
+                    net.layout.positions.extend(zip(positions[::2], positions[1::2]))
+
+                yield GATES, range(first, net.n_gates)
+
+            elif kind == WIRES:
+                first = net.n_wires
+
+                net.wire_from_gate.extend(_read_array(self._infile, "i", count))
+                net.wire_from_port.extend(_read_array(self._infile, "i", count))
+                net.wire_to_gate.extend(_read_array(self._infile, "i", count))
+                net.wire_to_port.extend(_read_array(self._infile, "i", count))
+
+                n_points = _read_array(self._infile, "i", count)
+                points = _read_array(self._infile, "d", 2 * sum(n_points)).tolist()
+
+                if net.layout is not None:
+                    start = 0
+                    for n in n_points:
+                        wire_points = points[start:start + 2 * n]
+                        net.layout.wire_points.append(list(zip(wire_points[::2], wire_points[1::2])))
+                        start += 2 * n
+
+                yield WIRES, range(first, net.n_wires)
+
+            else:
+                raise RuntimeError(f"unknown chunk {kind!r} in binary file")
+
+
+def read_netlist(infile: tp.BinaryIO) -> Netlist:
+    """
+    read a whole binary file
+    """
+    reader = NetlistReader(infile)
+
+    for _ in reader.chunks():
+        pass
+
+    return reader.netlist
+
+
+def is_binary(file: str) -> bool:
+    """
+    check if a file is in the binary format
+    """
+    with open(file, "rb") as infile:
+        return infile.read(len(MAGIC)) == MAGIC
@@ -0,0 +1,187 @@
+"""
+bitparallel.py
+18. October 2026
+
+evaluate a netlist for many input vectors at once
+
+Author:
+Nilusink
+"""
+import typing as tp
+
+from .instances import OscillationError
+from .levelize import Levels, levelize
+from .netlist import Netlist, AND, NOT, LOW
+
+
+def exhaustive_inputs(n_inputs: int, start: int = 0, count: int = ...) -> list[int]:
+    """
+    input words for counting through the input space
+
+    bit k of word i is bit i of the number start + k, so vector k sets the inputs to start + k
+    (input 0 is the least significant bit).
+
+    :param n_inputs: number of inputs
+    :param start: the first vector
+    :param count: number of vectors, all 2 ** n_inputs by default
+    """
+    if count is ...:
+        count = (1 << n_inputs) - start
+
+    if count <= 0:
+        return [0] * n_inputs
+
+    words: list[int] = []
+    for i in range(n_inputs):
+        period = 1 << (i + 1)
+
+        # aligned chunks can use the repeating pattern 0..01..1 directly
+        if start % period == 0 and count % period == 0:
+            half = period >> 1
+            block = ((1 << half) - 1) << half
+            words.append(block * (((1 << count) - 1) // ((1 << period) - 1)))
+
+        elif count <= period >> 1 and start % count == 0 and (count & (count - 1)) == 0:
+            words.append((1 << count) - 1 if (start >> i) & 1 else 0)
+
+        else:
+            words.append(sum(1 << k for k in range(count) if ((start + k) >> i) & 1))
+
+    return words
+
+
+def pack(vectors: tp.Iterable[tp.Sequence[bool]], n_inputs: int) -> tuple[list[int], int]:
+    """
+    pack input vectors into one word per input
+
+    :returns: the words and the number of vectors
+    """
+    words = [0] * n_inputs
+
+    count = 0
+    for count, vector in enumerate(vectors, start=1):
+        bit = 1 << (count - 1)
+        for i in range(n_inputs):
+            if vector[i]:
+                words[i] |= bit
+
+    return words, count
+
+
+def unpack(words: list[int], count: int) -> list[list[bool]]:
+    """
+    split one word per output back into single vectors
+    """
+    return [[bool((word >> k) & 1) for word in words] for k in range(count)]
+
+
+class BitParallel:
+    """
+    evaluates a netlist bit-parallel
+
+    every net holds an integer, bit k of it is the nets value for input vector k.
+    An "And" is a single & and a "Not" a single ^ over all vectors, python integers can be
+    arbitrarily wide, so one pass of the gates evaluates any number of vectors.
+    Gates run in levelized order, so acyclic boards need exactly one sweep,
+    only feedback loops are repeated until they are stable.
+    """
+    _steps: list[tuple[bool, list[tuple[int, int, int, int]]]]
+    _inputs: list[int]
+    _outputs: list[int]
+    _n_nets: int
+
+    def __init__(self, netlist: Netlist, levels: Levels = ...):
+        if levels is ...:
+            levels = levelize(netlist)
+
+        source = netlist.resolve_blocks()
+
+        def instruction(gate: int) -> tuple[int, int, int, int]:
+            nets = [source[net] if net >= 0 else LOW for net in netlist.gate_inputs(gate)]
+            if netlist.types[gate] == AND:
+                return AND, nets[0], nets[1], netlist.gate_outputs(gate)[0]
+
+            if netlist.types[gate] == NOT:
+                return NOT, nets[0], LOW, netlist.gate_outputs(gate)[0]
+
+            raise RuntimeError(
+                f"only \"And\" and \"Not\" gates can be evaluated bit-parallel, not \"{netlist.names[gate]}\""
+            )
+
+        # consecutive acyclic gates are merged into one straight program
+        in_cycles = {gate for cycle in levels.cycles for gate in cycle}
+
+        self._steps = []
+        for component in levels.components:
+            cyclic = component[0] in in_cycles
+            program = [instruction(gate) for gate in component]
+
+            if not cyclic and self._steps and not self._steps[-1][0]:
+                self._steps[-1][1].extend(program)
+
+            else:
+                self._steps.append((cyclic, program))
+
+        self._inputs = list(netlist.inputs)
+        self._outputs = [source[net] if net >= 0 else LOW for net in netlist.outputs]
+        self._n_nets = netlist.n_nets
+
+    @property
+    def n_inputs(self) -> int:
+        return len(self._inputs)
+
+    @property
+    def n_outputs(self) -> int:
+        return len(self._outputs)
+
+    def evaluate(self, inputs: list[int], count: int) -> list[int]:
+        """
+        evaluate the netlist
+
+        :param inputs: one word per input
+        :param count: number of vectors (bits) in the words
+        :returns: one word per output
+        """
+        mask = (1 << count) - 1
+
+        # the last slot stays 0, so LOW (-1) reads as constant low
+        values = [0] * (self._n_nets + 1)
+        for net, word in zip(self._inputs, inputs):
+            values[net] = word & mask
+
+        for cyclic, program in self._steps:
+            if not cyclic:
+                for kind, a, b, out in program:
+                    values[out] = values[a] & values[b] if kind == AND else values[a] ^ mask
+
+                continue
+
+            # feedback loops are repeated until they are stable
+            for _ in range(len(program) + 1):
+                changed = False
+
+                for kind, a, b, out in program:
+                    value = values[a] & values[b] if kind == AND else values[a] ^ mask
+
+                    if values[out] != value:
+                        values[out] = value
+                        changed = True
+
+                if not changed:
+                    break
+
+            else:
+                raise OscillationError(sorted({out for _, _, _, out in program}))
+
+        return [values[net] for net in self._outputs]
+
+    def truth_table(self, start: int = 0, count: int = ...) -> list[int]:
+        """
+        evaluate every input combination (or a chunk of them)
+
+        :returns: one word per output, bit k is the output for the inputs start + k
+        """
+        if count is ...:
+            count = (1 << self.n_inputs) - start
+
+        return self.evaluate(exhaustive_inputs(self.n_inputs, start, count), count)
@@ -0,0 +1,317 @@
+"""
+exhaustive.py
+18. October 2026
+
+evaluate every input combination of a netlist, on all cores
+
+Author:
+Nilusink
+"""
+from contextlib import contextmanager
+from tempfile import TemporaryDirectory
+from multiprocessing import Pool
+import typing as tp
+import signal
+import mmap
+import os
+
+from .binary import read_netlist, save_netlist
+from .bitparallel import BitParallel
+from .levelize import Levels, levelize
+from .netlist import Netlist
+
+
+# vectors per task (as a power of two)
+CHUNK_BITS: int = 16
+
+# netlists with fewer inputs are evaluated in this process
+MIN_PARALLEL_INPUTS: int = 18
+
+# compiled netlists and the memory mapped output table of a worker process
+_programs: list[BitParallel] = []
+_table: mmap.mmap | None = None
+_row_bytes: int = 0
+
+
+def _init_worker(netlist_files: list[str], table_file: str | None, row_bytes: int):
+    """
+    load the netlists from the binary files written by the parent, once per worker
+    """
+    global _programs, _table, _row_bytes
+
+    # handlers inherited from the parent (SDL catches SIGTERM once pygame is initialized)
+    # would keep the pool from stopping its workers, SIGTERM is blocked until they are replaced
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGTERM})
+
+    _programs = []
+    for file in netlist_files:
+        with open(file, "rb") as infile:
+            _programs.append(BitParallel(read_netlist(infile)))
+
+    if table_file is not None:
+        with open(table_file, "r+b") as table:
+            _table = mmap.mmap(table.fileno(), 0)
+
+    _row_bytes = row_bytes
+
+
+def _evaluate(chunk: tuple[int, int]) -> list[list[int]]:
+    start, count = chunk
+    return [program.truth_table(start, count) for program in _programs]
+
+
+def _fill(chunk: tuple[int, int]) -> int:
+    start, count = chunk
+    _write(_table, _row_bytes, start, count, _programs[0].truth_table(start, count))
+
+    return count
+
+
+def _difference(chunk: tuple[int, int]) -> int | None:
+    start, count = chunk
+    return _first_difference(start, *(program.truth_table(start, count) for program in _programs))
+
+
+def _write(table: tp.Any, row_bytes: int, start: int, count: int, words: list[int]):
+    """
+    copy the output words of a chunk into a bit-packed table (one row per output)
+    """
+    size = (count + 7) // 8
+
+    for j, word in enumerate(words):
+        offset = j * row_bytes + start // 8
+        table[offset:offset + size] = word.to_bytes(size, "little")
+
+
+def _first_difference(start: int, words_a: list[int], words_b: list[int]) -> int | None:
+    difference = 0
+    for a, b in zip(words_a, words_b):
+        difference |= a ^ b
+
+    if not difference:
+        return None
+
+    # lowest set bit
+    return start + (difference & -difference).bit_length() - 1
+
+
+def combinational(netlists: list[Netlist]) -> list[Levels]:
+    """
+    check that netlists have a truth table, the outputs of a feedback loop depend on the inputs before
+
+    :returns: the evaluation order of every netlist
+    :raises RuntimeError: if a netlist has feedback loops
+    """
+    levels = [levelize(netlist) for netlist in netlists]
+
+    if not all(netlist_levels.acyclic for netlist_levels in levels):
+        raise RuntimeError(
+            "board has feedback loops, its outputs depend on earlier inputs and it has no truth table "
+            "(simulate it with \"clock\" or \"vectors\")"
+        )
+
+    return levels
+
+
+def chunks(n_inputs: int) -> list[tuple[int, int]]:
+    """
+    split the input space into tasks
+
+    :returns: the first vector and number of vectors of every task
+    """
+    total = 1 << n_inputs
+    size = 1 << min(CHUNK_BITS, n_inputs)
+
+    return [(start, min(size, total - start)) for start in range(0, total, size)]
+
+
+def _parallel(netlists: list[Netlist], processes: int) -> int:
+    """
+    the number of worker processes to use, 0 to stay in this process
+    """
+    if processes is ...:
+        processes = os.cpu_count() or 1
+
+    if processes <= 1 or netlists[0].n_inputs < MIN_PARALLEL_INPUTS:
+        return 0
+
+    return min(processes, len(chunks(netlists[0].n_inputs)))
+
+
+@contextmanager
+def _pool(netlists: list[Netlist], processes: int, table_bytes: int = 0) -> tp.Iterator[tuple[Pool, str]]:
+    """
+    start worker processes sharing the netlists (and an output table) through files
+
+    the netlists are written once in the binary format and every worker reads them once,
+    the output table is memory mapped by all workers, so tasks only pass chunk bounds around.
+
+    :returns: the pool and the path of the output table
+    """
+    with TemporaryDirectory() as directory:
+        files = []
+        for i, netlist in enumerate(netlists):
+            files.append(os.path.join(directory, f"{i}.lsim"))
+            save_netlist(netlist, files[-1])
+
+        table_file = None
+        if table_bytes:
+            table_file = os.path.join(directory, "table")
+            with open(table_file, "wb") as table:
+                table.truncate(table_bytes)
+
+        row_bytes = table_bytes // max(netlists[0].n_outputs, 1)
+
+        # a worker stopped before _init_worker ran would still have the handler of this process
+        blocked = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTERM})
+        try:
+            pool = Pool(processes, _init_worker, (files, table_file, row_bytes))
+
+        finally:
+            signal.pthread_sigmask(signal.SIG_SETMASK, blocked)
+
+        # leaving early (e.g. after a counterexample) stops the workers
+        with pool:
+            yield pool, table_file
+
+
+def evaluate_chunks(
+        netlists: list[Netlist],
+        processes: int = ...,
+) -> tp.Iterator[tuple[int, int, list[list[int]]]]:
+    """
+    evaluate netlists with the same inputs for every input combination, chunk by chunk
+
+    wide netlists are spread over worker processes.
+
+    :param netlists: the netlists to evaluate
+    :param processes: number of worker processes, one per core by default
+    :returns: the first vector and number of vectors of each chunk, one word per output of each netlist
+    :raises RuntimeError: if a netlist has feedback loops
+    """
+    levels = combinational(netlists)
+    tasks = chunks(netlists[0].n_inputs)
+    processes = _parallel(netlists, processes)
+
+    if not processes:
+        programs = [BitParallel(netlist, netlist_levels) for netlist, netlist_levels in zip(netlists, levels)]
+
+        for start, count in tasks:
+            yield start, count, [program.truth_table(start, count) for program in programs]
+
+        return
+
+    with _pool(netlists, processes) as (pool, _):
+        for (start, count), words in zip(tasks, pool.imap(_evaluate, tasks)):
+            yield start, count, words
+
+
+@contextmanager
+def packed_truth_table(netlist: Netlist, processes: int = ...) -> tp.Iterator[list[memoryview]]:
+    """
+    the outputs for every input combination, bit-packed
+
+    workers write their chunks straight into a shared memory mapped table, nothing but
+    the chunk bounds is sent between the processes. The rows are views of that table
+    (nothing is copied), they are only valid inside the with block.
+
+    :returns: one bitmap per output, bit k (little endian, bit 0 of byte 0 first) is the output for the inputs k
+    :raises RuntimeError: if the netlist has feedback loops
+    """
+    levels, = combinational([netlist])
+    n_inputs, n_outputs = netlist.n_inputs, netlist.n_outputs
+    row_bytes = ((1 << n_inputs) + 7) // 8
+    tasks = chunks(n_inputs)
+    processes = _parallel([netlist], processes)
+
+    if not n_outputs:
+        yield []
+        return
+
+    if not processes:
+        program = BitParallel(netlist, levels)
+        table = bytearray(row_bytes * n_outputs)
+
+        for start, count in tasks:
+            _write(table, row_bytes, start, count, program.truth_table(start, count))
+
+        yield _rows(memoryview(table), row_bytes, n_outputs)
+        return
+
+    with _pool([netlist], processes, row_bytes * n_outputs) as (pool, table_file):
+        # many small tasks keep all workers busy until the end
+        for _ in pool.imap_unordered(_fill, tasks, chunksize=max(1, len(tasks) // (processes * 16))):
+            pass
+
+        with open(table_file, "rb") as infile, mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as table:
+            view = memoryview(table)
+            rows = _rows(view, row_bytes, n_outputs)
+
+            try:
+                yield rows
+
+            finally:
+                # the map can only be closed without views on it
+                for row in rows:
+                    row.release()
+
+                view.release()
+
+
+def _rows(table: memoryview, row_bytes: int, n_outputs: int) -> list[memoryview]:
+    return [table[j * row_bytes:(j + 1) * row_bytes] for j in range(n_outputs)]
+
+
+def truth_table(netlist: Netlist, processes: int = ...) -> list[int]:
+    """
+    the outputs for every input combination
+
+    :returns: one word per output, bit k is the output for the inputs k (input 0 is the least significant bit)
+    """
+    with packed_truth_table(netlist, processes) as rows:
+        return [int.from_bytes(row, "little") for row in rows]
+
+
+def counterexample(first: Netlist, second: Netlist, processes: int = ...) -> int | None:
+    """
+    check two netlists for functional equivalence
+
+    :returns: the first inputs (packed, input 0 is the least significant bit) with different outputs,
+        None if they are equivalent
+    :raises RuntimeError: if the netlists have different ports or feedback loops
+    """
+    if first.n_inputs != second.n_inputs or first.n_outputs != second.n_outputs:
+        raise RuntimeError(
+            f"the netlists have different ports ({first.n_inputs}/{first.n_outputs} "
+            f"and {second.n_inputs}/{second.n_outputs})"
+        )
+
+    levels = combinational([first, second])
+    tasks = chunks(first.n_inputs)
+    processes = _parallel([first, second], processes)
+
+    if not processes:
+        programs = BitParallel(first, levels[0]), BitParallel(second, levels[1])
+
+        for start, count in tasks:
+            index = _first_difference(start, *(program.truth_table(start, count) for program in programs))
+
+            if index is not None:
+                return index
+
+        return None
+
+    with _pool([first, second], processes) as (pool, _):
+        for index in pool.imap(_difference, tasks):
+            if index is not None:
+                return index
+
+    return None
+
+
+def bits(value: int, width: int) -> str:
+    """
+    a packed vector as a bit string, bit 0 first
+    """
+    return format(value, f"0{width}b")[::-1] if width else ""
@@ -0,0 +1,91 @@
+"""
+headless.py
+18. October 2026
+
+simulate saved boards without pygame
+
+Author:
+Nilusink
+"""
+import typing as tp
+
+from .instances import OscillationError
+from .netlist import Netlist, compile_file
+from .optimize import optimize
+from .kernel import Simulator
+
+
+class Circuit:
+    """
+    a saved board, built directly into a simulator
+    """
+    simulator: Simulator
+    _inputs: list[int]
+    _outputs: list[int | None]
+
+    def __init__(self, simulator: Simulator, inputs: list[int], outputs: list[int | None]):
+        self.simulator = simulator
+        self._inputs = inputs
+        self._outputs = outputs
+
+    @property
+    def n_inputs(self) -> int:
+        return len(self._inputs)
+
+    @property
+    def n_outputs(self) -> int:
+        return len(self._outputs)
+
+    @property
+    def outputs(self) -> list[bool]:
+        """
+        the current values of the boards outputs
+        """
+        return [self.simulator.value(net) for net in self._outputs]
+
+    def set_inputs(self, values: tp.Iterable[bool]):
+        """
+        set the values of the boards inputs
+        """
+        for net, value in zip(self._inputs, values):
+            self.simulator.set(net, value)
+
+    def evaluate(self, values: tp.Iterable[bool]) -> list[bool]:
+        """
+        set the inputs, settle the circuit and return the outputs
+
+        :raises OscillationError: if the circuit is still changing after `Simulator.max_events` events
+        """
+        self.set_inputs(values)
+        self.simulator.settle()
+
+        if not self.simulator.stable:
+            raise OscillationError(self.simulator.pending_nets())
+
+        return self.outputs
+
+
+def build_circuit(netlist: Netlist) -> Circuit:
+    """
+    build a compiled netlist into its own simulator
+    """
+    sim = Simulator()
+
+    inputs, outputs, _ = sim.add_netlist(netlist)
+    sim.settle()
+
+    return Circuit(sim, inputs, outputs)
+
+
+def load_circuit(file: str, optimized: bool = False) -> Circuit:
+    """
+    load a file written by `serialize_all` without creating any sprites
+
+    :param optimized: flatten the board and remove redundant gates before building it
+    """
+    netlist = compile_file(file)
+
+    if optimized:
+        netlist = optimize(netlist)
+
+    return build_circuit(netlist)
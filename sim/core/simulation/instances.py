@@ -0,0 +1,217 @@
+"""
+instances.py
+18. October 2026
+
+blocks compiled once, every placed copy only keeps its own net values
+
+Author:
+Nilusink
+"""
+import typing as tp
+
+from .levelize import Levels, levelize
+from .netlist import Netlist, AND, NOT, LOW
+from .registry import GateTypes
+
+
+class OscillationError(RuntimeError):
+    """
+    a feedback loop did not reach a stable state
+    """
+    nets: list[int]
+
+    def __init__(self, nets: list[int]):
+        super().__init__(f"feedback loop did not settle, oscillating nets: {nets}")
+        self.nets = nets
+
+
+class Program:
+    """
+    a netlist compiled to a list of instructions, shared by all instances of a block
+
+    the state of an instance is a bytearray with one byte per net (see `new_state`).
+    Gates run in levelized order, so acyclic parts take a single sweep, feedback loops are
+    repeated until they are stable and keep their values in the state between runs.
+    A loop that is still changing after `max_sweeps` raises an `OscillationError`.
+    """
+    # sweeps over a feedback loop before giving up (it oscillates)
+    max_sweeps: int = 64
+
+    _steps: list[tuple[bool, list[tuple[int, tp.Any, tp.Any, tp.Any]]]]
+    _inputs: list[int]
+    _outputs: list[int]
+    _n_nets: int
+
+    def __init__(self, netlist: Netlist, levels: Levels = ...):
+        if levels is ...:
+            levels = levelize(netlist)
+
+        source = netlist.resolve_blocks()
+
+        def resolve(net: int) -> int:
+            return source[net] if net >= 0 else LOW
+
+        def instruction(gate: int) -> tuple[int, tp.Any, tp.Any, tp.Any]:
+            kind = netlist.types[gate]
+            nets = [resolve(net) for net in netlist.gate_inputs(gate)]
+
+            if kind == AND:
+                return AND, nets[0], nets[1], netlist.gate_outputs(gate)[0]
+
+            if kind == NOT:
+                return NOT, nets[0], LOW, netlist.gate_outputs(gate)[0]
+
+            # any other registered type: input nets, output nets, logic function
+            return kind, tuple(nets), tuple(netlist.gate_outputs(gate)), GateTypes[kind].func
+
+        in_cycles = {gate for cycle in levels.cycles for gate in cycle}
+
+        # consecutive acyclic gates are merged into one straight program
+        self._steps = []
+        for component in levels.components:
+            cyclic = component[0] in in_cycles
+            program = [instruction(gate) for gate in component]
+
+            if not cyclic and self._steps and not self._steps[-1][0]:
+                self._steps[-1][1].extend(program)
+
+            else:
+                self._steps.append((cyclic, program))
+
+        self._inputs = list(netlist.inputs)
+        self._outputs = [resolve(net) for net in netlist.outputs]
+        self._n_nets = netlist.n_nets
+
+    @property
+    def n_inputs(self) -> int:
+        return len(self._inputs)
+
+    @property
+    def n_outputs(self) -> int:
+        return len(self._outputs)
+
+    @property
+    def outputs(self) -> list[int]:
+        """
+        the nets of the outputs, index into a state
+        """
+        return self._outputs
+
+    def new_state(self) -> bytearray:
+        """
+        the net values of a new instance, all low. The last byte stays 0 for LOW (-1)
+        """
+        return bytearray(self._n_nets + 1)
+
+    def run(self, state: bytearray, inputs: tp.Iterable[bool]) -> tuple[bool, ...]:
+        """
+        set the inputs of an instance and settle it
+
+        :param state: the instances net values, updated in place
+        :param inputs: one value per input
+        :returns: the outputs
+        :raises OscillationError: if a feedback loop doesn't settle (the state keeps its last values)
+        """
+        for net, value in zip(self._inputs, inputs):
+            state[net] = 1 if value else 0
+
+        for cyclic, program in self._steps:
+            if not cyclic:
+                self._sweep(state, program)
+                continue
+
+            for _ in range(self.max_sweeps):
+                if not self._sweep(state, program):
+                    break
+
+            else:
+                # the nets still changing in one more sweep
+                nets = [net for kind, _, b, out in program for net in ((out,) if kind in (AND, NOT) else b)]
+                before = [state[net] for net in nets]
+
+                if self._sweep(state, program):
+                    raise OscillationError(sorted({
+                        net for net, value in zip(nets, before) if state[net] != value
+                    }))
+
+        return tuple(bool(state[net]) for net in self._outputs)
+
+    @staticmethod
+    def _sweep(state: bytearray, program: list[tuple[int, tp.Any, tp.Any, tp.Any]]) -> bool:
+        """
+        evaluate every instruction once
+
+        :returns: True if a net changed
+        """
+        changed = False
+
+        for kind, a, b, out in program:
+            if kind == AND:
+                value = state[a] & state[b]
+
+            elif kind == NOT:
+                value = state[a] ^ 1
+
+            else:
+                result = out(*(bool(state[net]) for net in a))
+                if not isinstance(result, tuple):
+                    result = (result,)
+
+                for net, value in zip(b, result):
+                    value = 1 if value else 0
+
+                    if state[net] != value:
+                        state[net] = value
+                        changed = True
+
+                continue
+
+            if state[out] != value:
+                state[out] = value
+                changed = True
+
+        return changed
+
+
+class Instance:
+    """
+    a placed copy of a compiled block, called by the simulation like a logic function
+
+    an oscillating block keeps its last values (like the event limit of the kernel),
+    `oscillating` holds the looping nets until it settles again.
+    """
+    program: Program
+    state: bytearray
+    oscillating: list[int] | None
+
+    def __init__(self, program: Program):
+        self.program = program
+        self.state = program.new_state()
+        self.oscillating = None
+
+    def __call__(self, *inputs: bool) -> tuple[bool, ...]:
+        try:
+            outputs = self.program.run(self.state, inputs)
+
+        except OscillationError as error:
+            self.oscillating = error.nets
+            return tuple(bool(self.state[net]) for net in self.program.outputs)
+
+        self.oscillating = None
+        return outputs
+
+
+# netlist digest -> compiled program
+_programs: dict[str, Program] = {}
+
+
+def program_for(netlist: Netlist) -> Program:
+    """
+    the compiled version of a netlist, compiled once per distinct netlist
+    """
+    key = netlist.digest()
+
+    if key not in _programs:
+        _programs[key] = Program(netlist)
+
+    return _programs[key]
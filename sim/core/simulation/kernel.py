@@ -0,0 +1,290 @@
+"""
+kernel.py
+18. October 2026
+
+event driven logic simulation, independent of any rendering
+
+Author:
+Nilusink
+"""
+from collections import deque
+import typing as tp
+
+from .netlist import Netlist
+from .registry import GateTypes
+
+
+class Simulator:
+    """
+    owns the state of all gates and nets
+
+    every output port of a gate drives exactly one net, every input port
+    listens to at most one net (unconnected inputs read as False).
+    When a net changes, only the gates listening to it are scheduled,
+    so a change costs the size of its fanout instead of the whole board.
+    Ids of removed gates and nets are reused, so rebuilding a board doesn't grow the simulator.
+    """
+    max_events: int = 100_000
+
+    def __init__(self):
+        self._values: list[bool] = []
+        self._fanout: list[list[tuple[int, int]]] = []
+
+        self._funcs: list[tp.Callable | None] = []
+        self._inputs: list[list[int | None]] = []
+        self._outputs: list[list[int]] = []
+
+        self._queue: deque[int] = deque()
+        self._queued: bytearray = bytearray()
+
+        # removed ids, reused by add_gate / add_net
+        self._free_gates: list[int] = []
+        self._free_nets: list[int] = []
+        self._net_used: bytearray = bytearray()
+
+    @property
+    def stable(self) -> bool:
+        """
+        True if no events are pending
+        """
+        return not self._queue
+
+    def pending_nets(self) -> list[int]:
+        """
+        the nets driven by gates with pending events (still changing if the circuit oscillates)
+        """
+        return sorted({net for gate in self._queue for net in self._outputs[gate]})
+
+    # nets
+    def add_net(self, value: bool = False) -> int:
+        """
+        create a new net without a driving gate (used for sources)
+
+        :returns: the nets id
+        """
+        if self._free_nets:
+            net = self._free_nets.pop()
+            self._values[net] = value
+            self._fanout[net] = []
+            self._net_used[net] = 1
+
+            return net
+
+        self._values.append(value)
+        self._fanout.append([])
+        self._net_used.append(1)
+
+        return len(self._values) - 1
+
+    def remove_net(self, net: int):
+        """
+        disconnect every gate listening to a net, its id can be reused afterwards
+        """
+        if not self._net_used[net]:
+            return
+
+        for gate, port in self._fanout[net]:
+            self._inputs[gate][port] = None
+            self._schedule(gate)
+
+        self._fanout[net] = []
+        self._values[net] = False
+
+        self._net_used[net] = 0
+        self._free_nets.append(net)
+
+    def value(self, net: int | None) -> bool:
+        """
+        the current value of a net
+        """
+        if net is None:
+            return False
+
+        return self._values[net]
+
+    def set(self, net: int, value: bool):
+        """
+        drive a net from the outside (e.g. a toggle button)
+        """
+        value = bool(value)
+        if self._values[net] != value:
+            self._values[net] = value
+            self._notify(net)
+
+    # gates
+    def add_gate(self, func: tp.Callable, inputs: int, outputs: int) -> int:
+        """
+        create a new gate and its output nets
+
+        :param func: called with one bool per input, returns a bool or a tuple of bools
+        :param inputs: number of input ports
+        :param outputs: number of output ports
+        :returns: the gates id
+        """
+        if self._free_gates:
+            gate = self._free_gates.pop()
+
+            self._funcs[gate] = func
+            self._inputs[gate] = [None] * inputs
+            self._outputs[gate] = [self.add_net() for _ in range(outputs)]
+
+        else:
+            gate = len(self._funcs)
+
+            self._funcs.append(func)
+            self._inputs.append([None] * inputs)
+            self._outputs.append([self.add_net() for _ in range(outputs)])
+            self._queued.append(0)
+
+        # evaluate once, so e.g. a "Not" starts out high
+        self._schedule(gate)
+
+        return gate
+
+    def remove_gate(self, gate: int):
+        """
+        remove a gate, everything listening to its outputs reads False afterwards.
+        Its id (and the ids of its output nets) can be reused afterwards
+        """
+        if self._funcs[gate] is None:
+            return
+
+        for port in range(len(self._inputs[gate])):
+            self.disconnect(gate, port)
+
+        for net in self._outputs[gate]:
+            self.remove_net(net)
+
+        self._funcs[gate] = None
+        self._free_gates.append(gate)
+
+    def output(self, gate: int, port: int) -> int:
+        """
+        the net driven by a gates output port
+        """
+        return self._outputs[gate][port]
+
+    def input_net(self, gate: int, port: int) -> int | None:
+        """
+        the net a gates input port listens to
+        """
+        return self._inputs[gate][port]
+
+    def input_value(self, gate: int, port: int) -> bool:
+        """
+        the current value at a gates input port
+        """
+        return self.value(self._inputs[gate][port])
+
+    def connect(self, net: int, gate: int, port: int):
+        """
+        connect a net to a gates input port, replacing any previous connection
+        """
+        self.disconnect(gate, port)
+
+        self._inputs[gate][port] = net
+        self._fanout[net].append((gate, port))
+        self._schedule(gate)
+
+    def disconnect(self, gate: int, port: int):
+        """
+        remove the connection of a gates input port
+        """
+        net = self._inputs[gate][port]
+        if net is None:
+            return
+
+        self._inputs[gate][port] = None
+        self._fanout[net].remove((gate, port))
+        self._schedule(gate)
+
+    def add_netlist(
+            self,
+            netlist: Netlist,
+            inputs: list[int] = ...,
+    ) -> tuple[list[int], list[int | None], list[int]]:
+        """
+        create all gates of a netlist
+
+        :param netlist: the netlist to build
+        :param inputs: existing nets to use as the netlists inputs, new nets are created by default
+        :returns: the nets of the inputs, the nets of the outputs (None if unconnected) and the gate ids
+        """
+        if inputs is ...:
+            inputs = [self.add_net() for _ in range(netlist.n_inputs)]
+
+        # netlist net -> simulator net
+        nets: list[int | None] = [None] * netlist.n_nets
+        for net, own in zip(netlist.inputs, inputs):
+            nets[net] = own
+
+        gates: list[int] = []
+        for gate in range(netlist.n_gates):
+            start, end = netlist.out_offsets[gate], netlist.out_offsets[gate + 1]
+            n_inputs = netlist.in_offsets[gate + 1] - netlist.in_offsets[gate]
+
+            node = self.add_gate(GateTypes[netlist.types[gate]].func, n_inputs, end - start)
+            for port, net in enumerate(netlist.out_nets[start:end]):
+                nets[net] = self._outputs[node][port]
+
+            gates.append(node)
+
+        for gate, node in enumerate(gates):
+            for port, net in enumerate(netlist.gate_inputs(gate)):
+                if net >= 0:
+                    self.connect(nets[net], node, port)
+
+        outputs = [nets[net] if net >= 0 else None for net in netlist.outputs]
+
+        return inputs, outputs, gates
+
+    # simulation
+    def settle(self, max_events: int = ...) -> int:
+        """
+        process pending events until the circuit is stable
+
+        :param max_events: stop after this many gate evaluations (for oscillating circuits),
+            remaining events stay queued for the next call
+        :returns: the number of evaluated gates
+        """
+        if max_events is ...:
+            max_events = self.max_events
+
+        queue = self._queue
+        queued = self._queued
+        values = self._values
+
+        events = 0
+        while queue and events < max_events:
+            gate = queue.popleft()
+            queued[gate] = 0
+            events += 1
+
+            func = self._funcs[gate]
+            if func is None:
+                continue
+
+            result = func(*[False if net is None else values[net] for net in self._inputs[gate]])
+            if not isinstance(result, tuple):
+                result = (result,)
+
+            for net, value in zip(self._outputs[gate], result):
+                value = bool(value)
+                if values[net] != value:
+                    values[net] = value
+                    self._notify(net)
+
+        return events
+
+    def _schedule(self, gate: int):
+        if not self._queued[gate]:
+            self._queued[gate] = 1
+            self._queue.append(gate)
+
+    def _notify(self, net: int):
+        for gate, _ in self._fanout[net]:
+            self._schedule(gate)
+
+
+# the simulation of the board that is being edited
+Simulation = Simulator()
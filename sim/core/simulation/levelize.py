@@ -0,0 +1,215 @@
+"""
+levelize.py
+18. October 2026
+
+topological ordering of the gates of a netlist
+
+Author:
+Nilusink
+"""
+from array import array
+
+from .netlist import Netlist, BLOCK
+
+
+class Levels:
+    """
+    the evaluation order of a netlist
+
+    components are evaluated in order, every gate only depends on gates of earlier components
+    (or of its own component, if that is a feedback loop). Blocks are skipped, their nets are
+    resolved with `Netlist.resolve_blocks`.
+    """
+    components: list[list[int]]
+    cycles: list[list[int]]
+    levels: array
+    depth: int
+
+    def __init__(self, components: list[list[int]], cycles: list[list[int]], levels: array):
+        self.components = components
+        self.cycles = cycles
+        self.levels = levels
+        self.depth = max(levels, default=-1) + 1
+
+    @property
+    def acyclic(self) -> bool:
+        """
+        True if the netlist has no feedback loops and settles in one sweep
+        """
+        return not self.cycles
+
+    @property
+    def order(self) -> list[int]:
+        """
+        all gates in evaluation order
+        """
+        return [gate for component in self.components for gate in component]
+
+
+def dependencies(netlist: Netlist, source: array = ...) -> list[list[int]]:
+    """
+    the gates each gate reads from (empty for blocks)
+
+    :param netlist: the netlist
+    :param source: the result of `netlist.resolve_blocks()`, if already known
+    """
+    if source is ...:
+        source = netlist.resolve_blocks()
+
+    driver = [-1] * netlist.n_nets
+    for gate in range(netlist.n_gates):
+        if netlist.types[gate] != BLOCK:
+            for net in netlist.gate_outputs(gate):
+                driver[net] = gate
+
+    deps: list[list[int]] = []
+    for gate in range(netlist.n_gates):
+        if netlist.types[gate] == BLOCK:
+            deps.append([])
+            continue
+
+        gate_deps = []
+        for net in netlist.gate_inputs(gate):
+            if net >= 0 and source[net] >= 0 and driver[source[net]] >= 0:
+                gate_deps.append(driver[source[net]])
+
+        deps.append(gate_deps)
+
+    return deps
+
+
+def _order_cycle(component: list[int], deps: list[list[int]]) -> list[int]:
+    """
+    order the gates of a feedback loop as close to topologically as possible
+
+    the loop is entered at the gates reading from outside of it and walked forward,
+    so e.g. the two halves of a latch are evaluated one after the other instead of interleaved.
+    """
+    members = set(component)
+
+    following: dict[int, list[int]] = {gate: [] for gate in component}
+    entries: list[int] = []
+    for gate in component:
+        for dep in deps[gate]:
+            if dep in members:
+                following[dep].append(gate)
+
+        if any(dep not in members for dep in deps[gate]):
+            entries.append(gate)
+
+    # reverse postorder of an iterative depth first search
+    visited: set[int] = set()
+    post: list[int] = []
+    for root in entries + component:
+        if root in visited:
+            continue
+
+        visited.add(root)
+        work = [(root, 0)]
+        while work:
+            gate, i = work[-1]
+
+            if i < len(following[gate]):
+                work[-1] = (gate, i + 1)
+                nxt = following[gate][i]
+
+                if nxt not in visited:
+                    visited.add(nxt)
+                    work.append((nxt, 0))
+
+                continue
+
+            work.pop()
+            post.append(gate)
+
+    post.reverse()
+    return post
+
+
+def levelize(netlist: Netlist) -> Levels:
+    """
+    sort the gates topologically and find the feedback loops (strongly connected components)
+    """
+    n = netlist.n_gates
+    deps = dependencies(netlist)
+
+    # iterative tarjan, walking from each gate to the gates it depends on.
+    # components are found dependencies first, which is already the evaluation order
+    index = [-1] * n
+    low = [0] * n
+    on_stack = bytearray(n)
+    stack: list[int] = []
+    counter = 0
+
+    components: list[list[int]] = []
+    cycles: list[list[int]] = []
+
+    for root in range(n):
+        if index[root] != -1 or netlist.types[root] == BLOCK:
+            continue
+
+        work = [(root, 0)]
+        while work:
+            gate, i = work[-1]
+
+            if index[gate] == -1:
+                index[gate] = low[gate] = counter
+                counter += 1
+                stack.append(gate)
+                on_stack[gate] = 1
+
+            edges = deps[gate]
+            descended = False
+            while i < len(edges):
+                dep = edges[i]
+                i += 1
+
+                if index[dep] == -1:
+                    work[-1] = (gate, i)
+                    work.append((dep, 0))
+                    descended = True
+                    break
+
+                if on_stack[dep]:
+                    low[gate] = min(low[gate], index[dep])
+
+            if descended:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[gate])
+
+            if low[gate] == index[gate]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component.append(member)
+
+                    if member == gate:
+                        break
+
+                component.reverse()
+
+                if len(component) > 1 or gate in deps[gate]:
+                    component = _order_cycle(component, deps)
+                    cycles.append(component)
+
+                components.append(component)
+
+    # a components level is one more than the highest level it depends on
+    levels = array("i", [-1] * n)
+    for component in components:
+        members = set(component)
+        level = 0
+        for gate in component:
+            for dep in deps[gate]:
+                if dep not in members:
+                    level = max(level, levels[dep] + 1)
+
+        for gate in component:
+            levels[gate] = level
+
+    return Levels(components, cycles, levels)
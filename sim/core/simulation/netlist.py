@@ -0,0 +1,562 @@
+"""
+netlist.py
+18. October 2026
+
+flat integer representation of a saved board
+
+Author:
+Nilusink
+"""
+from array import array
+import typing as tp
+import hashlib
+import json
+
+from .registry import GateTypes
+
+
+# gate types
+AND: int = 0
+NOT: int = 1
+BLOCK: int = 2
+
+# net id of unconnected inputs
+LOW: int = -1
+
+
+def _and(x: bool, y: bool) -> bool:
+    return x and y
+
+
+def _not(x: bool) -> bool:
+    return not x
+
+
+def _passthrough(*values: bool) -> tuple[bool, ...]:
+    return values
+
+
+# built-in gate types, blocks save their number of ports per gate
+GateTypes.register("And", _and, 2, 1, id=AND)
+GateTypes.register("Not", _not, 1, 1, id=NOT)
+GateTypes.register("CustomBlock", _passthrough, 0, 0, id=BLOCK)
+
+
+class Layout:
+    """
+    everything about a board that is not needed for simulating it
+    """
+    positions: list[tuple[float, float]]
+    wire_points: list[list[tuple[float, float]]]
+    inputs: list[float]
+    outputs: list[float]
+
+    def __init__(self):
+        self.positions = []
+        self.wire_points = []
+        self.inputs = []
+        self.outputs = []
+
+
+class Netlist:
+    """
+    a board as flat integer arrays
+
+    every output port drives its own net, the boards inputs drive nets 0 to n_inputs-1.
+    The ports of gate g are in_nets[in_offsets[g]:in_offsets[g+1]] and
+    out_nets[out_offsets[g]:out_offsets[g+1]], unconnected inputs are LOW.
+
+    A block (CustomBlock) with n inputs and m outputs has n+m input and output ports:
+    input ports 0 to n-1 are its outer inputs, output ports 0 to n-1 feed them to the inner gates,
+    input ports n to n+m-1 collect the inner results, output ports n to n+m-1 are its outer outputs.
+    splits[g] holds n for blocks, parents[g] the index of the block a gate is part of (-1 for the board).
+    """
+    types: array
+    ids: array
+    splits: array
+    parents: array
+    names: list[str]
+
+    in_offsets: array
+    in_nets: array
+    out_offsets: array
+    out_nets: array
+
+    inputs: array
+    outputs: array
+    n_nets: int
+
+    # gate -1 stands for the inputs (source) or outputs (target) of the board
+    wire_from_gate: array
+    wire_from_port: array
+    wire_to_gate: array
+    wire_to_port: array
+
+    layout: Layout | None
+
+    def __init__(self):
+        self.types = array("b")
+        self.ids = array("i")
+        self.splits = array("i")
+        self.parents = array("i")
+        self.names = []
+
+        self.in_offsets = array("i", [0])
+        self.in_nets = array("i")
+        self.out_offsets = array("i", [0])
+        self.out_nets = array("i")
+
+        self.inputs = array("i")
+        self.outputs = array("i")
+        self.n_nets = 0
+
+        self.wire_from_gate = array("i")
+        self.wire_from_port = array("i")
+        self.wire_to_gate = array("i")
+        self.wire_to_port = array("i")
+
+        self.layout = None
+
+    @property
+    def n_gates(self) -> int:
+        return len(self.types)
+
+    @property
+    def n_inputs(self) -> int:
+        return len(self.inputs)
+
+    @property
+    def n_outputs(self) -> int:
+        return len(self.outputs)
+
+    @property
+    def n_wires(self) -> int:
+        return len(self.wire_from_gate)
+
+    def gate_inputs(self, gate: int) -> array:
+        """
+        the nets connected to a gates input ports
+        """
+        return self.in_nets[self.in_offsets[gate]:self.in_offsets[gate + 1]]
+
+    def gate_outputs(self, gate: int) -> array:
+        """
+        the nets driven by a gates output ports
+        """
+        return self.out_nets[self.out_offsets[gate]:self.out_offsets[gate + 1]]
+
+    def add_gate(self, type: int, inputs: tp.Iterable[int], n_outputs: int, split: int = 0, name: str = ...) -> int:
+        """
+        append a gate, its outputs get new nets
+
+        :returns: the gates index
+        """
+        if name is ...:
+            name = "Block" if type == BLOCK else GateTypes[type].name
+
+        self.types.append(type)
+        self.ids.append(len(self.ids))
+        self.splits.append(split)
+        self.parents.append(-1)
+        self.names.append(name)
+
+        self.in_nets.extend(inputs)
+        self.in_offsets.append(len(self.in_nets))
+
+        self.out_nets.extend(range(self.n_nets, self.n_nets + n_outputs))
+        self.out_offsets.append(len(self.out_nets))
+        self.n_nets += n_outputs
+
+        return self.n_gates - 1
+
+    def digest(self) -> str:
+        """
+        a hash of the logic (not the layout), equal for equal boards
+        """
+        digest = hashlib.sha256()
+        digest.update(array("i", (self.n_nets,)).tobytes())
+
+        for data in (self.types, self.splits, self.in_offsets, self.in_nets, self.out_offsets, self.out_nets):
+            digest.update(data.tobytes())
+
+        digest.update(b"|")
+        digest.update(self.inputs.tobytes())
+        digest.update(b"|")
+        digest.update(self.outputs.tobytes())
+
+        return digest.hexdigest()
+
+    def resolve_blocks(self) -> array:
+        """
+        the net that really drives each net
+
+        blocks only pass values on, so each of their output nets is the net at the matching input.
+        Gates that read the result can skip the block entirely.
+        """
+        source = array("i", range(self.n_nets))
+
+        for gate in range(self.n_gates):
+            if self.types[gate] == BLOCK:
+                for src, dst in zip(self.gate_inputs(gate), self.gate_outputs(gate)):
+                    source[dst] = src
+
+        # follow chains through nested blocks, a loop made only of blocks is never driven
+        for net in range(self.n_nets):
+            root = source[net]
+            steps = 0
+            while root >= 0 and source[root] != root:
+                root = source[root]
+                steps += 1
+
+                if steps > self.n_nets:
+                    root = LOW
+                    break
+
+            source[net] = root
+
+        return source
+
+    def children(self) -> dict[int, list[int]]:
+        """
+        the gates directly inside of each block (-1 for the board), build it once for many lookups
+        """
+        children: dict[int, list[int]] = {}
+
+        for gate in range(self.n_gates):
+            children.setdefault(self.parents[gate], []).append(gate)
+
+        return children
+
+    def descendants(self, block: int, children: dict[int, list[int]] = ...) -> list[int]:
+        """
+        all gates inside a block, including the gates of nested blocks
+
+        :param block: the block
+        :param children: the result of `children()`, if already known
+        """
+        if children is ...:
+            children = self.children()
+
+        gates: list[int] = []
+        work = list(children.get(block, ()))
+
+        while work:
+            gate = work.pop()
+            gates.append(gate)
+            work.extend(children.get(gate, ()))
+
+        gates.sort()
+        return gates
+
+    def extract(self, block: int, children: dict[int, list[int]] = ...) -> "Netlist":
+        """
+        the inner gates of a block as their own netlist
+
+        :param block: the block
+        :param children: the result of `children()`, if already known (saves a pass over all gates)
+        """
+        split = self.splits[block]
+        start = self.out_offsets[block]
+
+        out = Netlist()
+
+        # old net -> new net, the blocks inner side becomes the new boards inputs
+        nets: dict[int, int] = {}
+        for net in self.out_nets[start:start + split]:
+            nets[net] = out.n_nets
+            out.n_nets += 1
+
+        out.inputs = array("i", range(split))
+
+        gates = self.descendants(block, children)
+        index = {gate: i for i, gate in enumerate(gates)}
+
+        for gate in gates:
+            for net in self.gate_outputs(gate):
+                nets[net] = out.n_nets
+                out.n_nets += 1
+
+        for gate in gates:
+            out.types.append(self.types[gate])
+            out.ids.append(self.ids[gate])
+            out.splits.append(self.splits[gate])
+            out.parents.append(index.get(self.parents[gate], -1))
+            out.names.append(self.names[gate])
+
+            out.in_nets.extend(nets.get(net, LOW) for net in self.gate_inputs(gate))
+            out.in_offsets.append(len(out.in_nets))
+            out.out_nets.extend(nets[net] for net in self.gate_outputs(gate))
+            out.out_offsets.append(len(out.out_nets))
+
+        inner_results = self.in_nets[self.in_offsets[block] + split:self.in_offsets[block + 1]]
+        out.outputs = array("i", (nets.get(net, LOW) for net in inner_results))
+
+        return out
+
+
+def export_data(
+        netlist: Netlist,
+        first_id: int = 0,
+        inputs: list[str] = ...,
+        outputs: list[str] = ...,
+        position: tuple[float, float] = ...,
+) -> tuple[list[dict], list[dict]]:
+    """
+    convert a netlist back to the gates and wires of the save format
+
+    :param netlist: the netlist to export
+    :param first_id: the saved id of the first gate
+    :param inputs: the port ids the netlists inputs are connected to (the inputs box by default)
+    :param outputs: the port ids the netlists outputs are connected to (the outputs box by default)
+    :param position: position of all gates, the layout is used by default
+    :returns: gates and wires
+    """
+    if inputs is ...:
+        inputs = [f"-1o{i}" for i in range(netlist.n_inputs)]
+
+    if outputs is ...:
+        outputs = [f"-2i{i}" for i in range(netlist.n_outputs)]
+
+    gates: list[dict] = []
+    for gate in range(netlist.n_gates):
+        if position is ... and netlist.layout is not None:
+            pos = list(netlist.layout.positions[gate])
+
+        else:
+            pos = list((1000, -10_000) if position is ... else position)
+
+        if netlist.types[gate] == BLOCK:
+            split = netlist.splits[gate]
+            n_outputs = netlist.out_offsets[gate + 1] - netlist.out_offsets[gate] - split
+            args = [pos, netlist.names[gate], None, split, n_outputs]
+
+        else:
+            args = [pos]
+
+        gates.append({
+            "position": pos,
+            "args": args,
+            "type": netlist.types[gate],
+            "id": first_id + gate,
+        })
+
+    # net -> port id of its driver
+    drivers: list[str | None] = [None] * netlist.n_nets
+    for net, port in zip(netlist.inputs, inputs):
+        drivers[net] = port
+
+    for gate in range(netlist.n_gates):
+        split = netlist.splits[gate]
+        for port, net in enumerate(netlist.gate_outputs(gate)):
+            if port < split:
+                drivers[net] = f"{first_id + gate}co{port}"
+
+            else:
+                drivers[net] = f"{first_id + gate}o{port - split}"
+
+    wires: list[dict] = []
+    for gate in range(netlist.n_gates):
+        split = netlist.splits[gate]
+        for port, net in enumerate(netlist.gate_inputs(gate)):
+            if net < 0 or drivers[net] is None:
+                continue
+
+            if port < split or netlist.types[gate] != BLOCK:
+                target = f"{first_id + gate}i{port}"
+
+            else:
+                target = f"{first_id + gate}ci{port - split}"
+
+            wires.append({"parent": drivers[net], "target": target, "points": []})
+
+    for net, port in zip(netlist.outputs, outputs):
+        if net >= 0 and drivers[net] is not None:
+            wires.append({"parent": drivers[net], "target": port, "points": []})
+
+    return gates, wires
+
+
+def split_port(port: str) -> tuple[int, str, int]:
+    """
+    split a saved port id like "3o0", "-1o2" or "5ci1"
+
+    :returns: owner id, port type ("o", "i", "co" or "ci"), port number
+    """
+    kind = "o" if "o" in port else "i"
+    if "c" in port:
+        kind = "c" + kind
+
+    owner, pid = port.replace("c", "").split(kind[-1])
+
+    return int(owner), kind, int(pid)
+
+
+def compile_data(data: dict) -> Netlist:
+    """
+    compile the contents of a file written by `serialize_all`
+    """
+    out = Netlist()
+    layout = Layout()
+    out.layout = layout
+
+    layout.inputs = list(data["input"])
+    layout.outputs = list(data["output"])
+
+    out.inputs = array("i", range(len(data["input"])))
+    out.outputs = array("i", [LOW] * len(data["output"]))
+    out.n_nets = len(data["input"])
+
+    # saved id -> gate index
+    index: dict[int, int] = {}
+
+    for gate in data["gates"]:
+        # saved by type id, older saves by name
+        gate_type = GateTypes.get(gate["type"])
+
+        if gate_type is None:
+            continue
+
+        if gate_type.id == BLOCK:
+            name, n_inputs, n_outputs = gate["args"][1], gate["args"][3], gate["args"][4]
+            ports = n_inputs + n_outputs
+
+            g = out.add_gate(BLOCK, (LOW,) * ports, ports, n_inputs, name)
+
+        else:
+            g = out.add_gate(gate_type.id, (LOW,) * gate_type.n_inputs, gate_type.n_outputs)
+
+        out.ids[g] = gate["id"]
+        index[gate["id"]] = g
+        layout.positions.append(tuple(gate["position"]))
+
+    for wire in data["wires"]:
+        parent, parent_kind, pid = split_port(wire["parent"])
+        target, target_kind, tid = split_port(wire["target"])
+
+        # check if the points are valid
+        if "i" in parent_kind:
+            raise RuntimeError("parent node can only be of type output")
+
+        if "o" in target_kind:
+            raise RuntimeError("target node can only be of type input")
+
+        if parent == -2:
+            raise RuntimeError("parent cannot be output node")
+
+        if target == -1:
+            raise RuntimeError("target cannot be input node")
+
+        if parent < -2 or target < -2:
+            raise RuntimeError("invalid node id")
+
+        # wires of gates that could not be loaded
+        if parent not in index and parent != -1 or target not in index and target != -2:
+            continue
+
+        # convert to gate indices and simulation ports
+        if parent == -1:
+            from_gate, from_port = -1, pid
+            net = out.inputs[pid]
+
+        else:
+            from_gate = index[parent]
+            from_port = pid if parent_kind == "co" else out.splits[from_gate] + pid
+            net = out.out_nets[out.out_offsets[from_gate] + from_port]
+
+        if target == -2:
+            to_gate, to_port = -1, tid
+            out.outputs[tid] = net
+
+        else:
+            to_gate = index[target]
+            to_port = out.splits[to_gate] + tid if target_kind == "ci" else tid
+            out.in_nets[out.in_offsets[to_gate] + to_port] = net
+
+        out.wire_from_gate.append(from_gate)
+        out.wire_from_port.append(from_port)
+        out.wire_to_gate.append(to_gate)
+        out.wire_to_port.append(to_port)
+        layout.wire_points.append([tuple(point) for point in wire["points"]])
+
+    out.parents = _find_parents(out)
+
+    return out
+
+
+def compile_file(file: str) -> Netlist:
+    """
+    compile a file written by `serialize_all`, JSON or binary
+    """
+    # imported here, the binary format is built on top of this module
+    from .binary import is_binary, read_netlist
+
+    if is_binary(file):
+        with open(file, "rb") as infile:
+            return read_netlist(infile)
+
+    with open(file, "r") as infile:
+        return compile_data(json.load(infile))
+
+
+def _find_parents(netlist: Netlist) -> array:
+    """
+    find the block every gate is part of
+
+    blocks have an outer side (their ports 0 to n-1 in, n to n+m-1 out) and an inner side.
+    Gates connected by wires form a region, a region touching the inner side of a block is inside it.
+    """
+    n = netlist.n_gates
+    board = 2 * n
+
+    # union find over all gates, the inner sides of blocks (n + gate) and the board itself
+    roots = list(range(2 * n + 1))
+
+    def find(node: int) -> int:
+        while roots[node] != node:
+            roots[node] = roots[roots[node]]
+            node = roots[node]
+
+        return node
+
+    for i in range(netlist.n_wires):
+        gate, port = netlist.wire_from_gate[i], netlist.wire_from_port[i]
+        if gate == -1:
+            source = board
+
+        else:
+            source = n + gate if netlist.types[gate] == BLOCK and port < netlist.splits[gate] else gate
+
+        gate, port = netlist.wire_to_gate[i], netlist.wire_to_port[i]
+        if gate == -1:
+            target = board
+
+        else:
+            target = n + gate if netlist.types[gate] == BLOCK and port >= netlist.splits[gate] else gate
+
+        roots[find(source)] = find(target)
+
+    # region -> owning block
+    owners: dict[int, int] = {}
+    for gate in range(n):
+        if netlist.types[gate] == BLOCK:
+            owners.setdefault(find(n + gate), gate)
+
+    # the board owns its region, even if a wire wrongly connects it to the inside of a block
+    owners[find(board)] = -1
+
+    parents = array("i", (owners.get(find(gate), -1) for gate in range(n)))
+
+    # blocks wired into themselves would never reach the board
+    for gate in range(n):
+        seen = {gate}
+        parent = parents[gate]
+
+        while parent != -1:
+            if parent in seen:
+                parents[gate] = -1
+                break
+
+            seen.add(parent)
+            parent = parents[parent]
+
+    return parents
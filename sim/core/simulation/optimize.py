@@ -0,0 +1,210 @@
+"""
+optimize.py
+18. October 2026
+
+flatten netlists and remove redundant gates
+
+Author:
+Nilusink
+"""
+from array import array
+
+from .levelize import levelize
+from .netlist import Netlist, AND, NOT, BLOCK, LOW
+
+
+# constant high while optimizing, becomes a single "Not" reading LOW in the result
+_HIGH: int = -2
+
+
+def flatten(netlist: Netlist) -> Netlist:
+    """
+    inline all (nested) blocks, the result only has primitive gates
+
+    the layout is dropped, a flat netlist can only be simulated, not drawn.
+    """
+    source = netlist.resolve_blocks()
+
+    out = Netlist()
+    out.inputs = array("i", range(netlist.n_inputs))
+    out.n_nets = netlist.n_inputs
+
+    gates = [gate for gate in range(netlist.n_gates) if netlist.types[gate] != BLOCK]
+
+    # old net -> new net, gates get their nets in order when they are added
+    nets: dict[int, int] = {net: i for i, net in enumerate(netlist.inputs)}
+    n_nets = out.n_nets
+    for gate in gates:
+        for net in netlist.gate_outputs(gate):
+            nets[net] = n_nets
+            n_nets += 1
+
+    for gate in gates:
+        inputs = [nets.get(source[net], LOW) if net >= 0 else LOW for net in netlist.gate_inputs(gate)]
+        g = out.add_gate(netlist.types[gate], inputs, len(netlist.gate_outputs(gate)), name=netlist.names[gate])
+        out.ids[g] = netlist.ids[gate]
+
+    out.outputs = array("i", (nets.get(source[net], LOW) if net >= 0 else LOW for net in netlist.outputs))
+
+    return out
+
+
+def optimize(netlist: Netlist) -> Netlist:
+    """
+    flatten a netlist and simplify its logic
+
+    * Not(Not(x)) is replaced by x
+    * constants (unconnected inputs are LOW) are propagated: And(x, LOW) is LOW, And(x, HIGH) is x, ...
+    * And(x, x) is x, And(x, Not(x)) is LOW
+    * identical gates reading the same nets are merged
+    * gates that don't lead to an output are removed
+
+    gates in feedback loops and gates of other (registered) types are never merged
+    or replaced, so latches keep their behaviour, only their inputs are simplified.
+    """
+    flat = flatten(netlist)
+    levels = levelize(flat)
+    in_cycles = {gate for cycle in levels.cycles for gate in cycle}
+
+    # net -> equivalent net (or LOW / _HIGH), only for removed gates
+    alias: dict[int, int] = {}
+
+    def find(net: int) -> int:
+        while net in alias:
+            net = alias[net]
+
+        return net
+
+    # net -> its inverse, for every remaining "Not"
+    inverse: dict[int, int] = {LOW: _HIGH, _HIGH: LOW}
+
+    # (type, inputs) -> output net of the first gate computing it
+    known: dict[tuple[int, int, int], int] = {}
+
+    kept = bytearray(flat.n_gates)
+    for gate in levels.order:
+        if flat.types[gate] not in (AND, NOT):
+            kept[gate] = 1
+            continue
+
+        out = flat.gate_outputs(gate)[0]
+        nets = [find(net) for net in flat.gate_inputs(gate)]
+
+        if gate in in_cycles:
+            kept[gate] = 1
+            if flat.types[gate] == NOT:
+                inverse.setdefault(nets[0], out)
+                inverse.setdefault(out, nets[0])
+
+            continue
+
+        if flat.types[gate] == NOT:
+            a = nets[0]
+
+            # constants and double inversion
+            if a in inverse and inverse[a] != out:
+                alias[out] = inverse[a]
+                continue
+
+            key = (NOT, a, LOW)
+
+        else:
+            a, b = sorted(nets)
+
+            if a == LOW or b == LOW or inverse.get(a) == b:
+                alias[out] = LOW
+                continue
+
+            if a == _HIGH or a == b:
+                alias[out] = b
+                continue
+
+            key = (AND, a, b)
+
+        if key in known:
+            alias[out] = known[key]
+            continue
+
+        known[key] = out
+        kept[gate] = 1
+
+        if flat.types[gate] == NOT:
+            inverse[a] = out
+            inverse[out] = a
+
+    return _rebuild(flat, kept, find)
+
+
+def _rebuild(flat: Netlist, kept: bytearray, find) -> Netlist:
+    """
+    copy the kept gates that lead to an output into a new netlist
+    """
+    def source(net: int) -> int:
+        return LOW if net < 0 else find(net)
+
+    driver = [-1] * flat.n_nets
+    for gate in range(flat.n_gates):
+        if kept[gate]:
+            for net in flat.gate_outputs(gate):
+                driver[net] = gate
+
+    # walk back from the outputs
+    live = bytearray(flat.n_gates)
+    work = [driver[net] for net in map(source, flat.outputs) if net >= 0]
+    while work:
+        gate = work.pop()
+        if gate < 0 or live[gate]:
+            continue
+
+        live[gate] = 1
+        work.extend(driver[net] for net in map(source, flat.gate_inputs(gate)) if net >= 0)
+
+    out = Netlist()
+    out.inputs = array("i", range(flat.n_inputs))
+    out.n_nets = flat.n_inputs
+
+    gates = [gate for gate in range(flat.n_gates) if live[gate]]
+    needs_high = any(
+        source(net) == _HIGH for gate in gates for net in flat.gate_inputs(gate)
+    ) or any(source(net) == _HIGH for net in flat.outputs)
+
+    # old net -> new net, gates get their nets in order when they are added
+    nets: dict[int, int] = {LOW: LOW}
+    for net in flat.inputs:
+        nets[net] = net
+
+    n_nets = out.n_nets
+    for gate in gates:
+        for net in flat.gate_outputs(gate):
+            nets[net] = n_nets
+            n_nets += 1
+
+    nets[_HIGH] = n_nets
+
+    for gate in gates:
+        inputs = [nets[source(net)] for net in flat.gate_inputs(gate)]
+        g = out.add_gate(flat.types[gate], inputs, len(flat.gate_outputs(gate)), name=flat.names[gate])
+        out.ids[g] = flat.ids[gate]
+
+    if needs_high:
+        out.add_gate(NOT, (LOW,), 1, name="High")
+
+    out.outputs = array("i", (nets[source(net)] for net in flat.outputs))
+
+    return out
+
+
+# netlist digest -> optimized netlist
+_optimized: dict[str, Netlist] = {}
+
+
+def optimized_for(netlist: Netlist) -> Netlist:
+    """
+    the optimized version of a netlist, computed once per distinct netlist
+    """
+    key = netlist.digest()
+
+    if key not in _optimized:
+        _optimized[key] = optimize(netlist)
+
+    return _optimized[key]
@@ -0,0 +1,128 @@
+"""
+registry.py
+18. October 2026
+
+all known gate types, saved by their id
+
+Author:
+Nilusink
+"""
+import typing as tp
+
+
+class GateType:
+    """
+    a kind of gate with a fixed number of ports
+
+    the logic function is called with one bool per input and returns a bool
+    (or a tuple of bools for more than one output). The delay is the time from a changed
+    input to the changed output, used by the timing simulation.
+    """
+    id: int
+    name: str
+    func: tp.Callable
+    n_inputs: int
+    n_outputs: int
+    delay: float
+
+    def __init__(self, id: int, name: str, func: tp.Callable, n_inputs: int, n_outputs: int, delay: float = 1):
+        self.id = id
+        self.name = name
+        self.func = func
+        self.n_inputs = n_inputs
+        self.n_outputs = n_outputs
+        self.delay = delay
+
+    def __repr__(self) -> str:
+        return f"<GateType {self.name}, id={self.id}, ports={self.n_inputs}/{self.n_outputs}>"
+
+
+class _GateTypes:
+    """
+    gate types by id and by name
+
+    ids are saved in files, so a type has to keep its id. Built-in types use the ids
+    below FIRST_USER_ID, types registered without an id get the next free one after it.
+    """
+    FIRST_USER_ID: int = 16
+
+    _by_id: dict[int, GateType]
+    _by_name: dict[str, GateType]
+
+    def __init__(self):
+        self._by_id = {}
+        self._by_name = {}
+
+    def register(
+            self,
+            name: str,
+            func: tp.Callable,
+            n_inputs: int,
+            n_outputs: int,
+            id: int = ...,
+            delay: float = 1,
+    ) -> GateType:
+        """
+        add a new gate type
+
+        :param name: unique name, shown on the gate
+        :param func: the logic function
+        :param n_inputs: number of input ports
+        :param n_outputs: number of output ports
+        :param id: the saved id, the next free one by default
+        :param delay: propagation delay (in units of time of the timing simulation)
+        :returns: the new type
+        """
+        if id is ...:
+            id = max(self.FIRST_USER_ID, max(self._by_id, default=0) + 1)
+
+        if id in self._by_id:
+            raise RuntimeError(f"gate type id {id} is already used by {self._by_id[id].name}")
+
+        if name in self._by_name:
+            raise RuntimeError(f"gate type \"{name}\" is already registered")
+
+        gate_type = GateType(id, name, func, n_inputs, n_outputs, delay)
+        self._by_id[id] = gate_type
+        self._by_name[name] = gate_type
+
+        return gate_type
+
+    def __getitem__(self, key: int | str) -> GateType:
+        """
+        a type by its id or name
+        """
+        if isinstance(key, str):
+            return self._by_name[key]
+
+        return self._by_id[key]
+
+    def get(self, key: int | str, default: tp.Any = None) -> GateType | tp.Any:
+        """
+        a type by its id or name, default if it is unknown
+        """
+        try:
+            return self[key]
+
+        except KeyError:
+            return default
+
+    def of(self, func: tp.Callable) -> GateType | None:
+        """
+        the type a logic function belongs to
+        """
+        for gate_type in self._by_id.values():
+            if gate_type.func is func:
+                return gate_type
+
+        return None
+
+    def __contains__(self, key: int | str) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self) -> tp.Iterator[GateType]:
+        return iter(self._by_id.values())
+
+
+# Instances
+GateTypes = _GateTypes()
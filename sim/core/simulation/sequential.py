@@ -0,0 +1,259 @@
+"""
+sequential.py
+18. October 2026
+
+clocked simulation of boards with feedback loops, tick by tick
+
+Author:
+Nilusink
+"""
+import typing as tp
+
+from .instances import OscillationError, Program
+from .levelize import Levels
+from .netlist import Netlist, AND, NOT
+
+
+class SequentialProgram(Program):
+    """
+    a compiled netlist with fixed-point semantics for its feedback loops
+
+    acyclic gates run in levelized order, the gates of a feedback loop all read the values
+    of the previous sweep and are updated together (unit delay), so the result never depends
+    on the order of the gates. A loop that comes back to an earlier state without becoming
+    stable oscillates, an `OscillationError` names the nets changing in it.
+    """
+    # sweeps over a feedback loop before giving up, on top of one sweep per gate of the loop
+    max_sweeps: int = 64
+
+    # nets driven by feedback loops, everything else follows from them and the inputs
+    memory: list[int]
+
+    def __init__(self, netlist: Netlist, levels: Levels = ...):
+        super().__init__(netlist, levels)
+
+        self.memory = sorted({
+            net
+            for cyclic, program in self._steps if cyclic
+            for kind, _, b, out in program
+            for net in ((out,) if kind in (AND, NOT) else b)
+        })
+
+    def reset(self, state: bytearray, inputs: tp.Iterable[bool]) -> tuple[bool, ...]:
+        """
+        settle a new state once, in levelized order
+
+        all nets start low, which leaves e.g. both halves of a latch racing. Walking the loops
+        in order (like `Program`) decides the race the same way every time.
+        """
+        return super().run(state, inputs)
+
+    def run(self, state: bytearray, inputs: tp.Iterable[bool]) -> tuple[bool, ...]:
+        """
+        set the inputs and settle every feedback loop to a fixed point
+
+        :raises OscillationError: if a feedback loop oscillates
+        """
+        for net, value in zip(self._inputs, inputs):
+            state[net] = 1 if value else 0
+
+        for cyclic, program in self._steps:
+            if not cyclic:
+                self._sweep(state, program)
+                continue
+
+            self._settle(state, program)
+
+        return tuple(bool(state[net]) for net in self._outputs)
+
+    def _settle(self, state: bytearray, program: list[tuple[int, tp.Any, tp.Any, tp.Any]]):
+        nets = [net for kind, _, b, out in program for net in ((out,) if kind in (AND, NOT) else b)]
+
+        # loop state -> sweep it was seen after
+        seen: dict[bytes, int] = {}
+        history: list[bytes] = []
+
+        for _ in range(len(program) + self.max_sweeps):
+            snapshot = bytes(state[net] for net in nets)
+
+            if snapshot in seen:
+                # every state since the first visit repeats forever
+                loop = history[seen[snapshot]:]
+                raise OscillationError(sorted(
+                    net for i, net in enumerate(nets) if any(values[i] != loop[0][i] for values in loop)
+                ))
+
+            seen[snapshot] = len(history)
+            history.append(snapshot)
+
+            if not self._jacobi(state, program):
+                return
+
+        raise OscillationError(sorted({
+            net for i, net in enumerate(nets) if history[-1][i] != state[net]
+        }))
+
+    @staticmethod
+    def _jacobi(state: bytearray, program: list[tuple[int, tp.Any, tp.Any, tp.Any]]) -> bool:
+        """
+        evaluate every instruction with the values from before the sweep
+
+        :returns: True if a net changed
+        """
+        changes: list[tuple[int, int]] = []
+
+        for kind, a, b, out in program:
+            if kind == AND:
+                changes.append((out, state[a] & state[b]))
+
+            elif kind == NOT:
+                changes.append((out, state[a] ^ 1))
+
+            else:
+                result = out(*(bool(state[net]) for net in a))
+                if not isinstance(result, tuple):
+                    result = (result,)
+
+                changes.extend((net, 1 if value else 0) for net, value in zip(b, result))
+
+        changed = False
+        for net, value in changes:
+            if state[net] != value:
+                state[net] = value
+                changed = True
+
+        return changed
+
+
+class ClockedCircuit:
+    """
+    a board driven by a clock, simulated one clock period (tick) at a time
+
+    every tick the other inputs are set while the clock is low, then the clock input goes high
+    and low again, each step is settled to a fixed point.
+    The outputs are read at the end of the tick. Since the state of a board is the value of its
+    feedback loops, every (state, inputs) transition is only simulated once and cached,
+    repeated transitions (counters, registers, ...) cost a single lookup.
+    """
+    # cached transitions before the cache stops growing
+    max_cached: int = 1 << 20
+
+    program: SequentialProgram
+    clock: int
+    ticks: int
+
+    _state: bytearray
+    _memory: bytes
+    _cache: dict[tuple[bytes, tuple[bool, ...]], tuple[bytes, tuple[bool, ...]]]
+    _outputs: tuple[bool, ...]
+
+    def __init__(self, netlist: Netlist, clock: int = 0):
+        """
+        :param netlist: the board
+        :param clock: the input (index in the InputsBox, top to bottom) the clock is connected to
+        :raises RuntimeError: if the board has no such input
+        :raises OscillationError: if a feedback loop oscillates at power-up
+        """
+        if not 0 <= clock < netlist.n_inputs:
+            raise RuntimeError(f"the board has no input {clock} for the clock")
+
+        self.program = SequentialProgram(netlist)
+        self.clock = clock
+        self.ticks = 0
+
+        self._state = self.program.new_state()
+        self._cache = {}
+
+        # everything low, settled once
+        self._outputs = self.program.reset(self._state, [False] * netlist.n_inputs)
+        self._memory = self._snapshot()
+
+    @property
+    def n_inputs(self) -> int:
+        """
+        number of inputs besides the clock
+        """
+        return self.program.n_inputs - 1
+
+    @property
+    def outputs(self) -> tuple[bool, ...]:
+        return self._outputs
+
+    def tick(self, inputs: tp.Sequence[bool] = ()) -> tuple[bool, ...]:
+        """
+        simulate one clock period
+
+        :param inputs: the values of the other inputs (in order, without the clock), all low by default
+        :returns: the outputs at the end of the tick
+        :raises OscillationError: if a feedback loop oscillates
+        """
+        inputs = tuple(bool(value) for value in inputs) or (False,) * self.n_inputs
+        key = (self._memory, inputs)
+
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._transition(inputs)
+
+            if len(self._cache) < self.max_cached:
+                self._cache[key] = cached
+
+        self._memory, self._outputs = cached
+        self.ticks += 1
+
+        return self._outputs
+
+    def run(self, ticks: int, inputs: tp.Sequence[bool] = ()) -> tuple[bool, ...]:
+        """
+        simulate many clock periods with the same inputs
+
+        :returns: the outputs after the last tick
+        """
+        inputs = tuple(bool(value) for value in inputs) or (False,) * self.n_inputs
+        cache = self._cache
+        memory, outputs = self._memory, self._outputs
+
+        for _ in range(ticks):
+            cached = cache.get((memory, inputs))
+
+            if cached is None:
+                self._memory = memory
+                cached = self._transition(inputs)
+
+                if len(cache) < self.max_cached:
+                    cache[(memory, inputs)] = cached
+
+            memory, outputs = cached
+
+        self._memory, self._outputs = memory, outputs
+        self.ticks += ticks
+
+        return outputs
+
+    def _transition(self, inputs: tuple[bool, ...]) -> tuple[bytes, tuple[bool, ...]]:
+        """
+        simulate a tick from the current state
+
+        :returns: the state and outputs after it
+        """
+        if len(inputs) != self.n_inputs:
+            raise RuntimeError(f"expected {self.n_inputs} input values, got {len(inputs)}")
+
+        state = self._state
+        for net, value in zip(self.program.memory, self._memory):
+            state[net] = value
+
+        # the inputs change while the clock is low, before the rising edge
+        values = list(inputs)
+        values.insert(self.clock, False)
+        self.program.run(state, values)
+
+        values[self.clock] = True
+        self.program.run(state, values)
+
+        values[self.clock] = False
+        outputs = self.program.run(state, values)
+
+        return self._snapshot(), outputs
+
+    def _snapshot(self) -> bytes:
+        return bytes(self._state[net] for net in self.program.memory)
@@ -0,0 +1,118 @@
+"""
+tables.py
+18. October 2026
+
+truth tables for purely combinational blocks
+
+Author:
+Nilusink
+"""
+from array import array
+
+from .bitparallel import BitParallel
+from .levelize import levelize
+from .netlist import Netlist, AND, NOT, BLOCK
+
+
+# blocks with more inputs are simulated gate by gate
+MAX_INPUTS: int = 16
+
+
+class TruthTable:
+    """
+    the outputs of a block for every input combination
+
+    row k holds the outputs for the inputs k (input 0 is the least significant bit),
+    packed with output j at bit j.
+    """
+    n_inputs: int
+    n_outputs: int
+    rows: array
+    _decoded: list[tuple[bool, ...]] | None
+
+    def __init__(self, n_inputs: int, n_outputs: int, rows: array):
+        self.n_inputs = n_inputs
+        self.n_outputs = n_outputs
+        self.rows = rows
+
+        # with few outputs, every possible row is decoded only once
+        self._decoded = None
+        if n_outputs <= 12:
+            self._decoded = [
+                tuple(bool((row >> j) & 1) for j in range(n_outputs)) for row in range(1 << n_outputs)
+            ]
+
+    def lookup(self, index: int) -> tuple[bool, ...]:
+        """
+        the outputs for the inputs packed into an integer
+        """
+        row = self.rows[index]
+
+        if self._decoded is not None:
+            return self._decoded[row]
+
+        return tuple(bool((row >> j) & 1) for j in range(self.n_outputs))
+
+    def __call__(self, *inputs: bool) -> tuple[bool, ...]:
+        index = 0
+        for i, value in enumerate(inputs):
+            if value:
+                index |= 1 << i
+
+        return self.lookup(index)
+
+    @staticmethod
+    def from_words(words: list[int], n_inputs: int) -> "TruthTable":
+        """
+        build a table from the output words of `BitParallel.truth_table`
+        """
+        n_outputs = len(words)
+        count = 1 << n_inputs
+
+        if n_outputs <= 8:
+            rows = array("B", bytes(count))
+
+        elif n_outputs <= 16:
+            rows = array("H", [0]) * count
+
+        elif n_outputs <= 32:
+            rows = array("L", [0]) * count
+
+        else:
+            rows = array("Q", [0]) * count
+
+        for j, word in enumerate(words):
+            bit = 1 << j
+            bits = format(word, f"0{count}b")
+
+            # the string starts with the highest vector
+            for k, char in enumerate(reversed(bits)):
+                if char == "1":
+                    rows[k] |= bit
+
+        return TruthTable(n_inputs, n_outputs, rows)
+
+
+# netlist digest -> table (None if the netlist can't be tabulated)
+_tables: dict[str, TruthTable | None] = {}
+
+
+def table_for(netlist: Netlist) -> TruthTable | None:
+    """
+    the truth table of a netlist, computed once per distinct netlist
+
+    :returns: None if the netlist has feedback loops, too many inputs or other gates than "And" and "Not"
+    """
+    key = netlist.digest()
+
+    if key not in _tables:
+        _tables[key] = None
+
+        if netlist.n_inputs <= MAX_INPUTS and set(netlist.types) <= {AND, NOT, BLOCK}:
+            levels = levelize(netlist)
+
+            if levels.acyclic:
+                words = BitParallel(netlist, levels).truth_table()
+                _tables[key] = TruthTable.from_words(words, netlist.n_inputs)
+
+    return _tables[key]
@@ -0,0 +1,286 @@
+"""
+timing.py
+18. October 2026
+
+simulation with gate propagation delays, critical paths
+
+Author:
+Nilusink
+"""
+import typing as tp
+import heapq
+
+from .instances import OscillationError, Program
+from .levelize import levelize
+from .netlist import Netlist, AND, NOT, BLOCK, LOW
+from .registry import GateTypes
+
+
+def gate_delays(netlist: Netlist, delays: dict[int | str, float] = ...) -> list[float]:
+    """
+    the propagation delay of every gate (0 for blocks)
+
+    :param netlist: the netlist
+    :param delays: delays by type id or name, replacing the delays of the gate registry
+    """
+    if delays is ...:
+        delays = {}
+
+    by_type: dict[int, float] = {}
+    for kind in set(netlist.types):
+        if kind == BLOCK:
+            by_type[kind] = 0
+            continue
+
+        gate_type = GateTypes[kind]
+        by_type[kind] = delays.get(kind, delays.get(gate_type.name, gate_type.delay))
+
+    return [by_type[kind] for kind in netlist.types]
+
+
+def gate_path(netlist: Netlist, gate: int) -> str:
+    """
+    a gates name with the blocks it is in, e.g. "adder/full_adder/And"
+    """
+    names = [netlist.names[gate]]
+
+    parent = netlist.parents[gate]
+    while parent != -1:
+        names.append(netlist.names[parent])
+        parent = netlist.parents[parent]
+
+    return "/".join(reversed(names))
+
+
+class CriticalPath(tp.NamedTuple):
+    """
+    the slowest path from an input to an output
+    """
+    delay: float
+    # index of the output (in the OutputsBox) at the end of the path, -1 if there are no outputs
+    output: int
+    # the gates along the path, first gate first
+    gates: list[int]
+
+
+def critical_path(netlist: Netlist, delays: dict[int | str, float] = ...) -> CriticalPath:
+    """
+    find the slowest path through an acyclic netlist (static timing)
+
+    :param netlist: the netlist
+    :param delays: delays by type id or name, see `gate_delays`
+    """
+    levels = levelize(netlist)
+    if not levels.acyclic:
+        raise RuntimeError("boards with feedback loops have no critical path, simulate them with TimingSimulator")
+
+    source = netlist.resolve_blocks()
+    delay = gate_delays(netlist, delays)
+
+    # the time a nets value is final and the gate that drives it last
+    arrival = [0.0] * (netlist.n_nets + 1)
+    driver = [-1] * (netlist.n_nets + 1)
+    previous = [LOW] * (netlist.n_nets + 1)
+
+    for gate in levels.order:
+        latest = LOW
+        for net in netlist.gate_inputs(gate):
+            net = source[net] if net >= 0 else LOW
+
+            if latest == LOW or arrival[net] > arrival[latest]:
+                latest = net
+
+        for net in netlist.gate_outputs(gate):
+            arrival[net] = arrival[latest] + delay[gate]
+            driver[net] = gate
+            previous[net] = latest
+
+    outputs = [source[net] if net >= 0 else LOW for net in netlist.outputs]
+    if not outputs:
+        return CriticalPath(0, -1, [])
+
+    output = max(range(len(outputs)), key=lambda j: arrival[outputs[j]])
+
+    gates = []
+    net = outputs[output]
+    while net != LOW and driver[net] != -1:
+        gates.append(driver[net])
+        net = previous[net]
+
+    return CriticalPath(arrival[outputs[output]], output, gates[::-1])
+
+
+class TimingReport:
+    """
+    what happened after the inputs of a `TimingSimulator` changed
+    """
+    start: float
+    settle_time: float
+    events: int
+    # net -> number of times it changed
+    transitions: dict[int, int]
+    # nets that changed more often than needed to reach their final value
+    glitches: dict[int, int]
+
+    def __init__(self, start: float):
+        self.start = start
+        self.settle_time = 0
+        self.events = 0
+        self.transitions = {}
+        self.glitches = {}
+
+
+class TimingSimulator:
+    """
+    event driven simulation with a propagation delay per gate
+
+    a changed input of a gate changes its outputs after the gates delay (transport delay),
+    so short pulses (glitches) are simulated too. Events are kept in buckets by time,
+    every gate is evaluated at most once per point in time, no matter how many of its inputs changed.
+    """
+    max_events: int = 1_000_000
+
+    time: float
+    netlist: Netlist
+
+    _gates: list[tuple[int, tp.Any, tp.Any, tp.Any, float]]
+    _fanout: list[list[int]]
+    _values: bytearray
+    _projected: bytearray
+    _inputs: list[int]
+    _outputs: list[int]
+
+    def __init__(self, netlist: Netlist, delays: dict[int | str, float] = ...):
+        """
+        :param netlist: the board
+        :param delays: delays by type id or name, replacing the delays of the gate registry
+        :raises OscillationError: if the board doesn't settle after powering up
+        """
+        self.netlist = netlist
+        self.time = 0
+
+        source = netlist.resolve_blocks()
+        delay = gate_delays(netlist, delays)
+
+        def resolve(net: int) -> int:
+            return source[net] if net >= 0 else LOW
+
+        self._gates = []
+        self._fanout = [[] for _ in range(netlist.n_nets + 1)]
+
+        for gate in range(netlist.n_gates):
+            kind = netlist.types[gate]
+            if kind == BLOCK:
+                continue
+
+            nets = tuple(resolve(net) for net in netlist.gate_inputs(gate))
+            outs = tuple(netlist.gate_outputs(gate))
+
+            for net in set(nets):
+                self._fanout[net].append(len(self._gates))
+
+            self._gates.append((kind, nets, outs, GateTypes[kind].func, delay[gate]))
+
+        self._inputs = list(netlist.inputs)
+        self._outputs = [resolve(net) for net in netlist.outputs]
+
+        # power up: all inputs low, settled once
+        program = Program(netlist)
+        self._values = program.new_state()
+        program.run(self._values, [False] * netlist.n_inputs)
+        self._projected = bytearray(self._values)
+
+    @property
+    def outputs(self) -> list[bool]:
+        return [bool(self._values[net]) for net in self._outputs]
+
+    def value(self, net: int) -> bool:
+        return bool(self._values[net])
+
+    def apply(self, inputs: tp.Iterable[bool], at: float = ...) -> TimingReport:
+        """
+        change the inputs and simulate until nothing changes anymore
+
+        :param inputs: one value per input
+        :param at: the time the inputs change, the current time by default
+        :raises OscillationError: if the board is still changing after `max_events` events
+        """
+        start = self.time if at is ... else max(at, self.time)
+        report = TimingReport(start)
+
+        values, projected = self._values, self._projected
+        gates, fanout = self._gates, self._fanout
+        before = bytearray(values)
+
+        # time -> (net, value) changes, and the heap of times with changes
+        buckets: dict[float, list[tuple[int, int]]] = {start: []}
+        times: list[float] = [start]
+
+        for net, value in zip(self._inputs, inputs):
+            value = 1 if value else 0
+            if projected[net] != value:
+                projected[net] = value
+                buckets[start].append((net, value))
+
+        transitions = report.transitions
+        now = start
+        while times:
+            now = heapq.heappop(times)
+            changes = buckets.pop(now)
+
+            # gates reading a changed net, each only once
+            touched: set[int] = set()
+            for net, value in changes:
+                if values[net] == value:
+                    continue
+
+                values[net] = value
+                transitions[net] = transitions.get(net, 0) + 1
+                report.settle_time = now - start
+
+                touched.update(fanout[net])
+
+            report.events += len(changes)
+            if report.events > self.max_events:
+                raise OscillationError(sorted(net for net, _ in changes))
+
+            for gate in touched:
+                kind, nets, outs, func, delay = gates[gate]
+
+                if kind == AND:
+                    result = (values[nets[0]] & values[nets[1]],)
+
+                elif kind == NOT:
+                    result = (values[nets[0]] ^ 1,)
+
+                else:
+                    result = func(*(bool(values[net]) for net in nets))
+                    if not isinstance(result, tuple):
+                        result = (result,)
+
+                    result = tuple(1 if value else 0 for value in result)
+
+                for net, value in zip(outs, result):
+                    if projected[net] != value:
+                        projected[net] = value
+                        when = now + delay
+
+                        if when not in buckets:
+                            buckets[when] = []
+                            heapq.heappush(times, when)
+
+                        buckets[when].append((net, value))
+
+        self.time = now
+        report.glitches = {
+            net: count - (values[net] != before[net])
+            for net, count in transitions.items() if count > (values[net] != before[net])
+        }
+
+        return report
+
+    def output_glitches(self, report: TimingReport) -> dict[int, int]:
+        """
+        the glitches of a report at the outputs of the board, by output index
+        """
+        return {j: report.glitches[net] for j, net in enumerate(self._outputs) if net in report.glitches}
@@ -0,0 +1,380 @@
+"""
+vectors.py
+18. October 2026
+
+stream files of test vectors through a netlist, chunk by chunk
+
+Author:
+Nilusink
+"""
+import typing as tp
+import struct
+
+import numpy as np
+
+from .bitparallel import BitParallel
+from .instances import Program
+from .levelize import levelize
+from .netlist import Netlist, AND, NOT, BLOCK
+
+
+# CSV files have a header naming the columns "in<i>" and "out<j>", i and j are the indices of the
+# ports in the "input" / "output" arrays of the save format (the order of the InputsBox / OutputsBox).
+# Every input needs a column, output columns are expected values ("x" or empty for don't care).
+#
+# binary files (little endian):
+#
+#   header      VECTOR_MAGIC, version, n_inputs, n_outputs (expected values per record, may be 0)
+#   records     inputs, then expected outputs, each packed into whole bytes (port 0 is bit 0 of the first byte)
+VECTOR_MAGIC: bytes = b"LSVE"
+VECTOR_VERSION: int = 1
+
+# vectors per chunk
+CHUNK_SIZE: int = 4096
+
+_HEADER = struct.Struct("<4sHHH")
+
+
+class VectorChunk(tp.NamedTuple):
+    """
+    consecutive vectors of a file, one word per port (bit k is the value of vector start + k)
+    """
+    start: int
+    count: int
+    inputs: list[int]
+    # output port -> (expected values, mask of the vectors that care)
+    expected: dict[int, tuple[int, int]]
+
+
+class Mismatch(tp.NamedTuple):
+    """
+    a vector with wrong outputs, inputs and outputs packed (port 0 is the least significant bit)
+    """
+    index: int
+    inputs: int
+    outputs: int
+    # output port -> expected value, only the ports that care
+    expected: dict[int, bool]
+
+
+class VectorReport:
+    """
+    the result of checking the outputs of a vector file against its expected values
+    """
+    # mismatches kept for reporting
+    max_kept: int = 10
+
+    vectors: int
+    n_mismatches: int
+    mismatches: list[Mismatch]
+
+    def __init__(self):
+        self.vectors = 0
+        self.n_mismatches = 0
+        self.mismatches = []
+
+    @property
+    def passed(self) -> bool:
+        return not self.n_mismatches
+
+    def check(self, chunk: VectorChunk, outputs: list[int]):
+        """
+        compare the outputs of a chunk to its expected values
+        """
+        self.vectors += chunk.count
+
+        wrong = 0
+        for port, (values, care) in chunk.expected.items():
+            wrong |= (outputs[port] ^ values) & care
+
+        self.n_mismatches += wrong.bit_count()
+
+        while wrong and len(self.mismatches) < self.max_kept:
+            k = (wrong & -wrong).bit_length() - 1
+            wrong &= wrong - 1
+
+            self.mismatches.append(Mismatch(
+                chunk.start + k,
+                _column(chunk.inputs, k),
+                _column(outputs, k),
+                {port: bool((values >> k) & 1) for port, (values, care) in chunk.expected.items() if (care >> k) & 1},
+            ))
+
+
+def _column(words: list[int], k: int) -> int:
+    """
+    vector k of a chunk, packed (port 0 is the least significant bit)
+    """
+    return sum(((word >> k) & 1) << i for i, word in enumerate(words))
+
+
+def _word(cells: list[str]) -> int:
+    """
+    a column of "0" / "1" cells as a word, the first cell is bit 0 (every cell has to be a single bit)
+    """
+    return int("".join(reversed(cells)) or "0", 2)
+
+
+def read_csv(
+        infile: tp.TextIO,
+        n_inputs: int,
+        n_outputs: int,
+        chunk_size: int = CHUNK_SIZE
+) -> tp.Iterator[VectorChunk]:
+    """
+    read a CSV vector file chunk by chunk
+
+    :param infile: the opened file, starting with the header
+    :param n_inputs: number of inputs of the netlist
+    :param n_outputs: number of outputs of the netlist
+    :param chunk_size: vectors per chunk
+    """
+    header = infile.readline().strip().split(",")
+
+    inputs: dict[int, int] = {}
+    outputs: dict[int, int] = {}
+    for column, name in enumerate(header):
+        name = name.strip()
+
+        if name.startswith("in") and name[2:].isdigit():
+            inputs[int(name[2:])] = column
+
+        elif name.startswith("out") and name[3:].isdigit():
+            outputs[int(name[3:])] = column
+
+        else:
+            raise RuntimeError(f"unknown column \"{name}\", expected \"in<port>\" or \"out<port>\"")
+
+    missing = [port for port in range(n_inputs) if port not in inputs]
+    if missing:
+        raise RuntimeError(f"no column for the inputs {missing}")
+
+    unknown = [f"in{port}" for port in inputs if port >= n_inputs]
+    unknown += [f"out{port}" for port in outputs if port >= n_outputs]
+    if unknown:
+        raise RuntimeError(f"the netlist has no ports for the columns {unknown}")
+
+    start = 0
+    rows: list[tuple[int, list[str]]] = []
+
+    for number, line in enumerate(infile, start=2):
+        line = line.strip()
+
+        if line:
+            rows.append((number, line.split(",")))
+
+        if len(rows) == chunk_size:
+            yield _csv_chunk(start, rows, inputs, outputs, n_inputs)
+            start += len(rows)
+            rows = []
+
+    if rows:
+        yield _csv_chunk(start, rows, inputs, outputs, n_inputs)
+
+
+def _csv_column(rows: list[tuple[int, list[str]]], column: int, name: str, allowed: tuple[str, ...]) -> list[str]:
+    """
+    the cells of a column, stripped
+
+    :raises RuntimeError: for a missing cell or one that is not allowed, with its line number
+    """
+    cells = [row[column].strip() if column < len(row) else None for _, row in rows]
+
+    for (number, _), cell in zip(rows, cells):
+        if cell not in allowed:
+            raise RuntimeError(
+                f"invalid vector in line {number}: " + (f"\"{cell}\" for {name}" if cell is not None else f"no {name}")
+            )
+
+    return cells
+
+
+def _csv_chunk(
+        start: int,
+        rows: list[tuple[int, list[str]]],
+        inputs: dict[int, int],
+        outputs: dict[int, int],
+        n_inputs: int
+) -> VectorChunk:
+    words = [_word(_csv_column(rows, inputs[port], f"in{port}", ("0", "1"))) for port in range(n_inputs)]
+
+    expected: dict[int, tuple[int, int]] = {}
+    for port, column in outputs.items():
+        # a missing or empty output cell is a don't care
+        cells = [
+            "" if cell is None else cell.lower()
+            for cell in _csv_column(rows, column, f"out{port}", ("0", "1", "x", "X", "", None))
+        ]
+
+        expected[port] = (
+            _word(["1" if cell == "1" else "0" for cell in cells]),
+            _word(["1" if cell in ("0", "1") else "0" for cell in cells]),
+        )
+
+    return VectorChunk(start, len(rows), words, expected)
+
+
+def read_binary(
+        infile: tp.BinaryIO,
+        n_inputs: int,
+        n_outputs: int,
+        chunk_size: int = CHUNK_SIZE
+) -> tp.Iterator[VectorChunk]:
+    """
+    read a binary vector file chunk by chunk
+    """
+    try:
+        magic, version, file_inputs, file_outputs = _HEADER.unpack(infile.read(_HEADER.size))
+
+    except struct.error:
+        raise RuntimeError("binary vector file is truncated (no complete header)")
+
+    if magic != VECTOR_MAGIC:
+        raise RuntimeError("not a binary vector file")
+
+    if version > VECTOR_VERSION:
+        raise RuntimeError(f"vector file version {version} is newer than this program ({VECTOR_VERSION})")
+
+    if file_inputs != n_inputs or file_outputs not in (0, n_outputs):
+        raise RuntimeError(
+            f"the vectors have {file_inputs} inputs / {file_outputs} outputs, the netlist {n_inputs} / {n_outputs}"
+        )
+
+    in_bytes, out_bytes = (file_inputs + 7) // 8, (file_outputs + 7) // 8
+    record = in_bytes + out_bytes
+
+    # a board without ports has nothing to read
+    if not record:
+        return
+
+    start = 0
+    while True:
+        data = infile.read(record * chunk_size)
+        count = len(data) // record
+
+        if len(data) % record:
+            raise RuntimeError(f"binary vector file is truncated (incomplete record {start + count})")
+
+        if not count:
+            break
+
+        # one row of bits per vector, one column per port
+        bits = np.unpackbits(
+            np.frombuffer(data, np.uint8, count * record).reshape(count, record), axis=1, bitorder="little"
+        )
+
+        words = [_pack_column(bits[:, i]) for i in range(file_inputs)]
+        expected = {
+            j: (_pack_column(bits[:, in_bytes * 8 + j]), (1 << count) - 1) for j in range(file_outputs)
+        }
+
+        yield VectorChunk(start, count, words, expected)
+        start += count
+
+        if count < chunk_size:
+            break
+
+
+def _pack_column(column: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(column, bitorder="little").tobytes(), "little")
+
+
+def read_vectors(file: str, n_inputs: int, n_outputs: int, chunk_size: int = CHUNK_SIZE) -> tp.Iterator[VectorChunk]:
+    """
+    read a CSV or binary vector file chunk by chunk, the format is detected from the contents
+    """
+    with open(file, "rb") as infile:
+        binary = infile.read(len(VECTOR_MAGIC)) == VECTOR_MAGIC
+
+    if binary:
+        with open(file, "rb") as infile:
+            yield from read_binary(infile, n_inputs, n_outputs, chunk_size)
+
+    else:
+        with open(file, "r") as infile:
+            yield from read_csv(infile, n_inputs, n_outputs, chunk_size)
+
+
+class VectorWriter:
+    """
+    writes the inputs and outputs of the simulated vectors, as CSV or binary (same formats as the inputs)
+    """
+    binary: bool
+    _outfile: tp.IO
+
+    def __init__(self, outfile: tp.IO, n_inputs: int, n_outputs: int, binary: bool = False):
+        self._outfile = outfile
+        self.binary = binary
+
+        if binary:
+            outfile.write(_HEADER.pack(VECTOR_MAGIC, VECTOR_VERSION, n_inputs, n_outputs))
+
+        else:
+            header = [f"in{i}" for i in range(n_inputs)] + [f"out{j}" for j in range(n_outputs)]
+            outfile.write(",".join(header) + "\n")
+
+    def write(self, chunk: VectorChunk, outputs: list[int]):
+        """
+        write a chunk and its outputs
+        """
+        if self.binary:
+            records = np.hstack((_pack_records(chunk.count, chunk.inputs), _pack_records(chunk.count, outputs)))
+            self._outfile.write(records.tobytes())
+            return
+
+        columns = [format(word, f"0{chunk.count}b")[::-1] for word in chunk.inputs + outputs]
+        self._outfile.write("".join(",".join(column[k] for column in columns) + "\n" for k in range(chunk.count)))
+
+
+def _pack_records(count: int, words: list[int]) -> np.ndarray:
+    """
+    one row of bytes per vector, port 0 is bit 0 of the first byte
+    """
+    if not words:
+        return np.zeros((count, 0), np.uint8)
+
+    size = (count + 7) // 8
+    bits = np.unpackbits(
+        np.frombuffer(b"".join(word.to_bytes(size, "little") for word in words), np.uint8).reshape(len(words), size),
+        axis=1,
+        count=count,
+        bitorder="little",
+    )
+
+    return np.packbits(bits.T, axis=1, bitorder="little")
+
+
+def simulate_chunks(netlist: Netlist, chunks: tp.Iterable[VectorChunk]) -> tp.Iterator[tuple[VectorChunk, list[int]]]:
+    """
+    run the vectors through a netlist
+
+    combinational boards of "And" and "Not" gates evaluate a whole chunk at once (bit-parallel),
+    sequential ones (feedback loops) or other gate types run vector by vector, in the order of the file,
+    keeping their state between vectors.
+
+    :returns: every chunk with one output word per output port
+    """
+    levels = levelize(netlist)
+
+    if levels.acyclic and all(kind in (AND, NOT, BLOCK) for kind in netlist.types):
+        program = BitParallel(netlist, levels)
+
+        for chunk in chunks:
+            yield chunk, program.evaluate(chunk.inputs, chunk.count)
+
+        return
+
+    program = Program(netlist, levels)
+    state = program.new_state()
+
+    for chunk in chunks:
+        outputs = [0] * program.n_outputs
+
+        for k in range(chunk.count):
+            result = program.run(state, [(word >> k) & 1 for word in chunk.inputs])
+
+            for j, value in enumerate(result):
+                if value:
+                    outputs[j] |= 1 << k
+
+        yield chunk, outputs
@@ -0,0 +1,378 @@
+"""
+simulate.py
+18. October 2026
+
+simulate saved boards from the command line, without opening a window
+
+Author:
+Nilusink
+"""
+from argparse import ArgumentParser
+import sys
+import time
+
+from sim.core.simulation.exhaustive import bits, combinational, counterexample, evaluate_chunks, packed_truth_table
+from sim.core.simulation.headless import load_circuit
+from sim.core.simulation.netlist import compile_file
+from sim.core.simulation.binary import save_netlist
+from sim.core.simulation.sequential import ClockedCircuit, OscillationError
+from sim.core.simulation.timing import TimingSimulator, critical_path, gate_path
+from sim.core.simulation.vectors import VectorReport, VectorWriter, read_vectors, simulate_chunks
+
+
+# bytes of a packed table written at once
+WRITE_BLOCK: int = 1 << 20
+
+
+def run(args) -> int:
+    """
+    print the outputs of a board for every given input vector
+    """
+    circuit = load_circuit(args.file, args.optimize)
+
+    for vector in args.vectors:
+        if len(vector) != circuit.n_inputs or set(vector) - {"0", "1"}:
+            print(f"invalid input vector \"{vector}\", expected {circuit.n_inputs} bits", file=sys.stderr)
+            return 1
+
+        try:
+            result = circuit.evaluate(bit == "1" for bit in vector)
+
+        except OscillationError as error:
+            print(f"{vector}: {error}", file=sys.stderr)
+            return 1
+
+        print(vector, "->", "".join("1" if bit else "0" for bit in result))
+
+    return 0
+
+
+def table(args) -> int:
+    """
+    print (or export as CSV) the outputs for every input combination
+    """
+    netlist = compile_file(args.file)
+    n_inputs, n_outputs = netlist.n_inputs, netlist.n_outputs
+
+    try:
+        combinational([netlist])
+
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    if args.packed:
+        if not args.output:
+            print("--packed needs an output file (-o)", file=sys.stderr)
+            return 1
+
+        # one bitmap per output, bit k is the output for the inputs k
+        try:
+            with open(args.output, "wb") as outfile, packed_truth_table(netlist, args.jobs) as rows:
+                for row in rows:
+                    for start in range(0, len(row), WRITE_BLOCK):
+                        outfile.write(row[start:start + WRITE_BLOCK])
+
+        except OscillationError as error:
+            print(error, file=sys.stderr)
+            return 1
+
+        return 0
+
+    outfile = open(args.output, "w") if args.output else sys.stdout
+    try:
+        if args.output:
+            header = [f"in{i}" for i in range(n_inputs)] + [f"out{j}" for j in range(n_outputs)]
+            print(",".join(header), file=outfile)
+
+        for start, count, (words,) in evaluate_chunks([netlist], args.jobs):
+            columns = [bits(word, count) for word in words]
+
+            for k in range(count):
+                inputs = bits(start + k, n_inputs)
+                outputs = "".join(column[k] for column in columns)
+
+                if args.output:
+                    print(",".join(inputs + outputs), file=outfile)
+
+                else:
+                    print(inputs, "->", outputs, file=outfile)
+
+    except OscillationError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    finally:
+        if args.output:
+            outfile.close()
+
+    return 0
+
+
+def equiv(args) -> int:
+    """
+    check two boards for functional equivalence
+    """
+    first, second = compile_file(args.first), compile_file(args.second)
+
+    if (first.n_inputs, first.n_outputs) != (second.n_inputs, second.n_outputs):
+        print(
+            f"not equivalent: {first.n_inputs} inputs / {first.n_outputs} outputs "
+            f"and {second.n_inputs} inputs / {second.n_outputs} outputs"
+        )
+        return 1
+
+    for file, netlist in ((args.first, first), (args.second, second)):
+        try:
+            combinational([netlist])
+
+        except RuntimeError as error:
+            print(f"{file}: {error}", file=sys.stderr)
+            return 1
+
+    try:
+        index = counterexample(first, second, args.jobs)
+
+    except OscillationError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    if index is None:
+        print(f"equivalent ({1 << first.n_inputs} input combinations)")
+        return 0
+
+    vector = [bool((index >> i) & 1) for i in range(first.n_inputs)]
+    results = load_circuit(args.first).evaluate(vector), load_circuit(args.second).evaluate(vector)
+
+    print("not equivalent, counterexample:")
+    print(bits(index, first.n_inputs), "->", *("".join("1" if bit else "0" for bit in result) for result in results))
+    return 1
+
+
+def vectors(args) -> int:
+    """
+    run a file of test vectors through a board and check the expected outputs
+    """
+    netlist = compile_file(args.file)
+    n_inputs, n_outputs = netlist.n_inputs, netlist.n_outputs
+
+    report = VectorReport()
+    outfile = open(args.output, "wb" if args.binary else "w") if args.output else None
+    writer = VectorWriter(outfile, n_inputs, n_outputs, args.binary) if outfile else None
+
+    start = time.perf_counter()
+    try:
+        for chunk, outputs in simulate_chunks(netlist, read_vectors(args.vectors, n_inputs, n_outputs)):
+            report.check(chunk, outputs)
+
+            if writer is not None:
+                writer.write(chunk, outputs)
+
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    finally:
+        if outfile is not None:
+            outfile.close()
+
+    seconds = time.perf_counter() - start
+
+    for mismatch in report.mismatches:
+        expected = "".join(
+            ("1" if mismatch.expected[j] else "0") if j in mismatch.expected else "x" for j in range(n_outputs)
+        )
+        print(
+            f"vector {mismatch.index}: {bits(mismatch.inputs, n_inputs)} -> "
+            f"{bits(mismatch.outputs, n_outputs)}, expected {expected}"
+        )
+
+    print(
+        f"{report.vectors} vectors, {report.n_mismatches} mismatches "
+        f"({report.vectors / max(seconds, 1e-9):,.0f} vectors/s)"
+    )
+    return 0 if report.passed else 1
+
+
+def clock(args) -> int:
+    """
+    clock a sequential board for a number of ticks
+    """
+    try:
+        circuit = ClockedCircuit(compile_file(args.file), args.clock)
+
+    except OscillationError as error:
+        # the power-up state already oscillates
+        print(f"tick 0: {error}", file=sys.stderr)
+        return 1
+
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    vector = args.inputs if args.inputs is not None else "0" * circuit.n_inputs
+    if len(vector) != circuit.n_inputs or set(vector) - {"0", "1"}:
+        print(f"invalid input vector \"{vector}\", expected {circuit.n_inputs} bits", file=sys.stderr)
+        return 1
+
+    inputs = [bit == "1" for bit in vector]
+
+    start = time.perf_counter()
+    try:
+        if args.trace:
+            for tick in range(args.ticks):
+                print(tick, "->", "".join("1" if bit else "0" for bit in circuit.tick(inputs)))
+
+        else:
+            circuit.run(args.ticks, inputs)
+
+    except OscillationError as error:
+        print(f"tick {circuit.ticks}: {error}", file=sys.stderr)
+        return 1
+
+    seconds = time.perf_counter() - start
+
+    print("".join("1" if bit else "0" for bit in circuit.outputs))
+    print(f"{circuit.ticks} ticks ({circuit.ticks / max(seconds, 1e-9):,.0f} ticks/s)", file=sys.stderr)
+    return 0
+
+
+def timing(args) -> int:
+    """
+    print the critical path of a board, and settle times and glitches for input vectors
+    """
+    netlist = compile_file(args.file)
+
+    delays: dict[int | str, float] = {}
+    for setting in args.delay:
+        name, _, value = setting.partition("=")
+
+        try:
+            delays[name] = float(value)
+
+        except ValueError:
+            print(f"invalid delay \"{setting}\", expected e.g. And=2", file=sys.stderr)
+            return 1
+
+    if not args.vectors:
+        try:
+            path = critical_path(netlist, delays)
+
+        except RuntimeError as error:
+            print(error, file=sys.stderr)
+            return 1
+
+        print(f"critical path: {path.delay:g} to output {path.output}, {len(path.gates)} gates")
+        for gate in path.gates:
+            print(f"    {gate_path(netlist, gate)}")
+
+        return 0
+
+    try:
+        sim = TimingSimulator(netlist, delays)
+
+    except OscillationError as error:
+        # the power-up state already oscillates
+        print(f"power up: {error}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    events = 0
+
+    for vector in args.vectors:
+        if len(vector) != netlist.n_inputs or set(vector) - {"0", "1"}:
+            print(f"invalid input vector \"{vector}\", expected {netlist.n_inputs} bits", file=sys.stderr)
+            return 1
+
+        try:
+            report = sim.apply(bit == "1" for bit in vector)
+
+        except OscillationError as error:
+            print(f"{vector}: {error}", file=sys.stderr)
+            return 1
+
+        events += report.events
+
+        glitches = sim.output_glitches(report)
+        print(
+            vector, "->", "".join("1" if bit else "0" for bit in sim.outputs),
+            f"settled after {report.settle_time:g}, {report.events} events,",
+            f"glitches at outputs {sorted(glitches)}" if glitches else "no glitches at the outputs",
+        )
+
+    seconds = time.perf_counter() - start
+    print(f"{events} events ({events / max(seconds, 1e-9) / 1000:,.0f} events/ms)", file=sys.stderr)
+    return 0
+
+
+def convert(args) -> int:
+    """
+    save a board in the compact binary format
+    """
+    save_netlist(compile_file(args.file), args.output)
+
+    return 0
+
+
+def main() -> int:
+    """
+    main program
+    """
+    parser = ArgumentParser(description="headless LogicSim")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="evaluate a board for the given input vectors")
+    run_parser.add_argument("file", help="a board saved with \"Create\"")
+    run_parser.add_argument("vectors", nargs="*", help="input bits, first input first (e.g. 0110)")
+    run_parser.add_argument("-O", "--optimize", action="store_true", help="remove redundant gates first")
+    run_parser.set_defaults(func=run)
+
+    table_parser = commands.add_parser("table", help="print the truth table of a board")
+    table_parser.add_argument("file", help="a board saved with \"Create\"")
+    table_parser.add_argument("-o", "--output", help="write the table to a CSV file instead")
+    table_parser.add_argument(
+        "-p", "--packed", action="store_true", help="write one bitmap per output (bit k: inputs k) instead of CSV"
+    )
+    table_parser.add_argument("-j", "--jobs", type=int, default=..., help="worker processes, one per core by default")
+    table_parser.set_defaults(func=table)
+
+    equiv_parser = commands.add_parser("equiv", help="check two boards for functional equivalence")
+    equiv_parser.add_argument("first", help="a board saved with \"Create\"")
+    equiv_parser.add_argument("second", help="the board to compare it to")
+    equiv_parser.add_argument("-j", "--jobs", type=int, default=..., help="worker processes, one per core by default")
+    equiv_parser.set_defaults(func=equiv)
+
+    vectors_parser = commands.add_parser("vectors", help="run a file of test vectors and check the outputs")
+    vectors_parser.add_argument("file", help="a board saved with \"Create\"")
+    vectors_parser.add_argument("vectors", help="CSV (columns in<i>, out<j>) or binary vector file")
+    vectors_parser.add_argument("-o", "--output", help="write the inputs and outputs of every vector to a file")
+    vectors_parser.add_argument("-b", "--binary", action="store_true", help="write the output file in binary")
+    vectors_parser.set_defaults(func=vectors)
+
+    clock_parser = commands.add_parser("clock", help="clock a sequential board for a number of ticks")
+    clock_parser.add_argument("file", help="a board saved with \"Create\"")
+    clock_parser.add_argument("ticks", type=int, help="number of clock periods")
+    clock_parser.add_argument("-c", "--clock", type=int, default=0, help="the input the clock is connected to")
+    clock_parser.add_argument("-i", "--inputs", help="bits for the other inputs, first input first (all 0 by default)")
+    clock_parser.add_argument("-t", "--trace", action="store_true", help="print the outputs after every tick")
+    clock_parser.set_defaults(func=clock)
+
+    timing_parser = commands.add_parser("timing", help="critical path, settle times and glitches with gate delays")
+    timing_parser.add_argument("file", help="a board saved with \"Create\"")
+    timing_parser.add_argument("vectors", nargs="*", help="input bits to apply one after another (e.g. 0110)")
+    timing_parser.add_argument(
+        "-d", "--delay", action="append", default=[], help="delay of a gate type, e.g. -d And=2 (1 by default)"
+    )
+    timing_parser.set_defaults(func=timing)
+
+    convert_parser = commands.add_parser("convert", help="save a board in the compact binary format")
+    convert_parser.add_argument("file", help="a board saved with \"Create\"")
+    convert_parser.add_argument("output", help="the binary file to write (e.g. adder.lsim)")
+    convert_parser.set_defaults(func=convert)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
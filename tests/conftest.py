@@ -0,0 +1,29 @@
+"""
+conftest.py
+18. October 2026
+
+fixtures shared by the tests
+
+Author:
+Nilusink
+"""
+import typing as tp
+import sys
+
+import pytest
+
+from simulate import main
+
+
+@pytest.fixture
+def simulate(monkeypatch) -> tp.Callable[..., int]:
+    """
+    run simulate.py with the given arguments
+
+    :returns: a function taking the arguments and returning the exit code
+    """
+    def run(*args: str) -> int:
+        monkeypatch.setattr(sys, "argv", ["simulate.py", *args])
+        return main()
+
+    return run
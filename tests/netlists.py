@@ -0,0 +1,195 @@
+"""
+netlists.py
+18. October 2026
+
+netlists shared by the tests: generated ones, small known boards and helpers to evaluate and save them
+
+Author:
+Nilusink
+"""
+from array import array
+import random
+import json
+
+from sim.core.simulation.bitparallel import BitParallel
+from sim.core.simulation.netlist import Netlist, AND, NOT, BLOCK, LOW, export_data
+
+
+def embed(outer: Netlist, inner: Netlist, inputs: list[int]) -> list[int]:
+    """
+    copy a netlist into a new block of another one
+
+    :param outer: the netlist to add the block to
+    :param inner: the blocks contents
+    :param inputs: the nets connected to the blocks inputs
+    :returns: the nets of the blocks outputs
+    """
+    split, n_outputs = inner.n_inputs, inner.n_outputs
+
+    block = outer.add_gate(BLOCK, list(inputs) + [LOW] * n_outputs, split + n_outputs, split)
+    ports = outer.gate_outputs(block)
+
+    # inner net -> outer net, the inputs of the inner board are the blocks inner outputs
+    nets = {LOW: LOW}
+    for i, net in enumerate(inner.inputs):
+        nets[net] = ports[i]
+
+    # nested blocks read their results from later gates, so the inputs are connected afterwards
+    first = outer.n_gates
+    for gate in range(inner.n_gates):
+        g = outer.add_gate(
+            inner.types[gate],
+            (LOW,) * len(inner.gate_inputs(gate)),
+            len(inner.gate_outputs(gate)),
+            inner.splits[gate],
+            inner.names[gate],
+        )
+
+        parent = inner.parents[gate]
+        outer.parents[g] = block if parent == -1 else first + parent
+
+        for net, new in zip(inner.gate_outputs(gate), outer.gate_outputs(g)):
+            nets[net] = new
+
+    for gate in range(inner.n_gates):
+        offset = outer.in_offsets[first + gate]
+        for port, net in enumerate(inner.gate_inputs(gate)):
+            outer.in_nets[offset + port] = nets[net]
+
+    offset = outer.in_offsets[block] + split
+    for j, net in enumerate(inner.outputs):
+        outer.in_nets[offset + j] = nets[net]
+
+    return list(ports[split:])
+
+
+def random_netlist(rng: random.Random, n_inputs: int, n_gates: int, n_outputs: int, depth: int = 0) -> Netlist:
+    """
+    an acyclic netlist of "And" and "Not" gates, with nested blocks up to the given depth
+    """
+    netlist = Netlist()
+    netlist.inputs = array("i", range(n_inputs))
+    netlist.n_nets = n_inputs
+
+    nets = list(range(n_inputs))
+
+    def source() -> int:
+        # some inputs stay unconnected
+        if not nets or rng.random() < .05:
+            return LOW
+
+        return rng.choice(nets)
+
+    for _ in range(n_gates):
+        if depth and rng.random() < .2:
+            inner = random_netlist(rng, rng.randint(1, 3), rng.randint(1, 6), rng.randint(1, 3), depth - 1)
+            nets.extend(embed(netlist, inner, [source() for _ in range(inner.n_inputs)]))
+
+        elif rng.random() < .5:
+            nets.extend(netlist.gate_outputs(netlist.add_gate(AND, (source(), source()), 1)))
+
+        else:
+            nets.extend(netlist.gate_outputs(netlist.add_gate(NOT, (source(),), 1)))
+
+    netlist.outputs = array("i", (source() for _ in range(n_outputs)))
+
+    return netlist
+
+
+def generated(seed: int) -> Netlist:
+    """
+    a random netlist with up to 8 inputs, every third one flat, the others with (nested) blocks
+    """
+    rng = random.Random(seed)
+    return random_netlist(rng, rng.randint(0, 8), rng.randint(0, 30), rng.randint(1, 5), depth=seed % 3)
+
+
+def table(netlist: Netlist) -> list[tuple[bool, ...]]:
+    """
+    the outputs for every input combination, through `BitParallel`
+    """
+    count = 1 << netlist.n_inputs
+    words = BitParallel(netlist).truth_table()
+
+    return [tuple(bool((word >> k) & 1) for word in words) for k in range(count)]
+
+
+def vector(k: int, width: int) -> list[bool]:
+    """
+    packed inputs as one value per input, input 0 is the least significant bit
+    """
+    return [bool((k >> i) & 1) for i in range(width)]
+
+
+def adder() -> Netlist:
+    """
+    a half adder, outputs the sum and the carry
+    """
+    netlist = Netlist()
+    netlist.inputs = array("i", (0, 1))
+    netlist.n_nets = 2
+
+    def gate(kind: int, *inputs: int) -> int:
+        return netlist.gate_outputs(netlist.add_gate(kind, inputs, 1))[0]
+
+    carry = gate(AND, 0, 1)
+    either = gate(NOT, gate(AND, gate(NOT, 0), gate(NOT, 1)))
+    netlist.outputs = array("i", (gate(AND, either, gate(NOT, carry)), carry))
+
+    return netlist
+
+
+def latch() -> Netlist:
+    """
+    a gated D latch, input 0 is the clock (enable), input 1 the data, the output Q
+    """
+    netlist = Netlist()
+    netlist.inputs = array("i", (0, 1))
+    netlist.n_nets = 2
+
+    def nand(a: int, b: int) -> int:
+        both = netlist.gate_outputs(netlist.add_gate(AND, (a, b), 1))
+        return netlist.gate_outputs(netlist.add_gate(NOT, both, 1))[0]
+
+    not_d = netlist.gate_outputs(netlist.add_gate(NOT, (1,), 1))[0]
+    set_n, reset_n = nand(1, 0), nand(not_d, 0)
+
+    # the two halves read each other, connected once both exist
+    q_and = netlist.add_gate(AND, (set_n, LOW), 1)
+    q = netlist.gate_outputs(netlist.add_gate(NOT, netlist.gate_outputs(q_and), 1))[0]
+    q_n = nand(reset_n, q)
+    netlist.in_nets[netlist.in_offsets[q_and] + 1] = q_n
+
+    netlist.outputs = array("i", (q,))
+
+    return netlist
+
+
+def ring() -> Netlist:
+    """
+    a "Not" gate reading its own output, the input of the board isn't connected
+    """
+    netlist = Netlist()
+    netlist.inputs = array("i", (0,))
+    netlist.n_nets = 1
+
+    gate = netlist.add_gate(NOT, (LOW,), 1)
+    netlist.in_nets[netlist.in_offsets[gate]] = netlist.gate_outputs(gate)[0]
+    netlist.outputs = array("i", netlist.gate_outputs(gate))
+
+    return netlist
+
+
+def save(netlist: Netlist, file: str):
+    """
+    save a netlist like "Create" does
+    """
+    gates, wires = export_data(netlist, position=(0, 0))
+
+    with open(file, "w") as outfile:
+        json.dump({
+            "input": [0.0] * netlist.n_inputs,
+            "output": [0.0] * netlist.n_outputs,
+            "gates": gates,
+            "wires": wires,
+        }, outfile)
@@ -0,0 +1,92 @@
+"""
+test_binary.py
+18. October 2026
+
+the compact binary save format
+
+Author:
+Nilusink
+"""
+import io
+
+import pytest
+
+from netlists import generated, save, table
+
+from sim.core.simulation import binary
+from sim.core.simulation.binary import NetlistReader, GATES, WIRES, is_binary, read_netlist, save_netlist, write_netlist
+from sim.core.simulation.netlist import compile_file
+
+
+SEEDS = range(0, 150, 5)
+
+
+def written(netlist) -> bytes:
+    outfile = io.BytesIO()
+    write_netlist(netlist, outfile)
+
+    return outfile.getvalue()
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_roundtrip(seed: int):
+    netlist = generated(seed)
+
+    data = written(netlist)
+    loaded = read_netlist(io.BytesIO(data))
+
+    assert table(loaded) == table(netlist)
+    # the gates are stored block by block, the order may change
+    assert sorted(loaded.types) == sorted(netlist.types)
+    assert list(loaded.parents).count(-1) == list(netlist.parents).count(-1)
+
+    # writing the loaded netlist again gives the same file
+    assert written(loaded) == data
+
+
+def test_convert(tmp_path):
+    save(generated(8), tmp_path / "board.json")
+    netlist = compile_file(str(tmp_path / "board.json"))
+
+    save_netlist(netlist, str(tmp_path / "board.lsim"))
+    loaded = compile_file(str(tmp_path / "board.lsim"))
+
+    assert is_binary(str(tmp_path / "board.lsim")) and not is_binary(str(tmp_path / "board.json"))
+    assert loaded.digest() == netlist.digest()
+    assert loaded.layout.positions == netlist.layout.positions
+    assert loaded.layout.wire_points == netlist.layout.wire_points
+    assert list(loaded.wire_to_gate) == list(netlist.wire_to_gate)
+
+
+def test_chunks(monkeypatch):
+    monkeypatch.setattr(binary, "CHUNK_SIZE", 4)
+    netlist = generated(11)
+
+    reader = NetlistReader(io.BytesIO(written(netlist)))
+    assert reader.netlist.n_outputs == netlist.n_outputs
+
+    gates, wires = [], []
+    for kind, indices in reader.chunks():
+        (gates if kind == GATES else wires).append(indices)
+
+        if kind == GATES:
+            # a chunk never splits a block from its inner gates
+            children = reader.netlist.children()
+            for gate in indices:
+                assert all(inner in indices for inner in reader.netlist.descendants(gate, children))
+
+    assert len(gates) > 1
+    assert [gate for chunk in gates for gate in chunk] == list(range(netlist.n_gates))
+    assert [wire for chunk in wires for wire in chunk] == list(range(netlist.n_wires))
+    assert kind == WIRES or not wires
+
+
+def test_malformed():
+    data = written(generated(11))
+
+    with pytest.raises(RuntimeError, match="not a binary LogicSim file"):
+        read_netlist(io.BytesIO(b"LSIX" + data[4:]))
+
+    for size in (10, len(data) // 2, len(data) - 1):
+        with pytest.raises(RuntimeError, match="truncated"):
+            read_netlist(io.BytesIO(data[:size]))
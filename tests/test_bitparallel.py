@@ -0,0 +1,70 @@
+"""
+test_bitparallel.py
+18. October 2026
+
+evaluating many input vectors at once
+
+Author:
+Nilusink
+"""
+import random
+
+import pytest
+
+from netlists import adder, generated, ring, vector
+
+from sim.core.simulation.bitparallel import BitParallel, exhaustive_inputs, pack, unpack
+from sim.core.simulation.instances import OscillationError
+
+
+@pytest.mark.parametrize("n_inputs, start, count", [
+    (4, 0, 16),
+    (5, 8, 8),
+    (5, 4, 2),
+    (6, 3, 17),
+    (3, 0, 0),
+])
+def test_exhaustive_inputs(n_inputs: int, start: int, count: int):
+    words = exhaustive_inputs(n_inputs, start, count)
+
+    assert unpack(words, count) == [vector(start + k, n_inputs) for k in range(count)]
+
+
+def test_pack():
+    rng = random.Random(0)
+    vectors = [[rng.random() < .5 for _ in range(5)] for _ in range(37)]
+
+    words, count = pack(vectors, 5)
+
+    assert count == 37
+    assert unpack(words, count) == vectors
+
+
+def test_adder():
+    program = BitParallel(adder())
+
+    # sum and carry of every input combination, input 0 is bit 0
+    assert program.truth_table() == [0b0110, 0b1000]
+    assert program.truth_table(2, 2) == [0b01, 0b10]
+
+
+@pytest.mark.parametrize("seed", range(0, 150, 7))
+def test_chunks(seed: int):
+    netlist = generated(seed)
+    program = BitParallel(netlist)
+    count = 1 << netlist.n_inputs
+    words = program.truth_table()
+
+    # any chunk of the table is the same part of the whole table
+    start = seed % count
+    size = count - start
+    assert program.truth_table(start, size) == [(word >> start) & ((1 << size) - 1) for word in words]
+
+    # evaluating vectors one by one gives the same bits
+    for k in range(0, count, 3):
+        assert program.evaluate(vector(k, netlist.n_inputs), 1) == [(word >> k) & 1 for word in words]
+
+
+def test_oscillation():
+    with pytest.raises(OscillationError):
+        BitParallel(ring()).truth_table()
@@ -0,0 +1,85 @@
+"""
+test_clickable.py
+18. October 2026
+
+the grid routing clicks to the sprites under the cursor
+
+Author:
+Nilusink
+"""
+from sim.core.basegame.groups import _Clickable
+
+
+class Box:
+    """
+    anything with a hit-box
+    """
+    def __init__(self, x: float, y: float, width: float, height: float):
+        self.hit_box = (x, y, width, height)
+
+
+def test_at():
+    clickable = _Clickable()
+    big, small, far = Box(0, 0, 200, 100), Box(50, 50, 10, 10), Box(-300, -300, 20, 20)
+
+    for sprite in (small, big, far):
+        clickable.add(sprite, lambda event: None)
+
+    # in the order they were added, the edges count
+    assert clickable.at((55, 55)) == [small, big]
+    assert clickable.at((200, 100)) == [big]
+    assert clickable.at((150, 20)) == [big]
+    assert clickable.at((-290, -281)) == [far]
+    assert clickable.at((201, 50)) == []
+
+    assert len(clickable) == 3 and small in clickable
+
+
+def test_update():
+    clickable = _Clickable()
+    box = Box(0, 0, 10, 10)
+    clickable.add(box, lambda event: None)
+
+    box.hit_box = (500, 500, 100, 100)
+    assert clickable.at((5, 5)) == [box]
+
+    clickable.update(box)
+    assert clickable.at((5, 5)) == []
+    assert clickable.at((599, 599)) == [box]
+
+    # only the cells of the new hit-box are left
+    assert set(clickable._cells) == set(clickable._cells_of(box.hit_box))
+
+    # unknown sprites are ignored
+    clickable.update(Box(0, 0, 1, 1))
+    assert len(clickable) == 1
+
+
+def test_remove():
+    clickable = _Clickable()
+    first, second = Box(0, 0, 100, 100), Box(0, 0, 100, 100)
+    clickable.add(first, lambda event: None)
+    clickable.add(second, lambda event: None)
+
+    clickable.remove(first)
+    clickable.remove(first)
+
+    assert clickable.at((50, 50)) == [second]
+    assert first not in clickable
+
+    clickable.remove(second)
+    assert clickable._cells == {} and clickable._boxes == {}
+    assert len(clickable) == 0
+
+
+def test_click():
+    clickable = _Clickable()
+    box = Box(0, 0, 10, 10)
+    clicks = []
+
+    clickable.add(box, clicks.append)
+    clickable.click(box, "event")
+    clickable.remove(box)
+    clickable.click(box, "ignored")
+
+    assert clicks == ["event"]
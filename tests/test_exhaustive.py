@@ -0,0 +1,147 @@
+"""
+test_exhaustive.py
+18. October 2026
+
+truth tables and equivalence checks over the whole input space, in worker processes
+
+Author:
+Nilusink
+"""
+import random
+import signal
+import time
+import os
+
+import pytest
+
+from netlists import adder, latch, random_netlist, table
+
+from sim.core.simulation import exhaustive
+from sim.core.simulation.exhaustive import bits, chunks, combinational, counterexample, evaluate_chunks
+from sim.core.simulation.exhaustive import packed_truth_table, truth_table
+from sim.core.simulation.netlist import NOT
+from sim.core.simulation.optimize import optimize
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    """
+    use worker processes for small netlists too, with many small chunks (of whole bytes in the packed table)
+    """
+    monkeypatch.setattr(exhaustive, "MIN_PARALLEL_INPUTS", 2)
+    monkeypatch.setattr(exhaustive, "CHUNK_BITS", 3)
+
+
+def words(netlist) -> list[int]:
+    return [sum(row[j] << k for k, row in enumerate(table(netlist))) for j in range(netlist.n_outputs)]
+
+
+def test_chunks():
+    assert chunks(3) == [(0, 8)]
+    assert chunks(0) == [(0, 1)]
+    assert bits(0b011, 4) == "1100"
+    assert bits(0, 0) == ""
+
+
+@pytest.mark.parametrize("processes", (1, 2))
+def test_truth_table(parallel, processes: int):
+    netlist = random_netlist(random.Random(7), 6, 40, 4, depth=2)
+
+    assert truth_table(netlist, processes) == words(netlist)
+
+    with packed_truth_table(netlist, processes) as rows:
+        assert [len(row) for row in rows] == [8] * 4
+        assert [int.from_bytes(row, "little") for row in rows] == words(netlist)
+
+    found = {}
+    for start, count, (result,) in evaluate_chunks([netlist], processes):
+        found[start] = result
+
+        assert count == 8
+        assert result == [(word >> start) & 0xff for word in words(netlist)]
+
+    assert sorted(found) == list(range(0, 64, 8))
+
+
+def test_no_outputs():
+    netlist = adder()
+    netlist.outputs = netlist.outputs[:0]
+
+    with packed_truth_table(netlist, 1) as rows:
+        assert rows == []
+
+
+@pytest.mark.parametrize("processes", (1, 2))
+def test_counterexample(parallel, processes: int):
+    netlist = random_netlist(random.Random(1), 6, 30, 2, depth=1)
+    assert counterexample(netlist, optimize(netlist), processes) is None
+
+    # an inverted output differs everywhere, the first difference is reported
+    broken = random_netlist(random.Random(1), 6, 30, 2, depth=1)
+    broken.outputs[1] = broken.gate_outputs(broken.add_gate(NOT, (broken.outputs[1],), 1))[0]
+    assert counterexample(netlist, broken, processes) == 0
+
+    with pytest.raises(RuntimeError, match="different ports"):
+        counterexample(netlist, adder(), processes)
+
+
+def test_feedback():
+    assert [levels.acyclic for levels in combinational([adder(), adder()])] == [True, True]
+
+    # a latch has no truth table, its outputs depend on earlier inputs
+    with pytest.raises(RuntimeError, match="feedback loops"):
+        combinational([adder(), latch()])
+
+    with pytest.raises(RuntimeError, match="feedback loops"):
+        truth_table(latch(), 1)
+
+    with pytest.raises(RuntimeError, match="feedback loops"):
+        counterexample(latch(), latch(), 1)
+
+
+def test_workers_stop(parallel):
+    """
+    a handler for SIGTERM in the parent (like the one of SDL) doesn't keep the workers alive
+    """
+    netlist = random_netlist(random.Random(7), 6, 40, 4, depth=2)
+    previous = signal.signal(signal.SIGTERM, lambda *args: None)
+
+    try:
+        for _ in range(10):
+            assert truth_table(netlist, 2) == words(netlist)
+            assert counterexample(netlist, netlist, 2) is None
+
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+
+def test_workers_stop_early(parallel, monkeypatch, tmp_path):
+    """
+    not even the workers stopped before they are initialized
+    """
+    init_worker = exhaustive._init_worker
+
+    def slow_init_worker(*args):
+        # only the first worker starts right away, the difference is found before the others are initialized
+        try:
+            os.close(os.open(tmp_path / "started", os.O_CREAT | os.O_EXCL))
+
+        except FileExistsError:
+            time.sleep(.2)
+
+        init_worker(*args)
+
+    monkeypatch.setattr(exhaustive, "_init_worker", slow_init_worker)
+
+    netlist = random_netlist(random.Random(1), 6, 30, 2, depth=1)
+    broken = random_netlist(random.Random(1), 6, 30, 2, depth=1)
+    broken.outputs[1] = broken.gate_outputs(broken.add_gate(NOT, (broken.outputs[1],), 1))[0]
+    previous = signal.signal(signal.SIGTERM, lambda *args: None)
+
+    try:
+        for _ in range(3):
+            (tmp_path / "started").unlink(missing_ok=True)
+            assert counterexample(netlist, broken, 2) == 0
+
+    finally:
+        signal.signal(signal.SIGTERM, previous)
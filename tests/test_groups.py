@@ -0,0 +1,68 @@
+"""
+test_groups.py
+18. October 2026
+
+the id index and counter of the Gates and Wires groups
+
+Author:
+Nilusink
+"""
+import pygame as pg
+
+from sim.core.basegame.groups import _Gates, _Wires
+
+
+class Gate(pg.sprite.Sprite):
+    def __init__(self, id: int):
+        super().__init__()
+        self.id = id
+
+
+def test_ids():
+    gates = _Gates()
+    assert gates.yield_unique_id() == 0
+
+    sprites = [Gate(gates.yield_unique_id())]
+    gates.add(sprites[-1])
+    sprites.append(Gate(gates.yield_unique_id()))
+    gates.add(sprites[-1])
+
+    # loaded gates keep their saved ids, the counter continues after the highest
+    sprites.append(Gate(7))
+    gates.add(sprites[-1])
+
+    assert [sprite.id for sprite in sprites] == [0, 1, 7]
+    assert gates.yield_unique_id() == 8
+    assert gates.get_by_id(1) is sprites[1]
+    assert gates.id_taken(7) and not gates.id_taken(2)
+
+
+def test_removed():
+    gates = _Gates()
+    sprites = [Gate(i) for i in range(3)]
+    gates.add(*sprites)
+
+    # ids of removed gates are not handed out again while the group has gates
+    gates.remove(sprites[2])
+    gates.remove(sprites[1])
+    assert gates.yield_unique_id() == 3
+    assert gates.get_by_id(2) is None and not gates.id_taken(1)
+
+    # an empty group (e.g. a loaded board) starts at 0 again
+    gates.remove(sprites[0])
+    assert gates.yield_unique_id() == 0
+    assert gates.get_by_id(0) is None
+    assert len(gates) == 0
+
+
+def test_replaced():
+    wires = _Wires()
+    first, second = Gate(4), Gate(4)
+
+    wires.add(first)
+    wires.add(second)
+
+    # removing a sprite doesn't drop the index entry of another sprite with the same id
+    wires.remove(first)
+    assert wires.get_by_id(4) is second
+    assert wires.yield_unique_id() == 5
@@ -0,0 +1,61 @@
+"""
+test_headless.py
+18. October 2026
+
+boards simulated without pygame, and the "run" command
+
+Author:
+Nilusink
+"""
+import pytest
+
+from netlists import adder, ring, save, table, vector
+
+from sim.core.simulation.headless import build_circuit, load_circuit
+from sim.core.simulation.instances import OscillationError
+
+
+def test_circuit():
+    circuit = build_circuit(adder())
+
+    assert (circuit.n_inputs, circuit.n_outputs) == (2, 2)
+    for k, expected in enumerate(table(adder())):
+        assert tuple(circuit.evaluate(vector(k, 2))) == expected
+
+
+@pytest.mark.parametrize("optimized", (False, True))
+def test_load_circuit(tmp_path, optimized: bool):
+    save(adder(), tmp_path / "adder.json")
+    circuit = load_circuit(str(tmp_path / "adder.json"), optimized)
+
+    assert circuit.evaluate([True, True]) == [False, True]
+    assert circuit.evaluate([False, True]) == [True, False]
+
+
+def test_oscillation():
+    circuit = build_circuit(ring())
+
+    with pytest.raises(OscillationError) as error:
+        circuit.evaluate([False])
+
+    assert error.value.nets
+
+
+def test_run(tmp_path, simulate, capsys):
+    save(adder(), tmp_path / "adder.json")
+
+    assert simulate("run", str(tmp_path / "adder.json"), "00", "10", "11") == 0
+    assert capsys.readouterr().out.split("\n") == ["00 -> 00", "10 -> 10", "11 -> 01", ""]
+
+    assert simulate("run", str(tmp_path / "adder.json"), "1") == 1
+    assert "invalid input vector \"1\"" in capsys.readouterr().err
+
+
+def test_run_oscillation(tmp_path, simulate, capsys):
+    save(ring(), tmp_path / "ring.json")
+
+    assert simulate("run", str(tmp_path / "ring.json"), "0") == 1
+
+    output = capsys.readouterr()
+    assert output.out == ""
+    assert output.err.startswith("0: feedback loop did not settle")
@@ -0,0 +1,81 @@
+"""
+test_instances.py
+18. October 2026
+
+compiled blocks shared by all their placed copies
+
+Author:
+Nilusink
+"""
+from array import array
+
+import pytest
+
+from netlists import adder, generated, latch, ring, table, vector
+
+from sim.core.simulation.instances import Instance, OscillationError, Program, program_for
+from sim.core.simulation.netlist import Netlist, AND, NOT
+
+
+def enabled_ring() -> Netlist:
+    """
+    a "Not" gate reading its own output through an "And", oscillates while input 0 is high
+    """
+    netlist = Netlist()
+    netlist.inputs = array("i", (0,))
+    netlist.n_nets = 1
+
+    netlist.add_gate(AND, (0, 2), 1)
+    netlist.add_gate(NOT, (1,), 1)
+    netlist.outputs = array("i", (2,))
+
+    return netlist
+
+
+@pytest.mark.parametrize("seed", range(0, 150, 7))
+def test_program(seed: int):
+    netlist = generated(seed)
+    program = Program(netlist)
+    state = program.new_state()
+
+    assert (program.n_inputs, program.n_outputs) == (netlist.n_inputs, netlist.n_outputs)
+    for k, expected in enumerate(table(netlist)):
+        assert program.run(state, vector(k, netlist.n_inputs)) == expected
+
+
+def test_program_for():
+    assert program_for(adder()) is program_for(adder())
+    assert program_for(adder()) is not program_for(latch())
+
+
+def test_instances():
+    program = program_for(latch())
+    first, second = Instance(program), Instance(program)
+
+    # every instance keeps its own state
+    assert first(True, True) == (True,)
+    assert second(True, False) == (False,)
+    assert first(False, False) == (True,)
+    assert second(False, True) == (False,)
+
+
+def test_oscillation():
+    with pytest.raises(OscillationError) as error:
+        Program(ring()).run(Program(ring()).new_state(), [False])
+
+    assert error.value.nets == [1]
+    assert "did not settle" in str(error.value)
+
+
+def test_oscillating_instance():
+    instance = Instance(Program(enabled_ring()))
+
+    assert instance(False) == (True,)
+    assert instance.oscillating is None
+
+    # the last values are kept while it oscillates
+    assert instance(True) in ((True,), (False,))
+    assert instance.oscillating == [1, 2]
+
+    assert instance(False) == (True,)
+    assert instance.oscillating is None
@@ -0,0 +1,118 @@
+"""
+test_kernel.py
+18. October 2026
+
+the event driven simulation kernel
+
+Author:
+Nilusink
+"""
+from sim.core.simulation.kernel import Simulator
+
+
+def _and(a: bool, b: bool) -> bool:
+    return a and b
+
+
+def _not(a: bool) -> bool:
+    return not a
+
+
+def test_propagation():
+    sim = Simulator()
+    a, b = sim.add_net(), sim.add_net()
+
+    gate = sim.add_gate(_and, 2, 1)
+    inverter = sim.add_gate(_not, 1, 1)
+    sim.connect(a, gate, 0)
+    sim.connect(b, gate, 1)
+    sim.connect(sim.output(gate, 0), inverter, 0)
+
+    sim.settle()
+    assert sim.stable
+    assert sim.value(sim.output(inverter, 0))
+
+    sim.set(a, True)
+    sim.set(b, True)
+    sim.settle()
+    assert not sim.value(sim.output(inverter, 0))
+
+    # everything listening to a removed gate reads low
+    sim.remove_gate(gate)
+    sim.settle()
+    assert sim.input_net(inverter, 0) is None
+    assert sim.value(sim.output(inverter, 0))
+
+
+def test_ids_are_reused():
+    sim = Simulator()
+    source = sim.add_net()
+
+    gates = [sim.add_gate(_not, 1, 1) for _ in range(3)]
+    nets = [sim.output(gate, 0) for gate in gates]
+    sim.settle()
+
+    sim.remove_gate(gates[1])
+    sim.remove_gate(gates[2])
+
+    new = sim.add_gate(_not, 1, 1)
+    assert new in gates[1:]
+    assert sim.output(new, 0) in nets[1:]
+
+    # a reused gate starts out like a new one
+    assert sim.input_net(new, 0) is None
+    sim.settle()
+    assert sim.value(sim.output(new, 0))
+
+    sim.connect(source, new, 0)
+    sim.set(source, True)
+    sim.settle()
+    assert not sim.value(sim.output(new, 0))
+
+    # rebuilding the same gates doesn't grow the simulator
+    for _ in range(5):
+        for gate in gates[:1] + [new]:
+            sim.remove_gate(gate)
+
+        gates[:1] = [sim.add_gate(_not, 1, 1)]
+        new = sim.add_gate(_not, 1, 1)
+
+    assert len(sim._funcs) == 3
+    assert len(sim._values) == 4
+
+
+def test_double_remove():
+    sim = Simulator()
+    first = sim.add_gate(_not, 1, 1)
+    net = sim.output(first, 0)
+
+    sim.remove_gate(first)
+    sim.remove_gate(first)
+    sim.remove_net(net)
+
+    # the ids are only handed out once
+    assert sim._free_gates == [first]
+    assert sim._free_nets == [net]
+
+    second, third = sim.add_gate(_not, 1, 1), sim.add_gate(_not, 1, 1)
+    assert second == first and third != first
+    assert sim.output(second, 0) != sim.output(third, 0)
+
+    # removing a net of a stale gate id doesn't touch the gate that reuses it
+    listener = sim.add_gate(_not, 1, 1)
+    sim.connect(sim.output(second, 0), listener, 0)
+    sim.remove_gate(second)
+    sim.remove_gate(second)
+    sim.settle()
+
+    assert sim.input_net(listener, 0) is None
+    assert sim.value(sim.output(listener, 0))
+
+
+def test_oscillation_stops():
+    sim = Simulator()
+    ring = sim.add_gate(_not, 1, 1)
+    sim.connect(sim.output(ring, 0), ring, 0)
+
+    assert sim.settle(max_events=10) == 10
+    assert not sim.stable
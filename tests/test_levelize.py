@@ -0,0 +1,85 @@
+"""
+test_levelize.py
+18. October 2026
+
+evaluation order and feedback loops of netlists
+
+Author:
+Nilusink
+"""
+from array import array
+
+import pytest
+
+from netlists import generated, latch, ring
+
+from sim.core.simulation.levelize import dependencies, levelize
+from sim.core.simulation.netlist import Netlist, AND, NOT, BLOCK, LOW
+
+
+@pytest.mark.parametrize("seed", range(0, 150, 7))
+def test_acyclic(seed: int):
+    netlist = generated(seed)
+    levels = levelize(netlist)
+    deps = dependencies(netlist)
+
+    assert levels.acyclic
+    assert sorted(levels.order) == [gate for gate in range(netlist.n_gates) if netlist.types[gate] != BLOCK]
+    assert all(len(component) == 1 for component in levels.components)
+
+    # every gate comes after (and on a higher level than) the gates it reads from
+    position = {gate: i for i, gate in enumerate(levels.order)}
+    for gate in levels.order:
+        for dep in deps[gate]:
+            assert position[dep] < position[gate]
+            assert levels.levels[dep] < levels.levels[gate]
+
+    assert levels.depth == max(levels.levels, default=-1) + 1
+
+
+def test_latch():
+    netlist = latch()
+    levels = levelize(netlist)
+
+    # the cross coupled "Nand" gates are the only loop, entered at the "And" reading the set input
+    # and walked forward, one half after the other
+    assert levels.cycles == [[5, 6, 7, 8]]
+    assert levels.cycles[0] in levels.components
+    assert levels.order[-4:] == [5, 6, 7, 8]
+
+    assert {levels.levels[gate] for gate in (5, 6, 7, 8)} == {3}
+    assert levels.levels[4] == 2
+
+
+def test_self_loop():
+    levels = levelize(ring())
+
+    assert levels.cycles == [[0]]
+    assert not levels.acyclic
+
+
+def test_separate_loops():
+    """
+    two loops, the second one reads from the first one: two components, in order
+    """
+    netlist = Netlist()
+    netlist.inputs = array("i", (0,))
+    netlist.n_nets = 1
+
+    first = [netlist.add_gate(AND, (0, LOW), 1), netlist.add_gate(NOT, (LOW,), 1)]
+    second = [netlist.add_gate(AND, (LOW, LOW), 1), netlist.add_gate(NOT, (LOW,), 1)]
+
+    def connect(gate: int, port: int, driver: int):
+        netlist.in_nets[netlist.in_offsets[gate] + port] = netlist.gate_outputs(driver)[0]
+
+    connect(first[0], 1, first[1])
+    connect(first[1], 0, first[0])
+    connect(second[0], 0, first[1])
+    connect(second[0], 1, second[1])
+    connect(second[1], 0, second[0])
+
+    levels = levelize(netlist)
+
+    assert levels.cycles == [first, second]
+    assert levels.components == [first, second]
+    assert list(levels.levels) == [0, 0, 1, 1]
@@ -0,0 +1,112 @@
+"""
+test_library.py
+18. October 2026
+
+the index of saved blocks, compiled on first use
+
+Author:
+Nilusink
+"""
+import os
+
+from netlists import adder, generated, save
+
+from sim.core import library
+from sim.core.library import BlockLibrary
+
+
+def blocks(tmp_path) -> str:
+    """
+    a directory with a working and a broken block
+    """
+    save(adder(), tmp_path / "adder.json")
+    (tmp_path / "broken.json").write_text("{\"input\": [")
+
+    return str(tmp_path)
+
+
+def test_entries(tmp_path, capsys):
+    blocks_library = BlockLibrary(blocks(tmp_path))
+
+    # listing the directory doesn't compile anything
+    assert [entry["name"] for entry in blocks_library.entries] == ["adder", "broken"]
+    assert not blocks_library["adder.json"]["compiled"]
+
+    netlist = blocks_library.netlist("adder.json")
+    assert netlist.digest() == adder().digest()
+    assert blocks_library["adder.json"]["inputs"] == 2 and blocks_library["adder.json"]["outputs"] == 2
+    assert os.path.exists(blocks_library.cache_file("adder.json"))
+
+    # a broken block is reported once and left out
+    assert blocks_library.netlist("broken.json") is None
+    assert "can't load block \"broken.json\"" in capsys.readouterr().err
+    assert not blocks_library.compile("broken.json")
+    assert capsys.readouterr().err == ""
+    assert [entry["name"] for entry in blocks_library.entries] == ["adder"]
+
+    assert not blocks_library.compile("missing.json")
+
+
+def test_shared(tmp_path, monkeypatch):
+    directory = blocks(tmp_path)
+    BlockLibrary(directory).compile("adder.json")
+
+    # a new session reads the cache instead of compiling the JSON again
+    def compile_file(file: str):
+        raise AssertionError(f"{file} compiled again")
+
+    monkeypatch.setattr(library, "compile_file", compile_file)
+    blocks_library = BlockLibrary(directory)
+
+    netlist = blocks_library.netlist("adder.json")
+    assert netlist.digest() == adder().digest()
+    assert blocks_library.netlist("adder.json") is netlist
+    assert blocks_library.netlist(os.path.join(directory, "adder.json")) is netlist
+
+
+def test_changed(tmp_path):
+    directory = blocks(tmp_path)
+    blocks_library = BlockLibrary(directory)
+    first = blocks_library.netlist("adder.json")
+
+    assert not blocks_library.refresh()
+
+    # a different size
+    save(generated(5), tmp_path / "adder.json")
+    assert blocks_library.refresh("adder.json")
+    assert not blocks_library["adder.json"]["compiled"]
+    assert blocks_library.netlist("adder.json").digest() == generated(5).digest()
+
+    # only a different modification time
+    stat = os.stat(tmp_path / "adder.json")
+    os.utime(tmp_path / "adder.json", (stat.st_atime, stat.st_mtime + 10))
+
+    blocks_library = BlockLibrary(directory)
+    assert not blocks_library["adder.json"]["compiled"]
+    assert blocks_library.netlist("adder.json") is not first
+
+
+def test_removed(tmp_path):
+    directory = blocks(tmp_path)
+    blocks_library = BlockLibrary(directory)
+    blocks_library.compile("adder.json")
+    cache = blocks_library.cache_file("adder.json")
+
+    os.remove(tmp_path / "adder.json")
+    assert blocks_library.refresh()
+
+    assert "adder.json" not in blocks_library
+    assert not os.path.exists(cache)
+    assert BlockLibrary(directory).entries[0]["name"] == "broken"
+
+
+def test_broken_cache(tmp_path):
+    directory = blocks(tmp_path)
+    blocks_library = BlockLibrary(directory)
+    blocks_library.compile("adder.json")
+
+    with open(blocks_library.cache_file("adder.json"), "wb") as outfile:
+        outfile.write(b"LSIM")
+
+    # the block is compiled again from its file
+    assert BlockLibrary(directory).netlist("adder.json").digest() == adder().digest()
@@ -0,0 +1,130 @@
+"""
+test_netlist.py
+18. October 2026
+
+compiling saved boards into netlists, blocks and the JSON roundtrip
+
+Author:
+Nilusink
+"""
+from array import array
+import random
+import json
+
+import pytest
+
+from netlists import embed, generated, random_netlist, save, table
+
+from sim.core.simulation.netlist import Netlist, BLOCK, LOW, export_data, compile_data, compile_file, split_port
+
+
+SEEDS = range(0, 150, 5)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_json_roundtrip(seed: int):
+    netlist = generated(seed)
+    gates, wires = export_data(netlist, position=(0, 0))
+
+    data = json.loads(json.dumps({
+        "input": [0.0] * netlist.n_inputs,
+        "output": [0.0] * netlist.n_outputs,
+        "gates": gates,
+        "wires": wires,
+    }))
+    loaded = compile_data(data)
+
+    # the parents are found from the wires, unconnected gates of a block may end up on the board
+    assert loaded.digest() == netlist.digest()
+    assert table(loaded) == table(netlist)
+
+
+def test_compile_file(tmp_path):
+    netlist = generated(4)
+    save(netlist, tmp_path / "board.json")
+
+    loaded = compile_file(str(tmp_path / "board.json"))
+
+    assert loaded.digest() == netlist.digest()
+    assert loaded.layout is not None and len(loaded.layout.positions) == netlist.n_gates
+
+
+def nested() -> tuple[Netlist, list[Netlist], list[int]]:
+    """
+    a board with two blocks, the second one with a block inside
+
+    :returns: the board, the contents of the blocks and the blocks
+    """
+    rng = random.Random(3)
+    inner = [random_netlist(rng, 2, 5, 2), random_netlist(rng, 3, 8, 2, depth=1)]
+    while BLOCK not in inner[1].types:
+        inner[1] = random_netlist(rng, 3, 8, 2, depth=1)
+
+    netlist = Netlist()
+    netlist.inputs = array("i", range(3))
+    netlist.n_nets = 3
+
+    blocks = []
+    nets = [0, 1, 2]
+    for contents in inner:
+        blocks.append(netlist.n_gates)
+        nets += embed(netlist, contents, nets[-contents.n_inputs:])
+
+    netlist.outputs = array("i", nets[-3:])
+
+    return netlist, inner, blocks
+
+
+def test_extract():
+    netlist, inner, blocks = nested()
+    children = netlist.children()
+
+    for block, contents in zip(blocks, inner):
+        extracted = netlist.extract(block, children)
+
+        assert extracted.digest() == contents.digest()
+        assert list(extracted.parents) == list(contents.parents)
+        assert extracted.digest() == netlist.extract(block).digest()
+
+
+def test_descendants():
+    netlist, inner, blocks = nested()
+    children = netlist.children()
+
+    assert children[-1] == blocks
+    assert netlist.descendants(blocks[0]) == list(range(blocks[0] + 1, blocks[1]))
+    assert netlist.descendants(blocks[1], children) == list(range(blocks[1] + 1, netlist.n_gates))
+
+    # the directly contained gates are a subset, the nested block has its own
+    nested_block = blocks[1] + 1 + list(inner[1].types).index(BLOCK)
+    assert set(children[nested_block]) < set(netlist.descendants(blocks[1]))
+
+    gate = next(gate for gate in range(netlist.n_gates) if netlist.types[gate] != BLOCK)
+    assert netlist.descendants(gate) == []
+
+
+def test_resolve_blocks():
+    netlist, _, blocks = nested()
+    source = netlist.resolve_blocks()
+
+    # no net resolves to a block output
+    block_nets = {
+        net for gate in range(netlist.n_gates) if netlist.types[gate] == BLOCK for net in netlist.gate_outputs(gate)
+    }
+    assert not any(source[net] in block_nets for net in range(netlist.n_nets))
+
+    # the blocks inputs are passed to the inner gates
+    split = netlist.splits[blocks[0]]
+    for outer, inner in zip(netlist.gate_inputs(blocks[0])[:split], netlist.gate_outputs(blocks[0])[:split]):
+        assert source[inner] == (source[outer] if outer != LOW else LOW)
+
+
+@pytest.mark.parametrize("port, expected", [
+    ("3o0", (3, "o", 0)),
+    ("-1o2", (-1, "o", 2)),
+    ("-2i1", (-2, "i", 1)),
+    ("5ci1", (5, "ci", 1)),
+    ("12co0", (12, "co", 0)),
+])
+def test_split_port(port: str, expected: tuple[int, str, int]):
+    assert split_port(port) == expected
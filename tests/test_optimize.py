@@ -0,0 +1,90 @@
+"""
+test_optimize.py
+18. October 2026
+
+flattening blocks and removing redundant gates
+
+Author:
+Nilusink
+"""
+from array import array
+
+import pytest
+
+from netlists import generated, latch, table
+
+from sim.core.simulation.netlist import Netlist, AND, NOT, BLOCK, LOW
+from sim.core.simulation.optimize import flatten, optimize, optimized_for
+from sim.core.simulation.sequential import ClockedCircuit
+
+
+@pytest.mark.parametrize("seed", range(0, 150, 5))
+def test_same_logic(seed: int):
+    netlist = generated(seed)
+    flat = flatten(netlist)
+    optimized = optimize(netlist)
+
+    assert BLOCK not in flat.types and BLOCK not in optimized.types
+    assert table(flat) == table(netlist)
+    assert table(optimized) == table(netlist)
+    assert optimized.n_gates <= flat.n_gates
+
+
+def board(*gates: tuple[int, tuple[int, ...]], outputs: tuple[int, ...]) -> Netlist:
+    """
+    a board with two inputs, the gates read nets by number (0 and 1 are the inputs)
+    """
+    netlist = Netlist()
+    netlist.inputs = array("i", (0, 1))
+    netlist.n_nets = 2
+
+    for kind, inputs in gates:
+        netlist.add_gate(kind, inputs, 1)
+
+    netlist.outputs = array("i", outputs)
+
+    return netlist
+
+
+def test_double_inversion():
+    optimized = optimize(board((NOT, (0,)), (NOT, (2,)), outputs=(3,)))
+
+    assert optimized.n_gates == 0
+    assert list(optimized.outputs) == [0]
+
+
+def test_constants():
+    # And(x, LOW) is LOW, And(x, Not(LOW)) is x
+    optimized = optimize(board((AND, (0, LOW)), (NOT, (LOW,)), (AND, (1, 3)), outputs=(2, 4)))
+
+    assert optimized.n_gates == 0
+    assert list(optimized.outputs) == [LOW, 1]
+
+
+def test_contradiction():
+    optimized = optimize(board((NOT, (0,)), (AND, (0, 2)), (AND, (0, 0)), outputs=(3, 4)))
+
+    assert optimized.n_gates == 0
+    assert list(optimized.outputs) == [LOW, 0]
+
+
+def test_merge_and_dead_gates():
+    netlist = board((AND, (0, 1)), (AND, (1, 0)), (NOT, (2,)), (NOT, (3,)), (NOT, (0,)), outputs=(4, 5))
+    optimized = optimize(netlist)
+
+    # one "And" and one "Not", the unused "Not" is gone
+    assert sorted(optimized.types) == [AND, NOT]
+    assert optimized.outputs[0] == optimized.outputs[1]
+    assert table(optimized) == table(netlist)
+
+
+def test_latch():
+    netlist = latch()
+    original, optimized = ClockedCircuit(netlist), ClockedCircuit(optimize(netlist))
+
+    for inputs in ([True], [False], [False], [True], [True], [False]):
+        assert optimized.tick(inputs) == original.tick(inputs)
+
+
+def test_optimized_for():
+    assert optimized_for(generated(3)) is optimized_for(generated(3))
@@ -0,0 +1,51 @@
+"""
+test_sequential.py
+18. October 2026
+
+clocked boards with feedback loops, and the "clock" command
+
+Author:
+Nilusink
+"""
+import pytest
+
+from netlists import latch, ring, save
+
+from sim.core.simulation.instances import OscillationError
+from sim.core.simulation.sequential import ClockedCircuit
+
+
+def test_latch():
+    circuit = ClockedCircuit(latch(), clock=0)
+
+    assert circuit.tick([True]) == (True,)
+    assert circuit.run(3) == (False,)
+    assert circuit.tick([True]) == (True,)
+
+
+def test_power_up():
+    with pytest.raises(OscillationError):
+        ClockedCircuit(ring())
+
+    with pytest.raises(RuntimeError, match="no input 2 for the clock"):
+        ClockedCircuit(latch(), clock=2)
+
+
+def test_clock(tmp_path, simulate, capsys):
+    save(latch(), tmp_path / "latch.json")
+
+    assert simulate("clock", str(tmp_path / "latch.json"), "3", "-i", "1", "-t") == 0
+    assert capsys.readouterr().out == "0 -> 1\n1 -> 1\n2 -> 1\n1\n"
+
+    assert simulate("clock", str(tmp_path / "latch.json"), "3", "-c", "2") == 1
+    assert "no input 2 for the clock" in capsys.readouterr().err
+
+
+def test_clock_oscillation(tmp_path, simulate, capsys):
+    save(ring(), tmp_path / "ring.json")
+
+    assert simulate("clock", str(tmp_path / "ring.json"), "3") == 1
+
+    output = capsys.readouterr()
+    assert output.out == ""
+    assert output.err.startswith("tick 0: feedback loop did not settle")
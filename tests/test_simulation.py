@@ -0,0 +1,106 @@
+"""
+test_simulation.py
+18. October 2026
+
+cross-check the evaluators against each other on generated netlists,
+the "table" and "equiv" commands
+
+Author:
+Nilusink
+"""
+import pytest
+
+from netlists import adder, generated, latch, ring, save, table, vector
+
+from sim.core.simulation import exhaustive
+from sim.core.simulation.headless import build_circuit
+from sim.core.simulation.instances import Program
+from sim.core.simulation.optimize import optimize
+from sim.core.simulation.tables import table_for
+from sim.core.simulation.timing import TimingSimulator
+
+
+SEEDS = range(150)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_evaluators_agree(seed: int):
+    netlist = generated(seed)
+    expected = table(netlist)
+
+    circuit = build_circuit(netlist)
+    program = Program(netlist)
+    state = program.new_state()
+    optimized = table(optimize(netlist))
+    truth_table = table_for(netlist)
+    timing = TimingSimulator(netlist)
+
+    assert optimized == expected
+
+    words = exhaustive.truth_table(netlist, processes=1)
+    assert [tuple(bool((word >> k) & 1) for word in words) for k in range(len(expected))] == expected
+
+    # walk the table forwards and backwards, so every simulator sees many different input changes
+    order = list(range(len(expected)))
+    for k in order + order[::-1]:
+        inputs = vector(k, netlist.n_inputs)
+
+        assert tuple(circuit.evaluate(inputs)) == expected[k]
+        assert program.run(state, inputs) == expected[k]
+        assert truth_table.lookup(k) == expected[k]
+
+        timing.apply(inputs)
+        assert tuple(timing.outputs) == expected[k]
+
+
+def test_table(tmp_path, simulate, capsys):
+    save(adder(), tmp_path / "adder.json")
+    file = str(tmp_path / "adder.json")
+
+    assert simulate("table", file, "-j", "1") == 0
+    assert capsys.readouterr().out == "00 -> 00\n10 -> 10\n01 -> 10\n11 -> 01\n"
+
+    assert simulate("table", file, "-o", str(tmp_path / "adder.csv")) == 0
+    assert (tmp_path / "adder.csv").read_text() == "in0,in1,out0,out1\n0,0,0,0\n1,0,1,0\n0,1,1,0\n1,1,0,1\n"
+
+    # one bitmap per output
+    assert simulate("table", file, "-p", "-o", str(tmp_path / "adder.table")) == 0
+    assert (tmp_path / "adder.table").read_bytes() == bytes((0b0110, 0b1000))
+
+
+@pytest.mark.parametrize("board", (latch, ring))
+def test_table_feedback(tmp_path, simulate, capsys, board):
+    save(board(), tmp_path / "board.json")
+
+    assert simulate("table", str(tmp_path / "board.json")) == 1
+    assert simulate("table", str(tmp_path / "board.json"), "-o", str(tmp_path / "board.csv")) == 1
+
+    output = capsys.readouterr()
+    assert output.out == ""
+    assert output.err.startswith("board has feedback loops")
+    assert not (tmp_path / "board.csv").exists()
+
+
+def test_equiv(tmp_path, simulate, capsys):
+    swapped = adder()
+    swapped.outputs = swapped.outputs[::-1]
+
+    for name, netlist in (("adder", adder()), ("optimized", optimize(adder())), ("swapped", swapped)):
+        save(netlist, tmp_path / f"{name}.json")
+
+    assert simulate("equiv", str(tmp_path / "adder.json"), str(tmp_path / "optimized.json")) == 0
+    assert capsys.readouterr().out == "equivalent (4 input combinations)\n"
+
+    assert simulate("equiv", str(tmp_path / "adder.json"), str(tmp_path / "swapped.json")) == 1
+    assert capsys.readouterr().out == "not equivalent, counterexample:\n10 -> 10 01\n"
+
+
+def test_equiv_feedback(tmp_path, simulate, capsys):
+    save(latch(), tmp_path / "latch.json")
+
+    # not even a latch compared with itself, its outputs depend on the order of the input vectors
+    assert simulate("equiv", str(tmp_path / "latch.json"), str(tmp_path / "latch.json")) == 1
+
+    output = capsys.readouterr()
+    assert output.out == ""
+    assert output.err.startswith(f"{tmp_path / 'latch.json'}: board has feedback loops")
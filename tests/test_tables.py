@@ -0,0 +1,52 @@
+"""
+test_tables.py
+18. October 2026
+
+truth tables of combinational blocks
+
+Author:
+Nilusink
+"""
+import random
+
+import pytest
+
+from netlists import adder, generated, latch, random_netlist, table, vector
+
+from sim.core.simulation import tables
+from sim.core.simulation.tables import TruthTable, table_for
+
+
+@pytest.mark.parametrize("seed", range(0, 150, 7))
+def test_table_for(seed: int):
+    netlist = generated(seed)
+    truth_table = table_for(netlist)
+
+    for k, expected in enumerate(table(netlist)):
+        assert truth_table.lookup(k) == expected
+        assert truth_table(*vector(k, netlist.n_inputs)) == expected
+
+
+def test_cached():
+    # equal netlists share one table
+    assert table_for(adder()) is table_for(adder())
+    assert table_for(adder())(True, True) == (False, True)
+
+
+def test_not_tabulated(monkeypatch):
+    assert table_for(latch()) is None
+
+    monkeypatch.setattr(tables, "MAX_INPUTS", 3)
+    assert table_for(random_netlist(random.Random(1), 4, 10, 2)) is None
+
+
+@pytest.mark.parametrize("n_outputs, typecode", [(3, "B"), (12, "H"), (20, "L"), (40, "Q")])
+def test_from_words(n_outputs: int, typecode: str):
+    rng = random.Random(n_outputs)
+    words = [rng.getrandbits(8) for _ in range(n_outputs)]
+
+    truth_table = TruthTable.from_words(words, 3)
+
+    assert truth_table.rows.typecode == typecode
+    for k in range(8):
+        assert truth_table.lookup(k) == tuple(bool((word >> k) & 1) for word in words)
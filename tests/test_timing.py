@@ -0,0 +1,69 @@
+"""
+test_timing.py
+18. October 2026
+
+gate delays, critical paths and glitches, and the "timing" command
+
+Author:
+Nilusink
+"""
+import pytest
+
+from netlists import adder, latch, ring, save
+
+from sim.core.simulation.instances import OscillationError
+from sim.core.simulation.timing import TimingSimulator, critical_path
+
+
+def test_critical_path():
+    # through both inverted inputs to the sum
+    assert critical_path(adder()) == (4, 0, [1, 3, 4, 6])
+    assert critical_path(adder(), {"And": 2}).delay == 6
+
+    with pytest.raises(RuntimeError, match="feedback loops"):
+        critical_path(latch())
+
+
+def test_glitch():
+    sim = TimingSimulator(adder())
+
+    report = sim.apply([True, True])
+    assert sim.outputs == [False, True]
+    assert report.settle_time == 3 and not report.glitches
+
+    # the sum rises before the carry is gone from the other half of the adder
+    report = sim.apply([False, False])
+    assert sim.outputs == [False, False]
+    assert report.settle_time == 4 and sim.time == 7
+    assert sim.output_glitches(report) == {0: 2}
+
+
+def test_oscillation():
+    with pytest.raises(OscillationError):
+        TimingSimulator(ring())
+
+
+def test_timing(tmp_path, simulate, capsys):
+    save(adder(), tmp_path / "adder.json")
+
+    assert simulate("timing", str(tmp_path / "adder.json"), "-d", "And=2") == 0
+    assert capsys.readouterr().out.startswith("critical path: 6 to output 0, 4 gates\n")
+
+    assert simulate("timing", str(tmp_path / "adder.json"), "11", "00") == 0
+    assert capsys.readouterr().out.split("\n")[:2] == [
+        "11 -> 01 settled after 3, 8 events, no glitches at the outputs",
+        "00 -> 00 settled after 4, 10 events, glitches at outputs [0]",
+    ]
+
+    assert simulate("timing", str(tmp_path / "adder.json"), "-d", "And") == 1
+    assert "invalid delay \"And\"" in capsys.readouterr().err
+
+
+def test_timing_oscillation(tmp_path, simulate, capsys):
+    save(ring(), tmp_path / "ring.json")
+
+    assert simulate("timing", str(tmp_path / "ring.json"), "0", "1") == 1
+
+    output = capsys.readouterr()
+    assert output.out == ""
+    assert output.err.startswith("power up: feedback loop did not settle")
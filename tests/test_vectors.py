@@ -0,0 +1,128 @@
+"""
+test_vectors.py
+18. October 2026
+
+reading, simulating and writing test vectors, and the "vectors" command
+
+Author:
+Nilusink
+"""
+import random
+import io
+
+import pytest
+
+from netlists import adder, save
+
+from sim.core.simulation.bitparallel import BitParallel
+from sim.core.simulation.vectors import (
+    VectorChunk, VectorReport, VectorWriter, read_csv, read_binary, simulate_chunks,
+)
+
+
+def check(chunks) -> VectorReport:
+    report = VectorReport()
+    for chunk, outputs in simulate_chunks(adder(), chunks):
+        report.check(chunk, outputs)
+
+    return report
+
+
+def test_csv():
+    vectors = "in0,in1,out0,out1\n0,0,0,0\n1,0,1,\n0,1,x,0\n\n1,1,0,1\n"
+    chunks = list(read_csv(io.StringIO(vectors), 2, 2, chunk_size=3))
+
+    assert [(chunk.start, chunk.count) for chunk in chunks] == [(0, 3), (3, 1)]
+    assert chunks[0].inputs == [0b010, 0b100]
+    assert chunks[0].expected == {0: (0b010, 0b011), 1: (0b000, 0b101)}
+
+    assert check(chunks).passed
+
+    # a wrong expected value is found
+    report = check(read_csv(io.StringIO("in0,in1,out1\n1,1,1\n1,1,0\n"), 2, 2))
+    assert report.n_mismatches == 1
+    assert report.mismatches[0].index == 1
+    assert report.mismatches[0].expected == {1: False}
+
+
+@pytest.mark.parametrize("vectors, message", [
+    ("in0,in1\n1,0\n1,\n", "line 3: \"\" for in1"),
+    ("in0,in1\n10,1\n", "line 2: \"10\" for in0"),
+    ("in0,in1\n1\n", "line 2: no in1"),
+    ("in0,in1,out0\n1,1,2\n", "line 2: \"2\" for out0"),
+    ("in0,out0\n1,1\n", "no column for the inputs [1]"),
+    ("in0,in1,out2\n1,1,1\n", "no ports for the columns ['out2']"),
+    ("in0,in1,carry\n", "unknown column \"carry\""),
+])
+def test_csv_malformed(vectors: str, message: str):
+    with pytest.raises(RuntimeError, match=message.replace("[", "\\[").replace("]", "\\]")):
+        list(read_csv(io.StringIO(vectors), 2, 2))
+
+
+def test_binary_vectors():
+    rng = random.Random(0)
+    count = 21
+
+    chunk = VectorChunk(0, count, [rng.getrandbits(count) for _ in range(2)], {})
+    outputs = BitParallel(adder()).evaluate(chunk.inputs, count)
+
+    for binary in (True, False):
+        outfile = io.BytesIO() if binary else io.StringIO()
+        writer = VectorWriter(outfile, 2, 2, binary)
+        writer.write(chunk, outputs)
+
+        infile = io.BytesIO(outfile.getvalue()) if binary else io.StringIO(outfile.getvalue())
+        chunks = list((read_binary if binary else read_csv)(infile, 2, 2, chunk_size=8))
+
+        assert [(c.start, c.count) for c in chunks] == [(0, 8), (8, 8), (16, 5)]
+        assert check(chunks).passed
+
+        for c in chunks:
+            mask = (1 << c.count) - 1
+            assert c.inputs == [(word >> c.start) & mask for word in chunk.inputs]
+            assert {j: values for j, (values, _) in c.expected.items()} == {
+                j: (word >> c.start) & mask for j, word in enumerate(outputs)
+            }
+
+
+def binary_vectors(count: int) -> bytes:
+    outfile = io.BytesIO()
+    VectorWriter(outfile, 2, 2, binary=True).write(VectorChunk(0, count, [0b01, 0b10], {}), [0b11, 0b00])
+
+    return outfile.getvalue()
+
+
+@pytest.mark.parametrize("data, message", [
+    (binary_vectors(2)[:5], "truncated \\(no complete header\\)"),
+    (binary_vectors(2)[:-1], "truncated \\(incomplete record 1\\)"),
+    (b"LSVX" + binary_vectors(2)[4:], "not a binary vector file"),
+    (binary_vectors(2)[:4] + b"\x09\x00" + binary_vectors(2)[6:], "newer than this program"),
+])
+def test_binary_malformed(data: bytes, message: str):
+    with pytest.raises(RuntimeError, match=message):
+        list(read_binary(io.BytesIO(data), 2, 2))
+
+
+def test_binary_ports():
+    with pytest.raises(RuntimeError, match="the vectors have 2 inputs / 2 outputs, the netlist 3 / 2"):
+        list(read_binary(io.BytesIO(binary_vectors(2)), 3, 2))
+
+
+def test_command(tmp_path, simulate, capsys):
+    save(adder(), tmp_path / "adder.json")
+    (tmp_path / "vectors.csv").write_text("in0,in1,out0,out1\n0,0,0,0\n1,1,0,1\n0,1,x,0\n")
+    (tmp_path / "wrong.csv").write_text("in0,in1,out0\n1,0,1\n1,1,1\n")
+    (tmp_path / "malformed.csv").write_text("in0,in1\n1,2\n")
+    file = str(tmp_path / "adder.json")
+
+    assert simulate("vectors", file, str(tmp_path / "vectors.csv"), "-o", str(tmp_path / "outputs.csv")) == 0
+    assert capsys.readouterr().out.startswith("3 vectors, 0 mismatches")
+    assert (tmp_path / "outputs.csv").read_text() == "in0,in1,out0,out1\n0,0,0,0\n1,1,0,1\n0,1,1,0\n"
+
+    assert simulate("vectors", file, str(tmp_path / "wrong.csv")) == 1
+    lines = capsys.readouterr().out.split("\n")
+    assert lines[0] == "vector 1: 11 -> 01, expected 1x"
+    assert lines[1].startswith("2 vectors, 1 mismatches")
+
+    assert simulate("vectors", file, str(tmp_path / "malformed.csv")) == 1
+    assert "line 2: \"2\" for in1" in capsys.readouterr().err